@@ -0,0 +1,106 @@
+"""
+Per-call cost of the argument replacers, comparing the declarative replacers
+compiled by ``unumpy`` against the closure-based replacers they replaced.
+"""
+import numpy as onp
+import uarray as ua
+
+import unumpy
+
+
+def _legacy_dtype_argreplacer(args, kwargs, dispatchables):
+    def replacer(*a, dtype=None, **kw):
+        out_kw = kw.copy()
+        out_kw["dtype"] = dispatchables[0]
+        return a, out_kw
+
+    return replacer(*args, **kwargs)
+
+
+def _legacy_ureduce_argreplacer(args, kwargs, dispatchables):
+    def ureduce(self, a, axis=0, dtype=None, out=None, keepdims=False):
+        return (
+            (dispatchables[0], dispatchables[1]),
+            dict(
+                axis=axis,
+                dtype=dispatchables[2],
+                out=dispatchables[3],
+                keepdims=keepdims,
+            ),
+        )
+
+    return ureduce(*args, **kwargs)
+
+
+def _legacy_reduce_argreplacer(args, kwargs, arrays):
+    def reduce(a, axis=None, dtype=None, out=None, keepdims=False):
+        kwargs = {}
+        if dtype is not None:
+            kwargs["dtype"] = dtype
+
+        if keepdims is not False:
+            kwargs["keepdims"] = keepdims
+
+        return ((arrays[0],), dict(axis=axis, out=arrays[1], **kwargs))
+
+    return reduce(*args, **kwargs)
+
+
+_x = onp.arange(16.0)
+
+# (multimethod, legacy replacer, args, kwargs, converted dispatchables)
+CASES = {
+    "sum": (unumpy.sum, _legacy_reduce_argreplacer, (_x,), {"axis": 0}, (_x, None)),
+    "zeros": (
+        unumpy.zeros,
+        _legacy_dtype_argreplacer,
+        ((4, 4),),
+        {},
+        (onp.dtype("float64"),),
+    ),
+    "add.reduce": (
+        unumpy.ufunc.reduce,
+        _legacy_ureduce_argreplacer,
+        (unumpy.add, _x),
+        {},
+        (onp.add, _x, None, None),
+    ),
+}
+
+
+class ArgReplacer:
+    params = [sorted(CASES), ["compiled", "legacy"]]
+    param_names = ["case", "replacer"]
+
+    def setup(self, case, replacer):
+        method, legacy, self.args, self.kwargs, self.dispatchables = CASES[case]
+        self.replacer = method.arg_replacer if replacer == "compiled" else legacy
+
+    def time_replace(self, case, replacer):
+        self.replacer(self.args, self.kwargs, self.dispatchables)
+
+
+class ReplacedCall:
+    """
+    End-to-end calls of the multimethods whose replacers are timed above.
+    """
+
+    params = [["sum", "zeros", "add.reduce"]]
+    param_names = ["case"]
+
+    def setup(self, case):
+        import unumpy.numpy_backend as numpy_backend
+
+        self.func, self.args = {
+            "sum": (unumpy.sum, (_x,)),
+            "zeros": (unumpy.zeros, ((4, 4),)),
+            "add.reduce": (unumpy.add.reduce, (_x,)),
+        }[case]
+        self._ctx = ua.set_backend(numpy_backend)
+        self._ctx.__enter__()
+
+    def teardown(self, case):
+        self._ctx.__exit__(None, None, None)
+
+    def time_call(self, case):
+        self.func(*self.args)
@@ -0,0 +1,24 @@
+from .common import DispatchBenchmark, parametrize
+
+
+def _shape(inputs):
+    return (inputs.side, inputs.side)
+
+
+@parametrize
+class Creation(DispatchBenchmark):
+    """
+    Array creation functions.
+    """
+
+    cases = {
+        "zeros": ("zeros", lambda i: ((_shape(i),), {})),
+        "ones": ("ones", lambda i: ((_shape(i),), {})),
+        "full": ("full", lambda i: ((_shape(i), 1.5), {})),
+        "eye": ("eye", lambda i: ((i.side,), {})),
+        "arange": ("arange", lambda i: ((0, i.n, 1), {})),
+        "linspace": ("linspace", lambda i: ((0, 1, i.n), {})),
+        "logspace": ("logspace", lambda i: ((0, 1, i.n), {})),
+        "asarray": ("asarray", lambda i: ((i.floats(),), {})),
+        "array": ("array", lambda i: ((i.floats(),), {})),
+    }
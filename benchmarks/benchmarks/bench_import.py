@@ -0,0 +1,50 @@
+"""
+Time taken by ``import unumpy``, both by default and in the lazy mode enabled
+with ``UNUMPY_LAZY_IMPORT=1``, in which the multimethods are only created
+when first needed.
+"""
+import os
+import subprocess
+import sys
+
+_MODES = {"eager": "0", "lazy": "1"}
+
+
+class Import:
+    params = [sorted(_MODES)]
+    param_names = ["mode"]
+
+    def _setup_code(self, mode):
+        return "import os; os.environ['UNUMPY_LAZY_IMPORT'] = {!r}".format(_MODES[mode])
+
+    def timeraw_import(self, mode):
+        return "import unumpy", self._setup_code(mode)
+
+    def timeraw_import_and_use(self, mode):
+        # Accessing a multimethod creates all of them in the lazy mode.
+        return "import unumpy; unumpy.sum", self._setup_code(mode)
+
+    def track_importtime(self, mode):
+        """
+        The cumulative time of ``unumpy`` reported by ``python -X importtime``,
+        in microseconds, the best of five runs.
+        """
+        env = dict(os.environ, UNUMPY_LAZY_IMPORT=_MODES[mode])
+        times = []
+        for _ in range(5):
+            stderr = subprocess.run(
+                [sys.executable, "-X", "importtime", "-c", "import unumpy"],
+                env=env,
+                stderr=subprocess.PIPE,
+                check=True,
+                universal_newlines=True,
+            ).stderr
+            # Lines look like "import time: <self> | <cumulative> | <name>".
+            for line in stderr.splitlines():
+                _, cumulative, name = line.split("|")
+                if name.strip() == "unumpy":
+                    times.append(int(cumulative))
+
+        return min(times)
+
+    track_importtime.unit = "us"
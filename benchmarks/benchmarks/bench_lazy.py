@@ -0,0 +1,50 @@
+"""
+Chains of elementwise ufuncs, and their reductions, evaluated eagerly by the
+NumPy backend and fused by the lazy backend, which computes them a block at a
+time without allocating full-size intermediates.
+"""
+import numpy as onp
+import uarray as ua
+
+import unumpy
+
+SIZES = {"medium": 2 ** 16, "large": 2 ** 22}
+
+
+def _elementwise(x, y):
+    return unumpy.subtract(unumpy.add(unumpy.multiply(x, y), unumpy.sin(x)), y)
+
+
+def _reduction(x, y):
+    return unumpy.sum(_elementwise(x, y))
+
+
+CASES = {"elementwise": _elementwise, "reduction": _reduction}
+
+
+class Fusion:
+    params = [sorted(CASES), ["numpy", "lazy"], list(SIZES)]
+    param_names = ["case", "backend", "size"]
+    timeout = 120
+
+    def setup(self, case, backend, size):
+        import unumpy.lazy_backend as lazy_backend
+        import unumpy.numpy_backend as numpy_backend
+
+        rng = onp.random.RandomState(0)
+        self.x, self.y = rng.random_sample((2, SIZES[size]))
+        self.func = CASES[case]
+        self.compute = lazy_backend.compute
+        self._ctx = ua.set_backend(
+            lazy_backend if backend == "lazy" else numpy_backend, coerce=True
+        )
+        self._ctx.__enter__()
+
+    def teardown(self, case, backend, size):
+        self._ctx.__exit__(None, None, None)
+
+    def time_evaluate(self, case, backend, size):
+        self.compute(self.func(self.x, self.y))
+
+    def peakmem_evaluate(self, case, backend, size):
+        self.compute(self.func(self.x, self.y))
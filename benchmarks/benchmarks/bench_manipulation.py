@@ -0,0 +1,61 @@
+from .common import DispatchBenchmark, parametrize
+
+
+def _floats(inputs):
+    return (inputs.floats(),), {}
+
+
+def _matrix(inputs):
+    return (inputs.matrix(),), {}
+
+
+@parametrize
+class Sorting(DispatchBenchmark):
+    """
+    Sorting, searching and counting.
+    """
+
+    cases = {
+        "sort": ("sort", _floats),
+        "argsort": ("argsort", _floats),
+        "msort": ("msort", _floats),
+        "sort_complex": ("sort_complex", _floats),
+        "lexsort": ("lexsort", lambda i: (((i.ints(), i.ints()),), {})),
+        "partition": ("partition", lambda i: ((i.floats(), i.n // 2), {})),
+        "argpartition": ("argpartition", lambda i: ((i.floats(), i.n // 2), {})),
+        "searchsorted": ("searchsorted", lambda i: ((i.sorted(), i.floats(16)), {})),
+        "nonzero": ("nonzero", lambda i: ((i.bools(),), {})),
+        "argwhere": ("argwhere", lambda i: ((i.bools(),), {})),
+        "flatnonzero": ("flatnonzero", lambda i: ((i.bools(),), {})),
+        "where": ("where", lambda i: ((i.bools(), i.floats(), i.floats()), {})),
+        "compress": ("compress", lambda i: ((i.bools(), i.floats()), {})),
+        "extract": ("extract", lambda i: ((i.bools(), i.floats()), {})),
+    }
+
+
+@parametrize
+class Manipulation(DispatchBenchmark):
+    """
+    Shape queries and array manipulation.
+    """
+
+    cases = {
+        "shape": ("shape", _matrix),
+        "ndim": ("ndim", _matrix),
+        "size": ("size", _matrix),
+        "nbytes": ("nbytes", _matrix),
+        "transpose": ("transpose", _matrix),
+        "ravel": ("ravel", _matrix),
+        "reshape": ("reshape", lambda i: ((i.matrix(), (-1,)), {})),
+        "swapaxes": ("swapaxes", lambda i: ((i.matrix(), 0, 1), {})),
+        "rollaxis": ("rollaxis", lambda i: ((i.matrix(), 1), {})),
+        "moveaxis": ("moveaxis", lambda i: ((i.matrix(), 0, 1), {})),
+        "pad": ("pad", lambda i: ((i.floats(), 2, "constant"), {})),
+        "diff": ("diff", _floats),
+        "gradient": ("gradient", _floats),
+    }
+    native_paths = {
+        # ``numpy.nbytes`` maps scalar types to their sizes.
+        ("nbytes", "numpy"): None,
+        ("transpose", "torch"): "t",
+    }
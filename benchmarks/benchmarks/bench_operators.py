@@ -0,0 +1,59 @@
+"""
+Overhead of the operators of ``unumpy.ndarray``, compared to calling the
+ufunc directly and to the previous operators, which looked up the ufunc in
+the module globals on every call.
+"""
+import numpy as onp
+import uarray as ua
+
+import unumpy
+import unumpy._multimethods as _multimethods
+
+
+class Array(unumpy.ndarray):
+    def __init__(self, data):
+        self.data = data
+
+    def __array__(self, dtype=None):
+        return self.data
+
+
+def _legacy(name, reverse=False):
+    def f(self, other):
+        return _multimethods.__dict__[name](self, other)
+
+    def r(self, other):
+        return _multimethods.__dict__[name](other, self)
+
+    return r if reverse else f
+
+
+# (operator, ufunc, legacy operator) for ``a`` and ``b``.
+CASES = {
+    "a + b": (lambda a, b: a + b, lambda a, b: unumpy.add(a, b), _legacy("add")),
+    "1.0 + a": (
+        lambda a, b: 1.0 + a,
+        lambda a, b: unumpy.add(1.0, a),
+        lambda a, b: _legacy("add", reverse=True)(a, 1.0),
+    ),
+    "a < b": (lambda a, b: a < b, lambda a, b: unumpy.less(a, b), _legacy("less")),
+}
+
+
+class Operators:
+    params = [sorted(CASES), ["operator", "ufunc", "legacy"]]
+    param_names = ["case", "path"]
+
+    def setup(self, case, path):
+        import unumpy.numpy_backend as numpy_backend
+
+        self.a, self.b = Array(onp.ones(16)), Array(onp.ones(16))
+        self.func = CASES[case][["operator", "ufunc", "legacy"].index(path)]
+        self._ctx = ua.set_backend(numpy_backend, coerce=True)
+        self._ctx.__enter__()
+
+    def teardown(self, case, path):
+        self._ctx.__exit__(None, None, None)
+
+    def time_operator(self, case, path):
+        self.func(self.a, self.b)
@@ -0,0 +1,80 @@
+"""
+Chains of elementwise ufuncs computed by the NumPy backend, with and without
+a :obj:`unumpy.buffer_pool` supplying their outputs from the arrays already
+released, instead of new allocations that are faulted into memory a page at a
+time.
+"""
+import resource
+
+import numpy as onp
+import uarray as ua
+
+import unumpy
+
+SIZES = {"medium": 2 ** 15, "large": 2 ** 20}
+
+# Chains evaluated for each of the counts tracked.
+REPEAT = 20
+
+# Ufunc calls in each chain.
+CALLS = 4
+
+
+def _chain(x, y):
+    return unumpy.subtract(unumpy.add(unumpy.multiply(x, y), unumpy.sin(x)), y)
+
+
+class Pooling:
+    params = [["off", "on"], list(SIZES)]
+    param_names = ["pool", "size"]
+
+    def setup(self, pool, size):
+        import unumpy.numpy_backend as numpy_backend
+
+        rng = onp.random.RandomState(0)
+        self.x, self.y = rng.random_sample((2, SIZES[size]))
+        self._ctx = ua.set_backend(numpy_backend, coerce=True)
+        self._ctx.__enter__()
+        self.pool = None
+        if pool == "on":
+            self._pool_ctx = unumpy.buffer_pool()
+            self.pool = self._pool_ctx.__enter__()
+
+        # Learn the output dtypes outside of the timed code.
+        _chain(self.x, self.y)
+
+    def teardown(self, pool, size):
+        if self.pool is not None:
+            self._pool_ctx.__exit__(None, None, None)
+
+        self._ctx.__exit__(None, None, None)
+
+    def time_chain(self, pool, size):
+        _chain(self.x, self.y)
+
+    def track_allocations(self, pool, size):
+        """
+        The arrays allocated for the outputs of ``REPEAT`` chains.
+        """
+        if self.pool is None:
+            return REPEAT * CALLS
+
+        before = self.pool.allocations
+        for _ in range(REPEAT):
+            _chain(self.x, self.y)
+
+        return self.pool.allocations - before
+
+    track_allocations.unit = "arrays"
+
+    def track_page_faults(self, pool, size):
+        """
+        The minor page faults taken by ``REPEAT`` chains.
+        """
+        before = resource.getrusage(resource.RUSAGE_SELF).ru_minflt
+        for _ in range(REPEAT):
+            _chain(self.x, self.y)
+
+        return resource.getrusage(resource.RUSAGE_SELF).ru_minflt - before
+
+    track_page_faults.unit = "faults"
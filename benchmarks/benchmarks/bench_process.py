@@ -0,0 +1,63 @@
+"""
+Work that holds the GIL, computed by the single-process NumPy backend and
+split across processes by the process backend, with its inputs already in
+shared memory.
+"""
+import numpy as onp
+import uarray as ua
+
+import unumpy
+
+SIZES = {"medium": 2 ** 18, "large": 2 ** 22}
+
+
+def _objects(rng, n):
+    return onp.array(list(rng.randint(0, 1000, n // 16)), dtype=object), 3
+
+
+def _floats(rng, n):
+    return (rng.random_sample(n),)
+
+
+def _ints(rng, n):
+    return (rng.randint(0, n // 4, n),)
+
+
+# (function, inputs) for each case.
+CASES = {
+    "object multiply": (unumpy.multiply, _objects),
+    "sort": (unumpy.sort, _floats),
+    "unique": (unumpy.unique, _ints),
+    "sum": (unumpy.sum, _floats),
+}
+
+
+class ProcessPool:
+    params = [sorted(CASES), ["numpy", "process"], list(SIZES)]
+    param_names = ["case", "backend", "size"]
+    timeout = 300
+
+    def setup(self, case, backend, size):
+        import unumpy.numpy_backend as numpy_backend
+        import unumpy.process_backend as process_backend
+
+        self.func, make_args = CASES[case]
+        self.args = make_args(onp.random.RandomState(0), SIZES[size])
+        if backend == "process":
+            self.args = tuple(
+                process_backend.to_shared(a) if isinstance(a, onp.ndarray) else a
+                for a in self.args
+            )
+
+        self._ctx = ua.set_backend(
+            process_backend if backend == "process" else numpy_backend, coerce=True
+        )
+        self._ctx.__enter__()
+        # Start the processes outside of the timed code.
+        self.func(*self.args)
+
+    def teardown(self, case, backend, size):
+        self._ctx.__exit__(None, None, None)
+
+    def time_call(self, case, backend, size):
+        self.func(*self.args)
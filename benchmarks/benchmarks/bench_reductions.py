@@ -0,0 +1,49 @@
+from .common import DispatchBenchmark, parametrize
+
+
+def _floats(inputs):
+    return (inputs.floats(),), {}
+
+
+def _bools(inputs):
+    return (inputs.bools(),), {}
+
+
+@parametrize
+class Reductions(DispatchBenchmark):
+    """
+    Reductions over a whole array.
+    """
+
+    cases = {
+        "sum": ("sum", _floats),
+        "prod": ("prod", _floats),
+        "min": ("min", _floats),
+        "max": ("max", _floats),
+        "any": ("any", _bools),
+        "all": ("all", _bools),
+        "argmin": ("argmin", _floats),
+        "argmax": ("argmax", _floats),
+        "nanargmin": ("nanargmin", _floats),
+        "nanargmax": ("nanargmax", _floats),
+        "nanmin": ("nanmin", _floats),
+        "nanmax": ("nanmax", _floats),
+        "nansum": ("nansum", _floats),
+        "nanprod": ("nanprod", _floats),
+        "std": ("std", _floats),
+        "var": ("var", _floats),
+        "ptp": ("ptp", _floats),
+        "count_nonzero": ("count_nonzero", _bools),
+    }
+
+
+@parametrize
+class AxisReductions(DispatchBenchmark):
+    """
+    Reductions along one axis of a square matrix.
+    """
+
+    cases = {
+        name: (name, lambda i: ((i.matrix(),), {"axis": 0}))
+        for name in ["sum", "prod", "min", "max", "std", "var", "argmax"]
+    }
@@ -0,0 +1,57 @@
+from .common import DispatchBenchmark, parametrize
+
+
+def _pair(inputs):
+    return (inputs.ints(), inputs.ints(n=max(inputs.n // 4, 1))), {}
+
+
+@parametrize
+class SetRoutines(DispatchBenchmark):
+    """
+    Set routines on integer arrays.
+    """
+
+    cases = {
+        "unique": ("unique", lambda i: ((i.ints(),), {})),
+        "in1d": ("in1d", _pair),
+        "isin": ("isin", _pair),
+        "intersect1d": ("intersect1d", _pair),
+        "setdiff1d": ("setdiff1d", _pair),
+        "setxor1d": ("setxor1d", _pair),
+        "union1d": ("union1d", _pair),
+    }
+
+
+class CachedCoercion:
+    """
+    ``isin`` against the same Python list lookup table on every call, with
+    and without a conversion cache.
+    """
+
+    params = [["numpy", "dask"], [16, 16384], [False, True]]
+    param_names = ["backend", "table_size", "cached"]
+
+    def setup(self, backend, table_size, cached):
+        import contextlib
+
+        import numpy as onp
+        import uarray as ua
+        import unumpy
+
+        from .common import load_backend
+
+        self.backend, _, _ = load_backend(backend)
+        self.func = unumpy.isin
+        self.element = onp.arange(64)
+        self.table = list(range(0, 2 * table_size, 2))
+
+        self._ctx = contextlib.ExitStack()
+        self._ctx.enter_context(ua.set_backend(self.backend, coerce=True))
+        if cached:
+            self._ctx.enter_context(unumpy.conversion_cache())
+
+    def teardown(self, backend, table_size, cached):
+        self._ctx.close()
+
+    def time_isin(self, backend, table_size, cached):
+        self.func(self.element, self.table)
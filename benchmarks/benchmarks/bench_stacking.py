@@ -0,0 +1,37 @@
+from .common import DispatchBenchmark, parametrize
+
+
+def _two(inputs):
+    return ((inputs.floats(), inputs.floats()),), {}
+
+
+def _two_matrices(inputs):
+    return ((inputs.matrix(), inputs.matrix()),), {}
+
+
+@parametrize
+class Stacking(DispatchBenchmark):
+    """
+    Joining, stacking and broadcasting arrays.
+    """
+
+    cases = {
+        "concatenate": ("concatenate", _two),
+        "stack": ("stack", _two),
+        "column_stack": ("column_stack", _two),
+        "hstack": ("hstack", _two),
+        "vstack": ("vstack", _two),
+        "block": ("block", lambda i: (([i.matrix(), i.matrix()],), {})),
+        "atleast_1d": ("atleast_1d", lambda i: ((i.floats(),), {})),
+        "atleast_2d": ("atleast_2d", lambda i: ((i.floats(),), {})),
+        "atleast_3d": ("atleast_3d", lambda i: ((i.floats(),), {})),
+        "broadcast_arrays": (
+            "broadcast_arrays",
+            lambda i: ((i.floats(i.side), i.matrix()), {}),
+        ),
+        "broadcast_to": (
+            "broadcast_to",
+            lambda i: ((i.floats(i.side), (i.side, i.side)), {}),
+        ),
+        "meshgrid": ("meshgrid", lambda i: ((i.floats(i.side), i.floats(i.side)), {})),
+    }
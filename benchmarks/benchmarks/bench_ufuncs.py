@@ -0,0 +1,146 @@
+import numpy as onp
+
+from .common import DispatchBenchmark, parametrize
+
+
+def _binary(inputs):
+    return (inputs.floats(), inputs.floats()), {}
+
+
+def _unary(inputs):
+    return (inputs.floats(),), {}
+
+
+def _scalars(inputs):
+    return (1.0, 2.0), {}
+
+
+def _reduce(inputs):
+    return (inputs.floats(),), {}
+
+
+@parametrize
+class UfuncCall(DispatchBenchmark):
+    """
+    ``ufunc.__call__`` for a representative set of unary, binary and
+    comparison ufuncs, including the Python-scalar case.
+    """
+
+    cases = {
+        "add": ("add", _binary),
+        "add-scalars": ("add", _scalars),
+        "multiply": ("multiply", _binary),
+        "true_divide": ("true_divide", _binary),
+        "power": ("power", _binary),
+        "less": ("less", _binary),
+        "maximum": ("maximum", _binary),
+        "exp": ("exp", _unary),
+        "sin": ("sin", _unary),
+        "sqrt": ("sqrt", _unary),
+        "absolute": ("absolute", _unary),
+        "logical_not": ("logical_not", _unary),
+    }
+    # PyData/Sparse implements ufuncs via ``__array_ufunc__``.
+    native_namespaces = {"sparse": onp}
+
+
+@parametrize
+class UfuncReduce(DispatchBenchmark):
+    """
+    ``ufunc.reduce`` and ``ufunc.accumulate``.
+    """
+
+    cases = {
+        "add.reduce": ("add.reduce", _reduce),
+        "multiply.reduce": ("multiply.reduce", _reduce),
+        "maximum.reduce": ("maximum.reduce", _reduce),
+        "add.accumulate": ("add.accumulate", _reduce),
+        "multiply.accumulate": ("multiply.accumulate", _reduce),
+    }
+    native_namespaces = {"sparse": onp}
+    # Sparse arrays don't support ``ufunc.accumulate``.
+    native_paths = {
+        ("add.accumulate", "sparse"): None,
+        ("multiply.accumulate", "sparse"): None,
+    }
+
+
+class UfuncFastPath:
+    """
+    Small-input ``ufunc.__call__`` on the NumPy backend, through the
+    ``__unumpy_fast_ufunc__`` fast path, through full dispatch (the same
+    backend with the hook hidden) and natively.
+    """
+
+    params = [
+        ["python-scalars", "numpy-scalars", "0d", "tiny"],
+        ["fast", "full", "native"],
+    ]
+    param_names = ["inputs", "path"]
+
+    def setup(self, inputs, path):
+        import types
+
+        import uarray as ua
+        import unumpy
+        import unumpy.numpy_backend as numpy_backend
+
+        self.args = {
+            "python-scalars": (1.0, 2.0),
+            "numpy-scalars": (onp.float64(1.0), onp.float64(2.0)),
+            "0d": (onp.array(1.0), onp.array(2.0)),
+            "tiny": (onp.ones(16), onp.ones(16)),
+        }[inputs]
+
+        if path == "native":
+            self.func = onp.add
+            self._ctx = None
+            return
+
+        backend = numpy_backend
+        if path == "full":
+            backend = types.SimpleNamespace(
+                __ua_domain__=numpy_backend.__ua_domain__,
+                __ua_function__=numpy_backend.__ua_function__,
+                __ua_convert__=numpy_backend.__ua_convert__,
+            )
+
+        self.func = unumpy.add
+        self._ctx = ua.set_backend(backend, coerce=True)
+        self._ctx.__enter__()
+
+    def teardown(self, inputs, path):
+        if self._ctx is not None:
+            self._ctx.__exit__(None, None, None)
+
+    def time_add(self, inputs, path):
+        self.func(*self.args)
+
+
+class UfuncMetadata:
+    """
+    Repeated ``ufunc.identity`` and ``ufunc.ntypes`` lookups, which are cached
+    per set of backends, and ``ufunc_info`` for every ufunc.
+    """
+
+    params = [["identity", "ntypes", "ufunc_info"]]
+    param_names = ["attribute"]
+
+    def setup(self, attribute):
+        import uarray as ua
+        import unumpy
+        import unumpy.numpy_backend as numpy_backend
+
+        if attribute == "ufunc_info":
+            self.func = unumpy.ufunc_info
+        else:
+            self.func = lambda: getattr(unumpy.add, attribute)
+
+        self._ctx = ua.set_backend(numpy_backend)
+        self._ctx.__enter__()
+
+    def teardown(self, attribute):
+        self._ctx.__exit__(None, None, None)
+
+    def time_metadata(self, attribute):
+        self.func()
@@ -0,0 +1,173 @@
+"""
+Shared machinery for the dispatch-overhead benchmarks.
+
+Every benchmark class in this suite is parametrized over the name of a
+multimethod, the backend, the input size and the ``impl`` used: ``"unumpy"``
+goes through :obj:`uarray` dispatch with the backend set, ``"native"`` calls
+the backend library directly with the same (already native) arguments. The
+difference between the two is the per-call overhead of ``unumpy``.
+
+Combinations that a backend or its native library does not implement are
+skipped by raising :obj:`NotImplementedError` from ``setup``, which is how
+``asv`` marks a benchmark as not applicable. Other errors fail the benchmark.
+"""
+import importlib
+import operator
+
+import numpy as onp
+import uarray as ua
+
+BACKENDS = ["numpy", "dask", "sparse", "torch"]
+
+# Number of elements in the main input array for each size.
+SIZES = {"tiny": 16, "medium": 16384, "large": 1048576}
+
+IMPLS = ["unumpy", "native"]
+
+
+def load_backend(name):
+    """
+    Import the ``unumpy`` backend called ``name`` and its native library.
+
+    Returns a ``(backend, native, to_native)`` tuple where ``to_native``
+    converts a NumPy array into the backend's array type.
+    """
+    try:
+        backend = importlib.import_module("unumpy.{}_backend".format(name))
+
+        if name == "numpy":
+            return backend, onp, lambda x: x
+
+        if name == "dask":
+            import dask.array as da
+
+            return backend, da, lambda x: da.from_array(x, chunks=-1)
+
+        if name == "sparse":
+            import sparse
+
+            return backend, sparse, sparse.COO.from_numpy
+
+        if name == "torch":
+            import torch
+
+            return backend, torch, torch.from_numpy
+    except ImportError:
+        raise NotImplementedError("Backend {!r} is not importable.".format(name))
+
+    raise ValueError("Unknown backend {!r}.".format(name))
+
+
+def resolve(namespace, path):
+    """
+    Look up a dotted ``path`` such as ``"add.reduce"`` on ``namespace``.
+    Raises :obj:`NotImplementedError` if it does not exist.
+    """
+    try:
+        return operator.attrgetter(path)(namespace)
+    except AttributeError:
+        raise NotImplementedError(
+            "{!r} has no attribute {!r}.".format(getattr(namespace, "__name__"), path)
+        )
+
+
+class Inputs:
+    """
+    Factory for benchmark inputs of ``n`` elements, converted to the native
+    array type of a backend.
+    """
+
+    def __init__(self, n, to_native):
+        self.n = n
+        self.side = max(int(n ** 0.5), 1)
+        self._to_native = to_native
+        self._rng = onp.random.RandomState(0)
+
+    def native(self, x):
+        return self._to_native(onp.ascontiguousarray(x))
+
+    def floats(self, n=None):
+        return self.native(self._rng.random_sample(self.n if n is None else n))
+
+    def ints(self, n=None, high=None):
+        n = self.n if n is None else n
+        return self.native(self._rng.randint(0, n if high is None else high, size=n))
+
+    def bools(self, n=None):
+        return self.native(self._rng.random_sample(self.n if n is None else n) > 0.5)
+
+    def matrix(self):
+        return self.native(self._rng.random_sample((self.side, self.side)))
+
+    def sorted(self):
+        return self.native(onp.sort(self._rng.random_sample(self.n)))
+
+
+class DispatchBenchmark:
+    """
+    Base class for a family of multimethod benchmarks.
+
+    Subclasses define ``cases``, a mapping from a case name to a tuple
+    ``(path, make_args)``. ``path`` is the dotted attribute path of the
+    function both in :obj:`unumpy` and in the native library, and
+    ``make_args`` takes an :obj:`Inputs` and returns ``(args, kwargs)``.
+    ``native_paths`` may override the native path for a ``(case, backend)``
+    pair (``None`` meaning there is no native equivalent), and
+    ``native_namespaces`` may replace the native library of a backend.
+    """
+
+    cases = {}  # type: dict
+    native_paths = {}  # type: dict
+    native_namespaces = {}  # type: dict
+    param_names = ["case", "backend", "size", "impl"]
+    timeout = 120
+
+    def setup(self, case, backend, size, impl):
+        path, make_args = self.cases[case]
+        backend_module, native, to_native = load_backend(backend)
+
+        try:
+            self.args, self.kwargs = make_args(Inputs(SIZES[size], to_native))
+        except (TypeError, ValueError, NotImplementedError) as e:
+            raise NotImplementedError(str(e))
+
+        if impl == "native":
+            native_path = self.native_paths.get((case, backend), path)
+            if native_path is None:
+                raise NotImplementedError("No native equivalent.")
+            native = self.native_namespaces.get(backend, native)
+            self.func = resolve(native, native_path)
+            self._ctx = None
+        else:
+            import unumpy
+
+            self.func = resolve(unumpy, path)
+            self._ctx = ua.set_backend(backend_module, coerce=True)
+            self._ctx.__enter__()
+
+        # Run once so that one-time costs are not timed. Combinations that
+        # aren't implemented raise ``NotImplementedError`` or
+        # ``BackendNotImplementedError``, a subclass of it, and are skipped;
+        # any other error is a failure.
+        try:
+            self.func(*self.args, **self.kwargs)
+        except BaseException:
+            self.teardown(case, backend, size, impl)
+            raise
+
+    def teardown(self, case, backend, size, impl):
+        if self._ctx is not None:
+            self._ctx.__exit__(None, None, None)
+            self._ctx = None
+
+    def time_call(self, case, backend, size, impl):
+        self.func(*self.args, **self.kwargs)
+
+
+def parametrize(cls):
+    """
+    Fill in ``params`` for a :obj:`DispatchBenchmark` subclass from its
+    ``cases``.
+    """
+    cls.params = [sorted(cls.cases), BACKENDS, list(SIZES), IMPLS]
+    return cls
@@ -79,6 +79,29 @@ backends are supported:
 * :obj:`cupy_backend`
 * :obj:`sparse_backend`
 
+Besides these, :obj:`lazy_backend` records :obj:`ufunc` calls and reductions
+into an expression graph, and evaluates it on demand, fusing chains of
+elementwise ufuncs so that no full-size intermediates are allocated, and
+:obj:`threaded_backend` computes ufuncs and reductions of large NumPy arrays on
+a pool of threads. :obj:`numba_backend` computes them with kernels compiled by
+Numba, and :obj:`process_backend` splits work that holds the GIL, such as
+ufuncs of object arrays, sorting and ``unique``, across a pool of processes
+sharing the arrays through shared memory. :obj:`memmap_backend` keeps large
+arrays in memory-mapped files, computing on them a block at a time, for arrays
+larger than memory. :obj:`router_backend` sends each call on NumPy arrays to
+NumPy, the threaded backend or Dask, by a cost model of their speed on the
+size of its arguments, which :obj:`router_backend.calibrate` fits on the
+machine.
+
+Import time
+-----------
+
+Setting the ``UNUMPY_LAZY_IMPORT`` environment variable to ``1`` makes
+``import unumpy`` defer creating its multimethods, and importing :obj:`uarray`,
+until an attribute that needs them is first accessed, for programs that start
+often and may not use :obj:`unumpy` at all. Backends can be set up front without
+importing the libraries they wrap through :obj:`unumpy.backends`.
+
 Writing Backends
 ----------------
 
@@ -150,9 +173,82 @@ In this form, one could do something like the following to use the meta-backend:
 True
 True
 """
-from ._multimethods import *
-
-from ._version import get_versions
-
-__version__ = get_versions()["version"]
-del get_versions
+import importlib as _importlib
+import os as _os
+import sys as _sys
+
+# Attributes imported from a submodule on first access, by ``__getattr__``.
+_lazy_attributes = {
+    "Profile": "._profiling",
+    "profile": "._profiling",
+    "enable_profiling": "._profiling",
+    "disable_profiling": "._profiling",
+    "ConversionCache": "._conversion_cache",
+    "conversion_cache": "._conversion_cache",
+    "MemoizingBackend": "._memoize",
+    "BufferPool": "._buffer_pool",
+    "buffer_pool": "._buffer_pool",
+    "backends": None,
+    "aio": None,
+    "stream": None,
+    "__version__": None,
+}
+
+# With ``UNUMPY_LAZY_IMPORT=1``, the multimethods are only created the first
+# time an attribute of ``unumpy`` that needs them is accessed.
+_lazy = _os.environ.get("UNUMPY_LAZY_IMPORT", "0") not in ("", "0")
+
+if not _lazy:
+    from ._multimethods import *
+
+
+def _materialize():
+    global _lazy
+
+    module = _importlib.import_module("._multimethods", __name__)
+    globals().update((k, v) for k, v in vars(module).items() if not k.startswith("_"))
+    _lazy = False
+
+
+def __getattr__(name):
+    if name in _lazy_attributes:
+        if name == "__version__":
+            from ._version import get_versions
+
+            value = get_versions()["version"]
+        elif _lazy_attributes[name] is None:
+            value = _importlib.import_module("." + name, __name__)
+        else:
+            module = _importlib.import_module(_lazy_attributes[name], __name__)
+            value = getattr(module, name)
+
+        globals()[name] = value
+        return value
+
+    if _lazy and not name.startswith("_"):
+        _materialize()
+        if name in globals():
+            return globals()[name]
+
+    if name == "__all__" and _lazy:
+        # For ``from unumpy import *``, the same names as when not lazy.
+        _materialize()
+        globals()["__all__"] = [k for k in globals() if not k.startswith("_")]
+        return globals()["__all__"]
+
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+
+def __dir__():
+    if _lazy:
+        _materialize()
+
+    return sorted(set(globals()) | set(_lazy_attributes))
+
+
+if _sys.version_info < (3, 7):
+    # Module ``__getattr__`` and ``__dir__`` need Python 3.7.
+    for _name in list(_lazy_attributes):
+        __getattr__(_name)
+    if _lazy:
+        _materialize()
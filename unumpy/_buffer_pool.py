@@ -0,0 +1,169 @@
+"""
+An opt-in pool of buffers for the outputs of ufunc calls, reused once they
+are no longer referenced.
+
+Backends opt in by taking the outputs of their ufuncs from the active pool, if
+there is one:
+
+.. code:: python
+
+    pool = get_buffer_pool()
+    if pool is not None and nbytes >= pool.min_bytes:
+        buffer = pool.take("numpy", nbytes, lambda n: np.empty(n, np.uint8))
+"""
+import contextlib
+import contextvars
+import sys
+import threading
+from typing import Any, Callable, Hashable, Iterator, Optional
+
+__all__ = ["BufferPool", "buffer_pool", "get_buffer_pool"]
+
+_active = contextvars.ContextVar(
+    "unumpy_buffer_pool", default=None
+)  # type: contextvars.ContextVar[Optional[BufferPool]]
+
+
+def _refcount(buffers, i):
+    return sys.getrefcount(buffers[i])
+
+
+# The references to a buffer only held by the pool, seen from ``_first_free``,
+# which must count them the same way ``_refcount`` does.
+_FREE_REFS = _refcount([object()], 0)
+
+
+def _first_free(buffers):
+    for i in range(len(buffers)):
+        if sys.getrefcount(buffers[i]) <= _FREE_REFS:
+            return i
+
+    return None
+
+
+class BufferPool:
+    """
+    Buffers of at least ``min_bytes``, keyed by their size and the backend
+    that allocated them, and bounded by their total size.
+
+    A buffer is free once the pool holds the only reference to it, including
+    through the arrays viewing it. It is then handed out again, without
+    being cleared or faulted into memory again. Memory shared with code that
+    doesn't hold a reference to the array it belongs to, such as a raw
+    pointer, must be copied first.
+
+    >>> import numpy
+    >>> pool = BufferPool(min_bytes=0)
+    >>> def allocate(n):
+    ...     return numpy.empty(n, numpy.uint8)
+    >>> a = pool.take("numpy", 64, allocate)
+    >>> pool.take("numpy", 64, allocate) is a
+    False
+    >>> del a
+    >>> _ = pool.take("numpy", 64, allocate)
+    >>> pool.allocations, pool.reuses, pool.nbytes
+    (2, 1, 128)
+    """
+
+    def __init__(self, max_bytes: int = 2 ** 28, min_bytes: int = 2 ** 17):
+        self.max_bytes = max_bytes
+        self.min_bytes = min_bytes
+        self.nbytes = 0
+        self.allocations = 0
+        self.reuses = 0
+        self._buffers = {}  # type: dict
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return sum(len(buffers) for buffers in self._buffers.values())
+
+    def take(self, key: Hashable, nbytes: int, allocate: Callable[[int], Any]) -> Any:
+        """
+        A free buffer of ``nbytes`` allocated with ``allocate(nbytes)`` for
+        ``key``, which identifies the allocator, or a new one.
+        """
+        with self._lock:
+            buffers = self._buffers.get((key, nbytes))
+            if buffers:
+                i = _first_free(buffers)
+                if i is not None:
+                    self.reuses += 1
+                    return buffers[i]
+
+            self.allocations += 1
+            if self.nbytes + nbytes > self.max_bytes:
+                self._evict(self.nbytes + nbytes - self.max_bytes)
+
+        buffer = allocate(nbytes)
+        with self._lock:
+            if self.nbytes + nbytes <= self.max_bytes:
+                self._buffers.setdefault((key, nbytes), []).append(buffer)
+                self.nbytes += nbytes
+
+        return buffer
+
+    def clear(self) -> None:
+        """
+        Drop every buffer. Those in use stay valid.
+        """
+        with self._lock:
+            self._buffers.clear()
+            self.nbytes = 0
+
+    def _evict(self, nbytes):
+        # Drop free buffers until ``nbytes`` are dropped.
+        for (key, size), buffers in list(self._buffers.items()):
+            i = _first_free(buffers)
+            while i is not None and nbytes > 0:
+                del buffers[i]
+                self.nbytes -= size
+                nbytes -= size
+                i = _first_free(buffers)
+
+            if not buffers:
+                del self._buffers[key, size]
+
+            if nbytes <= 0:
+                return
+
+
+@contextlib.contextmanager
+def buffer_pool(
+    pool: Optional[BufferPool] = None,
+    max_bytes: int = 2 ** 28,
+    min_bytes: int = 2 ** 17,
+) -> Iterator[BufferPool]:
+    """
+    Reuse the outputs of ufunc calls of backends that support it within this
+    context, once they are no longer referenced, for those of ``min_bytes``
+    or more: below that, the allocator already reuses memory cheaply.
+
+    Pass ``pool`` to keep using the same :obj:`BufferPool` across contexts,
+    otherwise a new one holding up to ``max_bytes`` is used.
+
+    >>> import numpy
+    >>> import uarray as ua
+    >>> import unumpy as np
+    >>> import unumpy.numpy_backend as numpy_backend
+    >>> x = numpy.linspace(0, 1, 2 ** 16)
+    >>> with ua.set_backend(numpy_backend, coerce=True), np.buffer_pool() as p:
+    ...     for _ in range(4):
+    ...         y = np.sqrt(np.add(np.multiply(x, x), 1.0))
+    >>> p.allocations, p.reuses
+    (3, 6)
+    """
+    if pool is None:
+        pool = BufferPool(max_bytes, min_bytes)
+
+    token = _active.set(pool)
+    try:
+        yield pool
+    finally:
+        _active.reset(token)
+
+
+def get_buffer_pool() -> Optional[BufferPool]:
+    """
+    Return the pool set by the innermost :obj:`buffer_pool`, if any.
+    """
+    return _active.get()
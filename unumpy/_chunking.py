@@ -0,0 +1,135 @@
+"""
+Helpers for backends that compute arrays a chunk of rows at a time, splitting
+them along their first axis.
+"""
+import contextlib
+import contextvars
+import inspect
+import threading
+from concurrent.futures import CancelledError
+from typing import Callable, Iterator, List, Tuple
+
+# Set while a call that may be cancelled between chunks is computed.
+_cancelled = contextvars.ContextVar(
+    "unumpy_cancelled", default=None
+)  # type: contextvars.ContextVar
+
+# Ufuncs whose reductions and accumulations can be computed a chunk at a time,
+# and the results for each chunk combined with the same ufunc.
+ASSOCIATIVE_UFUNCS = frozenset(
+    {
+        "add",
+        "multiply",
+        "minimum",
+        "maximum",
+        "fmin",
+        "fmax",
+        "logaddexp",
+        "logaddexp2",
+        "logical_and",
+        "logical_or",
+        "logical_xor",
+        "bitwise_and",
+        "bitwise_or",
+        "bitwise_xor",
+        "gcd",
+        "lcm",
+    }
+)
+
+
+def chunk_count(
+    length: int, row_size: int, max_chunks: int, min_chunk_size: int
+) -> int:
+    """
+    The number of chunks to split ``length`` rows of ``row_size`` elements
+    into: at most ``max_chunks``, each of at least ``min_chunk_size`` elements
+    and one row.
+    """
+    return max(1, min(max_chunks, length, length * row_size // max(min_chunk_size, 1)))
+
+
+def chunk_bounds(length: int, chunks: int) -> List[Tuple[int, int]]:
+    """
+    Split ``length`` rows into ``chunks`` ``(start, stop)`` ranges whose sizes
+    differ by at most one.
+
+    >>> chunk_bounds(10, 3)
+    [(0, 4), (4, 7), (7, 10)]
+    """
+    size, extra = divmod(length, chunks)
+    bounds = []
+    start = 0
+    for i in range(chunks):
+        stop = start + size + (i < extra)
+        bounds.append((start, stop))
+        start = stop
+
+    return bounds
+
+
+def chunk_rows(value, shape, start, stop):
+    """
+    The rows ``start:stop`` of ``value`` once broadcast to ``shape``, which
+    is ``value`` itself when it is broadcast along the first axis.
+    """
+    value_shape = getattr(value, "shape", ())
+    if len(value_shape) == len(shape) and value_shape[0] != 1:
+        return value[start:stop]
+
+    return value
+
+
+def reduction(func: Callable, reduce: Callable) -> Callable:
+    """
+    ``reduce(a, axis, out, keepdims, **kwargs)``, with ``dtype`` in ``kwargs``
+    if it is given, as a function with the parameters of the NumPy reduction
+    ``func``, and so of its multimethod, however they are passed.
+    """
+    if "dtype" in inspect.signature(func).parameters:
+
+        def implementation(a, axis=None, dtype=None, out=None, keepdims=False):
+            kwargs = {} if dtype is None else {"dtype": dtype}
+            return reduce(a, axis, out, keepdims, **kwargs)
+
+    else:
+
+        def implementation(a, axis=None, out=None, keepdims=False):  # type: ignore
+            return reduce(a, axis, out, keepdims)
+
+    return implementation
+
+
+@contextlib.contextmanager
+def cancellable(event: threading.Event) -> Iterator[None]:
+    """
+    Within this context, chunked computations raise
+    :obj:`concurrent.futures.CancelledError` before their next chunk once
+    ``event`` is set.
+    """
+    token = _cancelled.set(event)
+    try:
+        yield
+    finally:
+        _cancelled.reset(token)
+
+
+def _not_cancelled():
+    pass
+
+
+def cancellation_check() -> Callable[[], None]:
+    """
+    A function to call before computing each chunk, which raises
+    :obj:`concurrent.futures.CancelledError` if the call was cancelled. It is
+    bound to the calling context, so it may be called from other threads.
+    """
+    event = _cancelled.get()
+    if event is None:
+        return _not_cancelled
+
+    def check():
+        if event.is_set():
+            raise CancelledError
+
+    return check
@@ -0,0 +1,192 @@
+"""
+An opt-in cache for the coercions done in ``__ua_convert__``.
+
+Backends opt in by converting through the active cache, if there is one:
+
+.. code:: python
+
+    cache = get_conversion_cache()
+    if cache is not None:
+        return cache.convert(value, __name__, np.asarray)
+
+    return np.asarray(value)
+"""
+import collections
+import contextlib
+import contextvars
+import functools
+import threading
+import weakref
+from typing import Any, Callable, Hashable, Iterator, Optional
+
+__all__ = ["ConversionCache", "conversion_cache", "get_conversion_cache"]
+
+_active = contextvars.ContextVar(
+    "unumpy_conversion_cache", default=None
+)  # type: contextvars.ContextVar[Optional[ConversionCache]]
+
+
+class _StrongRef:
+    # Stands in for a weak reference to objects that don't support them.
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __call__(self):
+        return self.value
+
+
+def _discard(cache_ref, key, ref):
+    cache = cache_ref()
+    if cache is not None:
+        cache._discard(key, ref)
+
+
+class ConversionCache:
+    """
+    Converted values, keyed by the identity of the value converted and the
+    conversion, and bounded by the total ``nbytes`` of the converted values,
+    evicting the least recently used first.
+
+    Values that support weak references are not kept alive by the cache, and
+    their entries are dropped when they die. :obj:`list` and :obj:`tuple`
+    values are kept alive while cached. Other values, such as scalars, and
+    conversions without ``nbytes`` are not cached.
+
+    Values must not be modified while they are cached, or the stale conversion
+    will be reused; use :obj:`ConversionCache.invalidate` after modifying one.
+
+    >>> cache = ConversionCache()
+    >>> table = [1, 2, 3]
+    >>> import numpy
+    >>> cache.convert(table, "numpy", numpy.asarray) is cache.convert(
+    ...     table, "numpy", numpy.asarray
+    ... )
+    True
+    >>> cache.hits, cache.misses, cache.nbytes
+    (1, 1, 24)
+    """
+
+    def __init__(self, max_bytes: int = 2 ** 28):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = collections.OrderedDict()  # type: collections.OrderedDict
+        # Reentrant, since weak reference callbacks may run at any point.
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def convert(self, value: Any, key: Hashable, func: Callable[[Any], Any]) -> Any:
+        """
+        Return ``func(value)``, from the cache if ``value`` was already
+        converted with the same ``key``, which identifies the conversion.
+        """
+        if type(value) in (list, tuple):
+            weak = False
+        elif type(value).__weakrefoffset__:
+            weak = True
+        else:
+            return func(value)
+
+        cache_key = (id(value), key)
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is not None and entry[0]() is value:
+                self._entries.move_to_end(cache_key)
+                self.hits += 1
+                return entry[1]
+
+            self.misses += 1
+
+        converted = func(value)
+        try:
+            nbytes = int(converted.nbytes)
+        except (AttributeError, TypeError):
+            return converted
+
+        if nbytes > self.max_bytes:
+            return converted
+
+        if weak:
+            callback = functools.partial(_discard, weakref.ref(self), cache_key)
+            held = weakref.ref(value, callback)  # type: Callable[[], Any]
+        else:
+            held = _StrongRef(value)
+
+        with self._lock:
+            self._pop(cache_key)
+            self._entries[cache_key] = (held, converted, nbytes)
+            self.nbytes += nbytes
+            while self.nbytes > self.max_bytes:
+                _, (_, _, evicted) = self._entries.popitem(last=False)
+                self.nbytes -= evicted
+
+        return converted
+
+    def invalidate(self, value: Any) -> None:
+        """
+        Drop every conversion of ``value``.
+        """
+        with self._lock:
+            for cache_key in [k for k in self._entries if k[0] == id(value)]:
+                self._pop(cache_key)
+
+    def clear(self) -> None:
+        """
+        Drop every conversion.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+    def _pop(self, cache_key):
+        entry = self._entries.pop(cache_key, None)
+        if entry is not None:
+            self.nbytes -= entry[2]
+
+    def _discard(self, cache_key, ref):
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is not None and entry[0] is ref:
+                self._pop(cache_key)
+
+
+@contextlib.contextmanager
+def conversion_cache(
+    cache: Optional[ConversionCache] = None, max_bytes: int = 2 ** 28
+) -> Iterator[ConversionCache]:
+    """
+    Cache the coercions of backends that support it within this context.
+
+    Pass ``cache`` to keep using the same :obj:`ConversionCache` across
+    contexts, otherwise a new one holding up to ``max_bytes`` is used.
+
+    >>> import uarray as ua
+    >>> import unumpy as np
+    >>> import unumpy.numpy_backend as numpy_backend
+    >>> table = [2, 3, 5, 7]
+    >>> with ua.set_backend(numpy_backend, coerce=True), np.conversion_cache() as c:
+    ...     for i in range(3):
+    ...         _ = np.isin(i, table)
+    >>> c.hits, c.misses
+    (2, 1)
+    """
+    if cache is None:
+        cache = ConversionCache(max_bytes)
+
+    token = _active.set(cache)
+    try:
+        yield cache
+    finally:
+        _active.reset(token)
+
+
+def get_conversion_cache() -> Optional[ConversionCache]:
+    """
+    Return the cache set by the innermost :obj:`conversion_cache`, if any.
+    """
+    return _active.get()
@@ -0,0 +1,226 @@
+"""
+Utilities shared by the backends for mapping multimethods to implementations.
+"""
+import functools
+import inspect
+import types
+from typing import Any, Callable, Iterator, Mapping, Optional, Tuple
+
+from uarray import _Function, get_state
+
+
+def multimethods() -> Iterator[_Function]:
+    """
+    Iterate over every multimethod defined in :obj:`unumpy`, including the
+    methods and properties of its classes, such as :obj:`ufunc.__call__`.
+    """
+    yield from _module_multimethods()
+    yield from _class_multimethods()
+
+
+def _module_multimethods():
+    from . import _multimethods
+
+    for val in vars(_multimethods).values():
+        if isinstance(val, _Function):
+            yield val
+
+
+def _class_multimethods():
+    from . import _multimethods
+
+    for cls in vars(_multimethods).values():
+        if not isinstance(cls, type) or cls.__module__ != _multimethods.__name__:
+            continue
+
+        for name in vars(cls):
+            # Go through getattr, descriptors such as ``ufunc.__call__`` return
+            # the multimethod when accessed on the class.
+            val = getattr(cls, name)
+            if isinstance(val, property):
+                val = val.fget
+
+            if isinstance(val, _Function):
+                yield val
+
+
+def _resolve(library, method):
+    name = method.__name__
+    if name.startswith("__"):
+        return NotImplemented
+
+    return getattr(library, name, NotImplemented)
+
+
+# The multimethods that take ``chunks``, a hint for backends with chunked
+# arrays.
+_CHUNKED_CREATION = frozenset(
+    {"zeros", "ones", "full", "empty", "eye", "arange", "linspace"}
+)
+
+
+def _takes_chunks(func):
+    try:
+        return "chunks" in inspect.signature(func).parameters
+    except (TypeError, ValueError):
+        return False
+
+
+def ignore_chunks(func: Callable) -> Callable:
+    """
+    Wrap the implementation of a creation multimethod for a backend whose
+    arrays aren't chunked, to ignore ``chunks``.
+    """
+
+    @functools.wraps(func)
+    def wrapped(*args, chunks=None, **kwargs):
+        return func(*args, **kwargs)
+
+    return wrapped
+
+
+class _DispatchTable(dict):
+    __slots__ = ("_library",)
+
+    def __init__(self, library):
+        super().__init__()
+        self._library = library
+
+    def __missing__(self, method):
+        # Multimethods not known when the table was built, e.g. ones created
+        # by other libraries in the ``numpy`` domain, are resolved by name.
+        return _resolve(self._library, method)
+
+
+def build_dispatch_table(
+    library: object, implementations: Optional[Mapping[Any, Any]] = None
+) -> Mapping[_Function, Callable]:
+    """
+    Build a read-only mapping from every :obj:`unumpy` multimethod to the
+    callable that implements it in a backend.
+
+    Module-level multimethods resolve to the attribute of ``library`` with the
+    same name, or to :obj:`NotImplemented` if there is none. Methods and
+    properties of :obj:`unumpy` classes only resolve through
+    ``implementations``, which also takes precedence over ``library`` and may
+    map a multimethod to :obj:`NotImplemented` to explicitly disable it.
+
+    The creation multimethods taking ``chunks`` ignore it, unless their
+    implementation takes it too.
+
+    The table is meant to be built once, when the backend is imported, so that
+    ``__ua_function__`` is a single lookup:
+
+    >>> import numpy
+    >>> import unumpy
+    >>> table = build_dispatch_table(numpy, {unumpy.sum: NotImplemented})
+    >>> table[unumpy.argmax] is numpy.argmax
+    True
+    >>> table[unumpy.sum] is NotImplemented
+    True
+    >>> table[unumpy.ufunc.__call__] is NotImplemented
+    True
+    """
+    table = _DispatchTable(library)
+
+    for method in _module_multimethods():
+        table[method] = _resolve(library, method)
+
+    for method in _class_multimethods():
+        table[method] = NotImplemented
+
+    if implementations is not None:
+        table.update(implementations)
+
+    for method in _module_multimethods():
+        impl = table[method]
+        if method.__name__ in _CHUNKED_CREATION and impl is not NotImplemented:
+            if not _takes_chunks(impl):
+                table[method] = ignore_chunks(impl)
+
+    return types.MappingProxyType(table)
+
+
+# ``uarray`` has no public way of listing the backends it would try, only of
+# copying the whole state, which is a new object every time. Its private
+# ``_pickle`` is looked up once, and if it is missing or returns something
+# unexpected, the state is treated as not inspectable, so that callers fall
+# back to the full dispatch.
+_pickle_state = getattr(type(get_state()), "_pickle", None)
+_UNEXPECTED_STATE = (AttributeError, TypeError, ValueError, IndexError, KeyError)
+
+
+def active_backends(domain: str = "numpy") -> Optional[Tuple[Tuple[Any, bool], ...]]:
+    """
+    Return the ``(backend, coerce)`` pairs that :obj:`uarray` would try for a
+    multimethod in ``domain``, in order, based on the current backend state.
+
+    Returns ``None`` if the state cannot be inspected.
+
+    >>> import uarray as ua
+    >>> import unumpy.numpy_backend as numpy_backend
+    >>> with ua.set_backend(numpy_backend, coerce=True):
+    ...     active_backends()[0] == (numpy_backend, True)
+    True
+    """
+    if _pickle_state is None:
+        return None
+
+    try:
+        global_state, local_state, _ = _pickle_state(get_state())
+        return _active_backends(global_state, local_state, domain)
+    except _UNEXPECTED_STATE:
+        return None
+
+
+def first_backend(domain: str = "numpy") -> Optional[Tuple[Any, bool]]:
+    """
+    Return the first ``(backend, coerce)`` pair that :obj:`uarray` would try
+    for a multimethod in ``domain``, or ``None`` if there is none or the state
+    cannot be inspected.
+
+    This is :obj:`active_backends` short-circuited for the common case where
+    the innermost backend is all that matters.
+    """
+    if _pickle_state is None:
+        return None
+
+    try:
+        global_state, local_state, _ = _pickle_state(get_state())
+        local = local_state.get(domain)
+        if local is not None and local[1]:
+            backend, coerce, _ = local[1][-1]
+            if backend not in local[0]:
+                return backend, coerce
+
+        backends = _active_backends(global_state, local_state, domain)
+    except _UNEXPECTED_STATE:
+        return None
+
+    return backends[0] if backends else None
+
+
+def _active_backends(global_state, local_state, domain):
+    skipped, local_backends = local_state.get(domain, ((), ()))
+
+    backends = []
+    for backend, coerce, only in reversed(local_backends):
+        if backend in skipped:
+            continue
+
+        backends.append((backend, coerce))
+        if only:
+            return tuple(backends)
+
+    if domain in global_state:
+        (backend, coerce, only), registered, try_global_last = global_state[domain]
+        if backend is not None and backend not in skipped and not try_global_last:
+            backends.append((backend, coerce))
+
+        if not only:
+            backends.extend((b, False) for b in registered if b not in skipped)
+
+        if backend is not None and backend not in skipped and try_global_last:
+            backends.append((backend, coerce))
+
+    return tuple(backends)
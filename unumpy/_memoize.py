@@ -0,0 +1,205 @@
+"""
+A backend that memoizes the results of another backend for pure multimethods.
+"""
+import collections
+import hashlib
+import sys
+import threading
+import weakref
+from typing import Any, Iterable, Optional
+
+from ._multimethods import eye, linspace, meshgrid, searchsorted, sort, unique
+
+__all__ = ["MemoizingBackend"]
+
+# The multimethods memoized unless others are given.
+DEFAULT_METHODS = frozenset({unique, sort, searchsorted, linspace, eye, meshgrid})
+
+_SCALAR_TYPES = (type(None), bool, int, float, complex, str, bytes, slice, type)
+
+
+class _Uncacheable(Exception):
+    pass
+
+
+def _fingerprint(value, refs):
+    # A hashable key identifying the contents of ``value``. Objects with a
+    # version counter, such as PyTorch tensors, are identified by it, and a
+    # weak reference to them is added to ``refs`` so a reused ``id`` is
+    # noticed. Objects with a buffer are identified by a hash of its bytes.
+    if isinstance(value, _SCALAR_TYPES):
+        return type(value), value
+
+    if type(value) in (tuple, list):
+        return type(value), tuple(_fingerprint(v, refs) for v in value)
+
+    np = sys.modules.get("numpy")
+    if np is not None and isinstance(value, np.dtype):
+        return value
+
+    version = getattr(value, "_version", None)
+    if isinstance(version, int):
+        try:
+            refs.append(weakref.ref(value))
+        except TypeError:
+            raise _Uncacheable
+
+        return type(value), id(value), version
+
+    try:
+        view = memoryview(value)
+    except TypeError:
+        raise _Uncacheable
+
+    if view.format == "O":
+        # Pointers to objects, not their contents.
+        raise _Uncacheable
+
+    data = view.cast("B") if view.c_contiguous else view.tobytes()
+    digest = hashlib.sha1(data).digest()
+    return type(value), str(getattr(value, "dtype", view.format)), view.shape, digest
+
+
+def _parts(result):
+    return result if type(result) in (tuple, list) else (result,)
+
+
+def _nbytes(result, args):
+    """
+    The total ``nbytes`` of ``result``, or ``None`` if it can't be cached: if
+    a part of it has no ``nbytes`` or shares memory with an argument.
+    """
+    np = sys.modules.get("numpy")
+    arrays = [a for a in args if np is not None and isinstance(a, np.ndarray)]
+
+    total = 0
+    for part in _parts(result):
+        nbytes = getattr(part, "nbytes", None)
+        if not isinstance(nbytes, int) or any(part is a for a in args):
+            return None
+
+        if arrays and isinstance(part, np.ndarray):
+            if any(np.may_share_memory(part, a) for a in arrays):
+                return None
+
+        total += nbytes
+
+    return total
+
+
+def _freeze(result):
+    # Cached results are shared between calls, so they mustn't be written to.
+    for part in _parts(result):
+        try:
+            part.flags.writeable = False
+        except (AttributeError, ValueError):
+            pass
+
+
+class MemoizingBackend:
+    """
+    A backend in front of ``backend`` that caches its results for calls to
+    the multimethods in ``methods`` with the same arguments, bounded by their
+    total ``nbytes``, evicting the least recently used first.
+
+    Arrays are identified by a hash of their contents, or by their version
+    counter if they have one, like PyTorch tensors. Calls with ``out=``, with
+    arguments that can't be identified, such as object arrays, and with
+    results that share memory with an argument are not cached. Cached NumPy
+    arrays are made read-only, since they are returned again.
+
+    Hashing reads the whole of each array, so memoize the methods that cost
+    more than that.
+
+    >>> import uarray as ua
+    >>> import unumpy as np
+    >>> import unumpy.numpy_backend as numpy_backend
+    >>> memo = np.MemoizingBackend(numpy_backend)
+    >>> with ua.set_backend(memo, coerce=True):
+    ...     for _ in range(3):
+    ...         u = np.unique([3, 1, 3, 2])
+    >>> u
+    array([1, 2, 3])
+    >>> memo.hits, memo.misses, memo.nbytes
+    (2, 1, 24)
+    """
+
+    def __init__(
+        self,
+        backend: Any,
+        methods: Optional[Iterable[Any]] = None,
+        max_bytes: int = 2 ** 28,
+    ):
+        self.backend = backend
+        self.methods = DEFAULT_METHODS if methods is None else frozenset(methods)
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = collections.OrderedDict()  # type: collections.OrderedDict
+        self._lock = threading.Lock()
+
+        self.__ua_domain__ = backend.__ua_domain__
+        self.__ua_convert__ = backend.__ua_convert__
+        fast = getattr(backend, "__unumpy_fast_ufunc__", None)
+        if fast is not None:
+            self.__unumpy_fast_ufunc__ = fast
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __ua_function__(self, method, args, kwargs):
+        if method not in self.methods or kwargs.get("out") is not None:
+            return self.backend.__ua_function__(method, args, kwargs)
+
+        refs = []  # type: list
+        try:
+            key = (
+                method,
+                _fingerprint(args, refs),
+                _fingerprint(sorted(kwargs.items()), refs),
+            )
+        except _Uncacheable:
+            return self.backend.__ua_function__(method, args, kwargs)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and all(r() is not None for r in entry[0]):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                result = entry[1]
+                return list(result) if type(result) is list else result
+
+            self.misses += 1
+
+        result = self.backend.__ua_function__(method, args, kwargs)
+        if result is NotImplemented:
+            return result
+
+        nbytes = _nbytes(result, args)
+        if nbytes is None or nbytes > self.max_bytes:
+            return result
+
+        _freeze(result)
+        with self._lock:
+            self._pop(key)
+            self._entries[key] = (refs, result, nbytes)
+            self.nbytes += nbytes
+            while self.nbytes > self.max_bytes:
+                _, (_, _, evicted) = self._entries.popitem(last=False)
+                self.nbytes -= evicted
+
+        return list(result) if type(result) is list else result
+
+    def clear(self) -> None:
+        """
+        Drop every cached result.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+    def _pop(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.nbytes -= entry[2]
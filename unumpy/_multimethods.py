@@ -1,68 +1,116 @@
 import functools
+import inspect as _inspect
 import operator
-from uarray import create_multimethod, mark_as, all_of_type, Dispatchable
+import types as _types
+import typing as _typing
+from uarray import (
+    create_multimethod,
+    mark_as,
+    all_of_type,
+    Dispatchable,
+    BackendNotImplementedError,
+)
 import builtins
+from ._dispatch import active_backends, first_backend
+
+
+class _ArgReplacer:
+    """
+    A declarative argument replacer.
+
+    Each of ``params`` is the parameter of a multimethod that receives the
+    dispatchable at the same position, given either as a positional index or
+    as a keyword name. Parameters named in ``inject`` are passed to the backend
+    as keywords even if the caller did not supply them. Arguments passed
+    positionally from ``keywords_from`` on are passed to the backend as
+    keywords, leaving out those that are their defaults.
+
+    The specification is compiled against the signature of each multimethod
+    it is used with by :obj:`create_numpy`, so replacing arguments does not
+    need to bind the call to a signature every time.
+    """
+
+    def __init__(self, *params, inject=(), keywords_from=None):
+        self.params = params
+        self.inject = frozenset(inject)
+        self.keywords_from = keywords_from
+
+    def compile(self, argument_extractor):
+        code = _inspect.unwrap(argument_extractor).__code__
+        names = code.co_varnames[: code.co_argcount + code.co_kwonlyargcount]
+        keywords_from = self.keywords_from
+        defaults = {
+            name: param.default
+            for name, param in _inspect.signature(argument_extractor).parameters.items()
+        }
+
+        targets = []
+        for i, param in enumerate(self.params):
+            if isinstance(param, int):
+                pos, name = param, names[param]
+            elif param in names:
+                pos, name = names.index(param), param
+                if pos >= code.co_argcount:
+                    # Keyword-only parameter
+                    pos = None
+            else:
+                continue
+
+            targets.append((i, pos, name, name in self.inject))
+
+        targets = tuple(targets)
+
+        def replacer(args, kwargs, dispatchables):
+            new_args = list(args)
+            new_kwargs = kwargs
+            if keywords_from is not None and len(args) > keywords_from:
+                # Arguments the caller left at their defaults are left out
+                # before they can be replaced by their dispatchables.
+                positional = zip(names[keywords_from:], args[keywords_from:])
+                new_kwargs = {
+                    name: value
+                    for name, value in positional
+                    if value is not defaults[name]
+                }
+                new_kwargs.update(kwargs)
+                del new_args[keywords_from:]
+
+            for i, pos, name, inject in targets:
+                if pos is not None and pos < len(new_args):
+                    new_args[pos] = dispatchables[i]
+                elif inject or name in new_kwargs:
+                    if new_kwargs is kwargs:
+                        new_kwargs = dict(kwargs)
+                    new_kwargs[name] = dispatchables[i]
+
+            return tuple(new_args), new_kwargs
+
+        return replacer
+
+
+def create_numpy(argument_replacer, default=None):
+    def decorator(argument_extractor):
+        replacer = argument_replacer
+        if isinstance(replacer, _ArgReplacer):
+            replacer = replacer.compile(argument_extractor)
+
+        return create_multimethod(replacer, domain="numpy", default=default)(
+            argument_extractor
+        )
 
-create_numpy = functools.partial(create_multimethod, domain="numpy")
+    return decorator
 
 
 def _identity_argreplacer(args, kwargs, arrays):
     return args, kwargs
 
 
-def _dtype_argreplacer(args, kwargs, dispatchables):
-    def replacer(*a, dtype=None, **kw):
-        out_kw = kw.copy()
-        out_kw["dtype"] = dispatchables[0]
-        return a, out_kw
-
-    return replacer(*args, **kwargs)
-
-
-def _self_argreplacer(args, kwargs, dispatchables):
-    def self_method(a, *args, **kwargs):
-        return dispatchables + args, kwargs
-
-    return self_method(*args, **kwargs)
-
-
-def _ureduce_argreplacer(args, kwargs, dispatchables):
-    def ureduce(self, a, axis=0, dtype=None, out=None, keepdims=False):
-        return (
-            (dispatchables[0], dispatchables[1]),
-            dict(
-                axis=axis,
-                dtype=dispatchables[2],
-                out=dispatchables[3],
-                keepdims=keepdims,
-            ),
-        )
-
-    return ureduce(*args, **kwargs)
-
-
-def _reduce_argreplacer(args, kwargs, arrays):
-    def reduce(a, axis=None, dtype=None, out=None, keepdims=False):
-        kwargs = {}
-        if dtype is not None:
-            kwargs["dtype"] = dtype
-
-        if keepdims is not False:
-            kwargs["keepdims"] = keepdims
-
-        return ((arrays[0],), dict(axis=axis, out=arrays[1], **kwargs))
-
-    return reduce(*args, **kwargs)
-
-
-def _first2argreplacer(args, kwargs, arrays):
-    def func(a, b, *args, **kw):
-        kw_out = kw.copy()
-        if "out" in kw:
-            kw_out["out"] = arrays[2]
-        return arrays[:2] + args, kw_out
-
-    return func(*args, **kwargs)
+_dtype_argreplacer = _ArgReplacer("dtype", inject=("dtype",))
+_self_argreplacer = _ArgReplacer(0)
+_ureduce_argreplacer = _ArgReplacer(0, 1, "dtype", "out", keywords_from=2)
+_reduce_argreplacer = _ArgReplacer(0, "out", keywords_from=1)
+_first2argreplacer = _ArgReplacer(0, 1, "out")
+_linspace_argreplacer = _ArgReplacer(0, 1, "dtype", inject=("dtype",))
 
 
 def getattr_impl(attr):
@@ -100,15 +148,15 @@ def _ufunc_argreplacer(args, kwargs, arrays):
     return (arrays[0], *in_arrays), kwargs
 
 
-def _math_op(name, inplace=True, reverse=True):
+def _math_op(ufunc, inplace=True, reverse=True):
     def f(self, other):
-        return globals()[name](self, other)
+        return ufunc(self, other)
 
     def r(self, other):
-        return globals()[name](other, self)
+        return ufunc(other, self)
 
     def i(self, other):
-        return globals()[name](self, other, out=self)
+        return ufunc(self, other, out=self)
 
     out = [f]
 
@@ -121,38 +169,72 @@ def _math_op(name, inplace=True, reverse=True):
     return out if len(out) != 1 else out[0]
 
 
-def _unary_op(name):
+def _unary_op(ufunc):
     def f(self):
-        return globals()[name](self)
+        return ufunc(self)
 
     return f
 
 
+_Operator = _typing.Callable[..., _typing.Any]
+
+
 class ndarray:
-    __add__, __radd__, __iadd__ = _math_op("add")
-    __sub__, __rsub__, __isub__ = _math_op("subtract")
-    __mul__, __rmul__, __imul__ = _math_op("multiply")
-    __truediv__, __rtruediv__, __itruediv__ = _math_op("true_divide")
-    __floordiv__, __rfloordiv__, __ifloordiv__ = _math_op("floor_divide")
-    __matmul__, __rmatmul__, __imatmul__ = _math_op("matmul")
-    __mod__, __rmod__, __imod__ = _math_op("mod")
-    __divmod__, __rdivmod__ = _math_op("divmod", reverse=False)
-    __lshift__, __rlshift__, __ilshift__ = _math_op("left_shift")
-    __rshift__, __rrshift__, __irshift__ = _math_op("right_shift")
-    __pow__, __rpow__, __ipow__ = _math_op("power")
-    __and__, __rand__, __iand__ = _math_op("bitwise_and")
-    __or__, __ror__, __ior__ = _math_op("bitwise_or")
-    __xor__, __rxor__, __ixor__ = _math_op("bitwise_xor")
-    __neg__ = _unary_op("negative")
-    __pos__ = _unary_op("positive")
-    __abs__ = _unary_op("absolute")
-    __invert__ = _unary_op("invert")
-    __lt__ = _math_op("less", inplace=False, reverse=False)
-    __gt__ = _math_op("greater", inplace=False, reverse=False)
-    __le__ = _math_op("less_equal", inplace=False, reverse=False)
-    __ge__ = _math_op("greater_equal", inplace=False, reverse=False)
-    __eq__ = _math_op("equal", inplace=False, reverse=False)
-    __ne__ = _math_op("not_equal", inplace=False, reverse=False)
+    # The operators are bound to the ufuncs they call once those are defined,
+    # further down.
+    __add__: _Operator
+    __radd__: _Operator
+    __iadd__: _Operator
+    __sub__: _Operator
+    __rsub__: _Operator
+    __isub__: _Operator
+    __mul__: _Operator
+    __rmul__: _Operator
+    __imul__: _Operator
+    __truediv__: _Operator
+    __rtruediv__: _Operator
+    __itruediv__: _Operator
+    __floordiv__: _Operator
+    __rfloordiv__: _Operator
+    __ifloordiv__: _Operator
+    __matmul__: _Operator
+    __rmatmul__: _Operator
+    __imatmul__: _Operator
+    __mod__: _Operator
+    __rmod__: _Operator
+    __imod__: _Operator
+    __divmod__: _Operator
+    __rdivmod__: _Operator
+    __lshift__: _Operator
+    __rlshift__: _Operator
+    __ilshift__: _Operator
+    __rshift__: _Operator
+    __rrshift__: _Operator
+    __irshift__: _Operator
+    __pow__: _Operator
+    __rpow__: _Operator
+    __ipow__: _Operator
+    __and__: _Operator
+    __rand__: _Operator
+    __iand__: _Operator
+    __or__: _Operator
+    __ror__: _Operator
+    __ior__: _Operator
+    __xor__: _Operator
+    __rxor__: _Operator
+    __ixor__: _Operator
+    __neg__: _Operator
+    __pos__: _Operator
+    __abs__: _Operator
+    __invert__: _Operator
+    __lt__: _Operator
+    __gt__: _Operator
+    __le__: _Operator
+    __ge__: _Operator
+    __eq__: _Operator
+    __ne__: _Operator
+    # Unhashable, as NumPy arrays are.
+    __hash__ = None  # type: ignore
 
     def __array_ufunc__(self, method, *inputs, **kwargs):
         return NotImplemented
@@ -162,22 +244,102 @@ class dtype:
     pass
 
 
+class _UfuncCall:
+    """
+    Descriptor for :obj:`ufunc.__call__`.
+
+    Accessed on the class, it returns the multimethod, which is what backends
+    override. Calling a ufunc first tries a fast path: if neither ``out`` nor
+    ``dtype`` is given and the first backend that :obj:`uarray` would try
+    defines ``__unumpy_fast_ufunc__(ufunc, args, coerce)``, that is called
+    directly, skipping the creation and conversion of dispatchables. It must
+    return what the multimethod would have returned for that backend, or
+    ``NotImplemented`` to fall back to the full dispatch.
+    """
+
+    def __init__(self, multimethod):
+        self.multimethod = multimethod
+
+        def call(self, *args, out=None, dtype=None):
+            if out is None and dtype is None:
+                first = first_backend()
+                if first is not None:
+                    backend, coerce = first
+                    fast = getattr(backend, "__unumpy_fast_ufunc__", None)
+                    if fast is not None:
+                        result = fast(self, args, coerce)
+                        if result is not NotImplemented:
+                            return result
+
+                return multimethod(self, *args)
+
+            kwargs = {}
+            if out is not None:
+                kwargs["out"] = out
+            if dtype is not None:
+                kwargs["dtype"] = dtype
+
+            return multimethod(self, *args, **kwargs)
+
+        self._call = functools.wraps(multimethod)(call)
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self.multimethod
+
+        return _types.MethodType(self._call, instance)
+
+
+class _UfuncMetadata(property):
+    """
+    A property of :obj:`ufunc` whose getter is a multimethod, with the value
+    cached per ufunc and set of active backends, so it is only dispatched
+    again after the backends change.
+    """
+
+    # Bounds the cache of each ufunc, should backends be created repeatedly.
+    max_cached = 32
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+
+        try:
+            key = (self.fget, active_backends())
+            return instance._metadata[key]
+        except KeyError:
+            pass
+        except TypeError:
+            # Unhashable backends.
+            return self.fget(instance)
+
+        value = self.fget(instance)
+        if key[1] is not None:
+            if len(instance._metadata) >= self.max_cached:
+                instance._metadata.clear()
+
+            instance._metadata[key] = value
+
+        return value
+
+
 class ufunc:
     def __init__(self, name, nin, nout):
         self.name = name
         self.nin, self.nout = nin, nout
+        self._metadata = {}
 
     def __str__(self):
         return "<ufunc '{}'>".format(self.name)
 
     __repr__ = __str__
 
-    @property  # type: ignore
+    @_UfuncMetadata  # type: ignore
     @create_numpy(_self_argreplacer)
     def types(self):
         return (mark_ufunc(self),)
 
-    @property  # type: ignore
+    @_UfuncMetadata  # type: ignore
     @create_numpy(_self_argreplacer)
     def identity(self):
         return (mark_ufunc(self),)
@@ -190,6 +352,7 @@ class ufunc:
     def ntypes(self):
         return len(self.types)
 
+    @_UfuncCall
     @create_numpy(_ufunc_argreplacer)
     @all_of_type(ndarray)
     def __call__(self, *args, out=None, dtype=None):
@@ -298,6 +461,34 @@ minimum = ufunc("minimum", 2, 1)
 fmax = ufunc("fmax", 2, 1)
 fmin = ufunc("fmin", 2, 1)
 
+# Operators
+ndarray.__add__, ndarray.__radd__, ndarray.__iadd__ = _math_op(add)
+ndarray.__sub__, ndarray.__rsub__, ndarray.__isub__ = _math_op(subtract)
+ndarray.__mul__, ndarray.__rmul__, ndarray.__imul__ = _math_op(multiply)
+ndarray.__truediv__, ndarray.__rtruediv__, ndarray.__itruediv__ = _math_op(true_divide)
+ndarray.__floordiv__, ndarray.__rfloordiv__, ndarray.__ifloordiv__ = _math_op(
+    floor_divide
+)
+ndarray.__matmul__, ndarray.__rmatmul__, ndarray.__imatmul__ = _math_op(matmul)
+ndarray.__mod__, ndarray.__rmod__, ndarray.__imod__ = _math_op(mod)
+ndarray.__divmod__, ndarray.__rdivmod__ = _math_op(divmod, inplace=False)
+ndarray.__lshift__, ndarray.__rlshift__, ndarray.__ilshift__ = _math_op(left_shift)
+ndarray.__rshift__, ndarray.__rrshift__, ndarray.__irshift__ = _math_op(right_shift)
+ndarray.__pow__, ndarray.__rpow__, ndarray.__ipow__ = _math_op(power)
+ndarray.__and__, ndarray.__rand__, ndarray.__iand__ = _math_op(bitwise_and)
+ndarray.__or__, ndarray.__ror__, ndarray.__ior__ = _math_op(bitwise_or)  # type: ignore
+ndarray.__xor__, ndarray.__rxor__, ndarray.__ixor__ = _math_op(bitwise_xor)
+ndarray.__neg__ = _unary_op(negative)
+ndarray.__pos__ = _unary_op(positive)
+ndarray.__abs__ = _unary_op(absolute)
+ndarray.__invert__ = _unary_op(invert)
+ndarray.__lt__ = _math_op(less, inplace=False, reverse=False)
+ndarray.__gt__ = _math_op(greater, inplace=False, reverse=False)
+ndarray.__le__ = _math_op(less_equal, inplace=False, reverse=False)
+ndarray.__ge__ = _math_op(greater_equal, inplace=False, reverse=False)
+ndarray.__eq__ = _math_op(equal, inplace=False, reverse=False)  # type: ignore
+ndarray.__ne__ = _math_op(not_equal, inplace=False, reverse=False)  # type: ignore
+
 # Floating functions
 isfinite = ufunc("isfinite", 1, 1)
 isinf = ufunc("greater_equal", 1, 1)
@@ -316,13 +507,17 @@ ceil = ufunc("ceil", 1, 1)
 trunc = ufunc("trunc", 1, 1)
 
 
+# The ``chunks`` of the creation functions are the block shape for backends
+# with chunked arrays, such as Dask, and ignored by other backends.
+
+
 @create_numpy(_dtype_argreplacer)
-def full(shape, fill_value, dtype=None, order="C"):
+def full(shape, fill_value, dtype=None, order="C", chunks=None):
     return (mark_dtype(dtype),)
 
 
 @create_numpy(_dtype_argreplacer)
-def arange(start, stop=None, step=None, dtype=None):
+def arange(start, stop=None, step=None, dtype=None, chunks=None):
     return (mark_dtype(dtype),)
 
 
@@ -333,22 +528,36 @@ def array(object, dtype=None, copy=True, order="K", subok=False, ndmin=0):
 
 @create_numpy(
     _dtype_argreplacer,
-    default=lambda shape, dtype, order="C": full(shape, 0, dtype, order),
+    default=lambda shape, dtype, order="C", chunks=None: full(
+        shape, 0, dtype, order, chunks
+    ),
 )
-def zeros(shape, dtype=float, order="C"):
+def zeros(shape, dtype=float, order="C", chunks=None):
     return (mark_dtype(dtype),)
 
 
 @create_numpy(
     _dtype_argreplacer,
-    default=lambda shape, dtype, order="C": full(shape, 1, dtype, order),
+    default=lambda shape, dtype, order="C", chunks=None: full(
+        shape, 1, dtype, order, chunks
+    ),
 )
-def ones(shape, dtype=float, order="C"):
+def ones(shape, dtype=float, order="C", chunks=None):
+    return (mark_dtype(dtype),)
+
+
+@create_numpy(
+    _dtype_argreplacer,
+    default=lambda shape, dtype, order="C", chunks=None: zeros(
+        shape, dtype, order, chunks
+    ),
+)
+def empty(shape, dtype=float, order="C", chunks=None):
     return (mark_dtype(dtype),)
 
 
 @create_numpy(_dtype_argreplacer)
-def eye(N, M=None, k=0, dtype=float, order="C"):
+def eye(N, M=None, k=0, dtype=float, order="C", chunks=None):
     return (mark_dtype(dtype),)
 
 
@@ -719,37 +928,28 @@ def compress(condition, a, axis=None, out=None):
     return (condition, a, out)
 
 
-def _linspace_argreplacer(args, kwargs, arrays):
-    def func(a, b, num=50, endpoint=True, retstep=False, dtype=None, axis=0):
-        kw_out = dict(num=num, endpoint=endpoint, retstep=retstep, axis=axis)
-        kw_out["dtype"] = arrays[2]
-        return arrays[:2], kw_out
-
-    return func(*args, **kwargs)
-
-
 @create_numpy(_linspace_argreplacer)
 @all_of_type(ndarray)
-def linspace(start, stop, num=50, endpoint=True, retstep=False, dtype=None, axis=0):
+def linspace(
+    start,
+    stop,
+    num=50,
+    endpoint=True,
+    retstep=False,
+    dtype=None,
+    axis=0,
+    chunks=None,
+):
     return (start, stop, mark_dtype(dtype))
 
 
-def _logspace_argreplacer(args, kwargs, arrays):
-    def func(a, b, num=50, endpoint=True, base=10, dtype=None, axis=0):
-        kw_out = dict(num=num, endpoint=endpoint, base=base, axis=axis)
-        kw_out["dtype"] = arrays[2]
-        return arrays[:2], kw_out
-
-    return func(*args, **kwargs)
-
-
 def _logspace_default(start, stop, num=50, endpoint=True, base=10, dtype=None, axis=0):
     return base ** linspace(
         start, stop, num=num, endpoint=endpoint, dtype=dtype, axis=axis
     )
 
 
-@create_numpy(_logspace_argreplacer, default=_logspace_default)
+@create_numpy(_linspace_argreplacer, default=_logspace_default)
 @all_of_type(ndarray)
 def logspace(start, stop, num=50, endpoint=True, base=10, dtype=None, axis=0):
     return (start, stop, mark_dtype(dtype))
@@ -795,6 +995,35 @@ for key, val in globals().copy().items():
         ufunc_list.append(key)
 
 
+def ufunc_info():
+    """
+    Return the metadata of every ufunc in :obj:`ufunc_list` for the current
+    backends, as a dict from the name in :obj:`ufunc_list` to a dict with the
+    ``name``, ``nin``, ``nout``, ``nargs``, ``ntypes``, ``types`` and
+    ``identity`` of the ufunc. The last three are ``None`` if no backend
+    implements them.
+    """
+    info = {}
+    for key in ufunc_list:
+        u = globals()[key]
+        try:
+            types, identity = u.types, u.identity
+        except BackendNotImplementedError:
+            types = identity = None
+
+        info[key] = {
+            "name": u.name,
+            "nin": u.nin,
+            "nout": u.nout,
+            "nargs": u.nargs,
+            "ntypes": len(types) if types is not None else None,
+            "types": types,
+            "identity": identity,
+        }
+
+    return info
+
+
 @create_numpy(_self_argreplacer, default=getattr_impl("shape"))
 @all_of_type(ndarray)
 def shape(array):
@@ -0,0 +1,417 @@
+"""
+Opt-in instrumentation of multimethod dispatch.
+
+Profiling sets a backend that sees every call first and dispatches it again to
+proxies of the remaining backends, which time their ``__ua_convert__`` and
+``__ua_function__`` and call them with the backends set as before. That is how
+the time of each phase of a call and the backend that served it are known.
+The backends themselves are never modified, so calls made by other threads are
+not affected, and nothing is set while profiling is off, so the cost when
+disabled is zero.
+"""
+import contextlib
+import json
+import os
+import sys
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import uarray as ua
+
+from ._dispatch import active_backends
+from ._multimethods import ndarray, ufunc
+
+__all__ = ["Profile", "profile", "enable_profiling", "disable_profiling"]
+
+PHASES = ("extraction", "convert", "execute", "default", "overhead")
+
+class _ThreadState(threading.local):
+    def __init__(self):
+        # Profiles recording the calls made in this thread.
+        self.profiles = []
+        # The context setting ``_backend`` while ``profiles`` is not empty.
+        self.context = None
+        # The calls being dispatched again by ``_backend``, innermost last.
+        self.calls = []
+        # The profile used by ``enable_profiling``.
+        self.toggled = None
+
+
+_state = _ThreadState()
+
+
+def _backend_name(backend):
+    return getattr(backend, "__name__", None) or type(backend).__name__
+
+
+def _method_name(method, args):
+    if args and isinstance(args[0], ufunc):
+        return "{}.{}".format(args[0].name, method.__name__)
+
+    return method.__name__
+
+
+def _copied_bytes(src, dst):
+    # Only copies into NumPy arrays are detected. ``numpy`` is not a
+    # requirement of ``unumpy``, if it isn't imported there are no such arrays.
+    np = sys.modules.get("numpy")
+    if np is None or not isinstance(dst, np.ndarray):
+        return 0
+
+    if isinstance(src, np.ndarray) and np.may_share_memory(src, dst):
+        return 0
+
+    return dst.nbytes
+
+
+class _Call:
+    __slots__ = (
+        "method",
+        "name",
+        "thread",
+        "start",
+        "end",
+        "extracted",
+        "backend",
+        "phases",
+        "spans",
+        "coercions",
+        "copies",
+        "copied_bytes",
+        "in_default",
+        "state",
+    )
+
+    def __init__(self, method, args, state):
+        self.method = method
+        self.name = _method_name(method, args)
+        self.thread = threading.get_ident()
+        self.start = self.end = time.perf_counter_ns()
+        # When the first backend was tried.
+        self.extracted = None  # type: Optional[int]
+        self.backend = None
+        self.phases = dict.fromkeys(PHASES, 0)
+        self.spans = []
+        self.coercions = self.copies = self.copied_bytes = 0
+        # ``uarray`` tries the default after each backend that doesn't
+        # implement a method, with only that backend set. Calls made by the
+        # default don't reach ``_backend`` and count towards the default.
+        self.in_default = False
+        # The backend state the call was made in, which the backends are
+        # called with.
+        self.state = state
+
+    def span(self, phase, backend, start, end):
+        self.phases[phase] += end - start
+        self.spans.append((phase, _backend_name(backend), start, end))
+
+    def finish(self, failed):
+        self.end = time.perf_counter_ns()
+        if self.extracted is None:
+            self.extracted = self.end
+        self.phases["extraction"] = self.extracted - self.start
+
+        # Whatever is left is the default implementation if no backend served
+        # the call, and argument replacement and ``uarray`` itself otherwise.
+        rest = self.end - self.start - sum(self.phases.values())
+        if self.backend is None and not failed:
+            self.backend = "default"
+            self.phases["default"] = rest
+        else:
+            self.phases["overhead"] = rest
+
+
+def _convert(backend, dispatchables, coerce):
+    convert = getattr(backend, "__ua_convert__", None)
+    if convert is None:
+        return [d.value for d in dispatchables]
+
+    return convert(dispatchables, coerce)
+
+
+class _Proxy:
+    """
+    Stands in for ``backend`` while a call is dispatched again, timing its
+    hooks.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.__ua_domain__ = backend.__ua_domain__
+
+    def __ua_convert__(self, dispatchables, coerce):
+        call = _state.calls[-1] if _state.calls else None
+        if call is None or call.in_default:
+            return _convert(self.backend, dispatchables, coerce)
+
+        start = time.perf_counter_ns()
+        if call.extracted is None:
+            call.extracted = start
+
+        with ua.set_state(call.state):
+            converted = _convert(self.backend, dispatchables, coerce)
+        call.span("convert", self.backend, start, time.perf_counter_ns())
+
+        if converted is not NotImplemented:
+            for d, value in zip(dispatchables, converted):
+                if d.type is ndarray and value is not d.value:
+                    call.coercions += 1
+                    nbytes = _copied_bytes(d.value, value)
+                    if nbytes:
+                        call.copies += 1
+                        call.copied_bytes += nbytes
+
+        return converted
+
+    def __ua_function__(self, method, args, kwargs):
+        call = _state.calls[-1] if _state.calls else None
+        function = self.backend.__ua_function__
+        if call is None or method is not call.method:
+            return function(method, args, kwargs)
+
+        call.in_default = False
+        start = time.perf_counter_ns()
+        try:
+            with ua.set_state(call.state):
+                result = function(method, args, kwargs)
+        finally:
+            call.span("execute", self.backend, start, time.perf_counter_ns())
+
+        if result is NotImplemented:
+            call.in_default = True
+        else:
+            call.backend = _backend_name(self.backend)
+
+        return result
+
+
+class _ProfilingBackend:
+    __ua_domain__ = "numpy"
+
+    @staticmethod
+    def __ua_convert__(dispatchables, coerce):
+        return [d.value for d in dispatchables]
+
+    @staticmethod
+    def __ua_function__(method, args, kwargs):
+        backends = [b for b in active_backends() or () if b[0] is not _backend]
+        call = _Call(method, args, ua.get_state())
+        _state.calls.append(call)
+        failed = True
+        try:
+            with contextlib.ExitStack() as stack:
+                # The same backends, in the same order, each replaced by its
+                # proxy, and nothing else.
+                stack.enter_context(ua.skip_backend(_backend))
+                for i, (backend, coerce) in enumerate(reversed(backends)):
+                    stack.enter_context(ua.skip_backend(backend))
+                    stack.enter_context(
+                        ua.set_backend(_Proxy(backend), coerce=coerce, only=not i)
+                    )
+
+                result = method(*args, **kwargs)
+            failed = False
+            return result
+        finally:
+            _state.calls.pop()
+            call.finish(failed)
+            for p in _state.profiles:
+                p._record(call)
+
+
+_backend = _ProfilingBackend()
+
+
+class Profile:
+    """
+    The multimethod calls recorded while profiling.
+
+    Use it as a context manager, or call :obj:`Profile.start` and
+    :obj:`Profile.stop`. Only calls made in the thread that started it are
+    recorded, and only those dispatched to backends set *outside* the profiled
+    block: a backend set inside it takes precedence and bypasses profiling.
+
+    >>> import uarray as ua
+    >>> import unumpy as np
+    >>> import unumpy.numpy_backend as numpy_backend
+    >>> with ua.set_backend(numpy_backend, coerce=True), np.profile() as p:
+    ...     _ = np.sum([1, 2, 3])
+    >>> stats = p.as_dict()["sum"]
+    >>> stats["calls"], stats["backends"], stats["coercions"]
+    (1, {'unumpy.numpy_backend': 1}, 1)
+    """
+
+    def __init__(self):
+        self._calls = []
+        self._lock = threading.Lock()
+
+    def _record(self, call):
+        with self._lock:
+            self._calls.append(call)
+
+    def start(self) -> "Profile":
+        """
+        Start recording the calls made in the current thread.
+        """
+        if self in _state.profiles:
+            raise RuntimeError("This profile is already recording.")
+
+        _state.profiles.append(self)
+        if _state.context is None:
+            _state.context = ua.set_backend(_backend)
+            _state.context.__enter__()
+
+        return self
+
+    def stop(self) -> "Profile":
+        """
+        Stop recording. Must be called from the thread that started it.
+        """
+        if self not in _state.profiles:
+            raise RuntimeError("This profile is not recording.")
+
+        _state.profiles.remove(self)
+        if not _state.profiles:
+            context, _state.context = _state.context, None
+            context.__exit__(None, None, None)
+
+        return self
+
+    def __enter__(self) -> "Profile":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def clear(self) -> None:
+        """
+        Discard the calls recorded so far.
+        """
+        with self._lock:
+            self._calls.clear()
+
+    def as_dict(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Statistics per multimethod, with :obj:`ufunc` methods named after the
+        ufunc, e.g. ``"add.__call__"``. Times are in seconds.
+
+        Each entry has the number of ``calls``, their total ``time``, that
+        time split by phase in ``phases``, the number of calls served by each
+        backend in ``backends``, with ``"default"`` for the default
+        implementation and ``None`` for calls that raised. ``coercions`` is
+        the number of arrays ``__ua_convert__`` replaced, of which ``copies``
+        were copied into a new NumPy array, of ``copied_bytes`` in total.
+        """
+        with self._lock:
+            calls = list(self._calls)
+
+        stats = {}  # type: Dict[str, Dict[str, Any]]
+        for call in calls:
+            entry = stats.get(call.name)
+            if entry is None:
+                entry = stats[call.name] = {
+                    "calls": 0,
+                    "time": 0.0,
+                    "phases": dict.fromkeys(PHASES, 0.0),
+                    "backends": {},
+                    "coercions": 0,
+                    "copies": 0,
+                    "copied_bytes": 0,
+                }
+
+            entry["calls"] += 1
+            entry["time"] += (call.end - call.start) / 1e9
+            for phase, duration in call.phases.items():
+                entry["phases"][phase] += duration / 1e9
+
+            backends = entry["backends"]
+            backends[call.backend] = backends.get(call.backend, 0) + 1
+            entry["coercions"] += call.coercions
+            entry["copies"] += call.copies
+            entry["copied_bytes"] += call.copied_bytes
+
+        return stats
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        """
+        The recorded calls in the Chrome trace event format, which can be
+        loaded in ``chrome://tracing`` or Perfetto. Each call is an event,
+        with one nested event for each phase of it.
+        """
+        with self._lock:
+            calls = list(self._calls)
+
+        pid = os.getpid()
+        events = []
+
+        def event(call, name, start, end, args=None):
+            e = {
+                "name": name,
+                "cat": "unumpy",
+                "ph": "X",
+                "ts": start / 1e3,
+                "dur": (end - start) / 1e3,
+                "pid": pid,
+                "tid": call.thread,
+            }
+            if args is not None:
+                e["args"] = args
+
+            events.append(e)
+
+        for call in calls:
+            event(
+                call,
+                call.name,
+                call.start,
+                call.end,
+                {
+                    "backend": call.backend,
+                    "coercions": call.coercions,
+                    "copies": call.copies,
+                },
+            )
+            event(call, "extraction", call.start, call.extracted)
+            for phase, backend, start, end in call.spans:
+                event(call, "{} ({})".format(phase, backend), start, end)
+
+        return {"traceEvents": events, "displayTimeUnit": "ns"}
+
+    def save_chrome_trace(self, path: str) -> None:
+        """
+        Write :obj:`Profile.chrome_trace` to ``path`` as JSON.
+        """
+        with open(path, "w") as f:
+            json.dump(self.chrome_trace(), f)
+
+
+def profile() -> Profile:
+    """
+    Return a new :obj:`Profile`, to be used as a context manager.
+    """
+    return Profile()
+
+
+def enable_profiling() -> Profile:
+    """
+    Start recording calls made in the current thread until
+    :obj:`disable_profiling` is called, and return the :obj:`Profile`
+    recording them. Does nothing if profiling is already enabled.
+    """
+    if _state.toggled is None:
+        _state.toggled = Profile().start()
+
+    return _state.toggled
+
+
+def disable_profiling() -> Optional[Profile]:
+    """
+    Stop the recording started by :obj:`enable_profiling` and return its
+    :obj:`Profile`, or ``None`` if profiling wasn't enabled.
+    """
+    p, _state.toggled = _state.toggled, None
+    if p is not None:
+        p.stop()
+
+    return p
@@ -0,0 +1,163 @@
+"""
+Awaitable versions of the :obj:`unumpy` multimethods, for use from
+:obj:`asyncio` code without blocking the event loop.
+
+Each multimethod, and each method of each :obj:`ufunc`, is mirrored by a
+coroutine function of the same name that makes the call in ``executor``, with
+the :obj:`uarray` backends and the context variables of the caller:
+
+>>> import asyncio
+>>> import uarray as ua
+>>> import unumpy.aio as aio
+>>> import unumpy.numpy_backend as numpy_backend
+>>> async def main():
+...     with ua.set_backend(numpy_backend, coerce=True):
+...         return await aio.sum(await aio.multiply([1, 2, 3], 2))
+>>> int(asyncio.run(main()))
+12
+
+:obj:`call` does the same for any function, to make several calls at once.
+
+At most ``max_concurrency`` calls run at a time in each event loop, so that
+they don't oversubscribe the cores, the others wait their turn. Cancelling a
+call that hasn't started yet drops it. Once it has, the chunked computations
+of the threaded, process, lazy and memory-mapped backends stop before their
+next chunk, and the call keeps its turn until then. Other computations run to
+completion, and their result is discarded.
+"""
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+import weakref
+from concurrent.futures import Executor, ThreadPoolExecutor
+
+from uarray import _Function, get_state, set_state
+
+import unumpy
+from unumpy._chunking import cancellable
+
+from typing import Any, Callable, Optional
+
+__all__ = ["call"]
+
+# The most calls to run at a time in each event loop.
+max_concurrency = os.cpu_count() or 1
+# The executor calls run in, which must run them in threads of this process.
+# ``None`` for one of ``max_concurrency`` threads.
+executor = None  # type: Optional[Executor]
+
+_pool = None  # type: Optional[ThreadPoolExecutor]
+_pool_workers = 0
+_lock = threading.Lock()
+
+# The semaphore bounding the calls in each event loop, and its bound.
+_semaphores = weakref.WeakKeyDictionary()  # type: weakref.WeakKeyDictionary
+
+
+def _executor():
+    global _pool, _pool_workers
+
+    if executor is not None:
+        return executor
+
+    with _lock:
+        if _pool is None or _pool_workers != max_concurrency:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+
+            _pool = ThreadPoolExecutor(max_concurrency, thread_name_prefix="unumpy-aio")
+            _pool_workers = max_concurrency
+
+        return _pool
+
+
+def _semaphore(loop):
+    entry = _semaphores.get(loop)
+    if entry is None or entry[1] != max_concurrency:
+        entry = (asyncio.Semaphore(max_concurrency), max_concurrency)
+        _semaphores[loop] = entry
+
+    return entry[0]
+
+
+async def call(func: Callable, *args, **kwargs) -> Any:
+    """
+    Call ``func(*args, **kwargs)`` in ``executor``, with the :obj:`uarray`
+    backends and the context variables of the caller.
+    """
+    state = get_state()
+    context = contextvars.copy_context()
+    cancelled = threading.Event()
+
+    def run():
+        with set_state(state), cancellable(cancelled):
+            return func(*args, **kwargs)
+
+    async with _semaphore(asyncio.get_running_loop()):
+        future = _executor().submit(context.run, run)
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            cancelled.set()
+            if not future.cancel():
+                # Keep the turn until the computation stops.
+                stopped = asyncio.wrap_future(future)
+                await asyncio.gather(stopped, return_exceptions=True)
+            raise
+
+
+def _mirror(func):
+    @functools.wraps(func)
+    async def mirrored(*args, **kwargs):
+        return await call(func, *args, **kwargs)
+
+    return mirrored
+
+
+class _Ufunc:
+    """
+    A :obj:`ufunc` whose methods are coroutine functions.
+    """
+
+    def __init__(self, ufunc):
+        self._ufunc = ufunc
+
+    def __repr__(self):
+        return "<aio ufunc '{}'>".format(self._ufunc.name)
+
+    async def __call__(self, *args, **kwargs):
+        return await call(self._ufunc, *args, **kwargs)
+
+    def __getattr__(self, name):
+        value = getattr(self._ufunc, name)
+        if not callable(value):
+            # E.g. ``types``, which depends on the backend.
+            return value
+
+        mirrored = _mirror(value)
+        setattr(self, name, mirrored)
+        return mirrored
+
+
+def __getattr__(name):
+    value = getattr(unumpy, name, None)
+    if isinstance(value, unumpy.ufunc):
+        mirrored = _Ufunc(value)  # type: Any
+    elif isinstance(value, _Function):
+        mirrored = _mirror(value)
+    else:
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+    globals()[name] = mirrored
+    return mirrored
+
+
+def __dir__():
+    names = (
+        k
+        for k in dir(unumpy)
+        if isinstance(getattr(unumpy, k, None), (unumpy.ufunc, _Function))
+    )
+    return sorted({"call", "executor", "max_concurrency"} | set(names))
@@ -0,0 +1,192 @@
+"""
+Backends that are only imported when first used.
+
+Importing a backend module such as :obj:`unumpy.torch_backend` imports the
+library it wraps. The backends here stand in for them, and import them the
+first time :obj:`uarray` calls their ``__ua_function__`` or ``__ua_convert__``,
+so they can be set up front without paying for libraries that end up unused.
+
+>>> import uarray as ua
+>>> import unumpy as np
+>>> from unumpy import backends
+>>> backends.dask
+<unumpy backend 'dask' (not loaded)>
+>>> with ua.set_backend(backends.dask):
+...     x = np.arange(5)
+>>> backends.dask
+<unumpy backend 'dask' (loaded)>
+
+Besides the backends shipped with :obj:`unumpy`, other packages can provide
+backends through the ``unumpy.backends`` entry point group, where each entry
+point names a backend module or object, e.g. in ``setup.py``:
+
+.. code:: python
+
+    entry_points={"unumpy.backends": ["mylib = mylib.unumpy_backend"]}
+"""
+import importlib
+import threading
+from typing import Any, Callable, Dict, List
+
+__all__ = ["LazyBackend", "get", "register", "available"]
+
+ENTRY_POINT_GROUP = "unumpy.backends"
+
+_HOOKS = ("__ua_function__", "__ua_convert__", "__unumpy_fast_ufunc__")
+
+
+class LazyBackend:
+    """
+    A backend that calls ``load`` to get the actual backend the first time
+    it is used, and delegates to it from then on.
+
+    Once loaded, it compares equal to the actual backend, so that the actual
+    backend skipping itself with :obj:`uarray.skip_backend` also skips this.
+    """
+
+    __ua_domain__ = "numpy"
+
+    def __init__(self, name: str, load: Callable[[], Any]):
+        self.name = name
+        self.__name__ = "unumpy.backends." + name
+        self._load = load
+        self._backend = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._backend is not None
+
+    def load(self) -> Any:
+        """
+        Import the actual backend, if it hasn't been already, and return it.
+        """
+        if self._backend is None:
+            with self._lock:
+                if self._backend is None:
+                    backend = self._load()
+                    if not hasattr(backend, "__ua_function__"):
+                        # E.g. ``cupy_backend`` when CuPy is not installed.
+                        raise ImportError(
+                            "The {!r} backend could not be loaded, are its "
+                            "requirements installed?".format(self.name)
+                        )
+
+                    # Delegate through instance attributes, which take
+                    # precedence over the methods below, unless something
+                    # else, such as profiling, has already replaced them.
+                    for hook in _HOOKS:
+                        if hook not in vars(self) and hasattr(backend, hook):
+                            setattr(self, hook, getattr(backend, hook))
+
+                    self._backend = backend
+
+        return self._backend
+
+    def __ua_function__(self, method, args, kwargs):
+        return self.load().__ua_function__(method, args, kwargs)
+
+    def __ua_convert__(self, dispatchables, coerce):
+        return self.load().__ua_convert__(dispatchables, coerce)
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        return getattr(self.load(), name)
+
+    def __eq__(self, other):
+        return other is self or (self._backend is not None and other is self._backend)
+
+    __hash__ = object.__hash__
+
+    def __repr__(self):
+        return "<unumpy backend {!r} ({})>".format(
+            self.name, "loaded" if self.loaded else "not loaded"
+        )
+
+
+def _import(module_name):
+    return lambda: importlib.import_module(module_name)
+
+
+_registry = {}  # type: Dict[str, LazyBackend]
+_entry_points_loaded = False
+_registry_lock = threading.Lock()
+
+
+def register(name: str, target: Any) -> LazyBackend:
+    """
+    Register a backend under ``name``, replacing any other. ``target`` is the
+    name of the backend module, or a callable returning the backend.
+    """
+    load = _import(target) if isinstance(target, str) else target
+    backend = _registry[name] = LazyBackend(name, load)
+    return backend
+
+
+def _load_entry_points():
+    global _entry_points_loaded
+
+    with _registry_lock:
+        if _entry_points_loaded:
+            return
+
+        _entry_points_loaded = True
+        try:
+            from importlib.metadata import entry_points
+        except ImportError:
+            return
+
+        eps = entry_points()
+        if hasattr(eps, "select"):
+            eps = eps.select(group=ENTRY_POINT_GROUP)
+        else:
+            eps = eps.get(ENTRY_POINT_GROUP, ())
+
+        for ep in eps:
+            # Backends shipped with ``unumpy`` can't be overridden this way.
+            if ep.name not in _registry:
+                register(ep.name, ep.load)
+
+
+def get(name: str) -> LazyBackend:
+    """
+    Return the backend called ``name``, looking through the entry points if
+    it isn't a backend shipped with :obj:`unumpy`.
+
+    Raises :obj:`KeyError` if there is no such backend.
+    """
+    try:
+        return _registry[name]
+    except KeyError:
+        pass
+
+    _load_entry_points()
+    try:
+        return _registry[name]
+    except KeyError:
+        raise KeyError("No unumpy backend named {!r}.".format(name)) from None
+
+
+def available() -> List[str]:
+    """
+    The names of all backends, including those provided via entry points,
+    whether or not the libraries they need are installed.
+    """
+    _load_entry_points()
+    return sorted(_registry)
+
+
+numpy = register("numpy", "unumpy.numpy_backend")
+dask = register("dask", "unumpy.dask_backend")
+sparse = register("sparse", "unumpy.sparse_backend")
+torch = register("torch", "unumpy.torch_backend")
+cupy = register("cupy", "unumpy.cupy_backend")
+xnd = register("xnd", "unumpy.xnd_backend")
+lazy = register("lazy", "unumpy.lazy_backend")
+threaded = register("threaded", "unumpy.threaded_backend")
+numba = register("numba", "unumpy.numba_backend")
+process = register("process", "unumpy.process_backend")
+memmap = register("memmap", "unumpy.memmap_backend")
+router = register("router", "unumpy.router_backend")
@@ -4,6 +4,7 @@ try:
     from uarray import Dispatchable, wrap_single_convertor
     from unumpy import ufunc, ufunc_list, ndarray
     import unumpy
+    from unumpy._dispatch import build_dispatch_table
     import functools
 
     from typing import Dict
@@ -14,14 +15,14 @@ try:
 
     _implementations: Dict = {unumpy.ufunc.__call__: cp.ufunc.__call__}
 
-    def __ua_function__(method, args, kwargs):
-        if method in _implementations:
-            return _implementations[method](*args, **kwargs)
+    _dispatch_table = build_dispatch_table(cp, _implementations)
 
-        if not hasattr(cp, method.__name__):
+    def __ua_function__(method, args, kwargs):
+        impl = _dispatch_table[method]
+        if impl is NotImplemented:
             return NotImplemented
 
-        return getattr(cp, method.__name__)(*args, **kwargs)
+        return impl(*args, **kwargs)
 
     @wrap_single_convertor
     def __ua_convert__(value, dispatch_type, coerce):
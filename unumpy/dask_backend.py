@@ -1,19 +1,28 @@
 import numpy as np
+import dask
 import dask.array as da
+from dask.array.core import blockwise, handle_out, normalize_chunks
+from dask.array.utils import meta_from_array, validate_axis
+from dask.base import tokenize
+from dask.utils import parse_bytes
 from uarray import (
     Dispatchable,
     wrap_single_convertor,
     skip_backend,
     get_state,
     set_state,
+    BackendNotImplementedError,
 )
 from unumpy import ufunc, ufunc_list, ndarray
 import unumpy
+from unumpy._chunking import ASSOCIATIVE_UFUNCS
+from unumpy._dispatch import active_backends, build_dispatch_table
+from unumpy._conversion_cache import get_conversion_cache
 import functools
+import operator
 import sys
 import collections
 import itertools
-import random
 
 from typing import Dict
 
@@ -32,65 +41,432 @@ def wrap_current_state(func):
     return wrapped
 
 
-def wrap_map_blocks(func):
+def _normalize_shape(shape):
+    if isinstance(shape, collections.abc.Iterable):
+        return tuple(int(s) for s in shape)
+
+    return (int(shape),)
+
+
+def _split(length, block):
+    # ``length`` in chunks of at most ``block``, whose sizes differ by at most
+    # one, so there are few shapes of blocks.
+    if not length:
+        return (0,)
+
+    count = -(-length // block)
+    size, extra = divmod(length, count)
+    return (size + 1,) * extra + (size,) * (count - extra)
+
+
+def _chunks(shape, dtype, chunks=None):
+    """
+    The chunks of an array of ``shape`` and ``dtype``: ``chunks`` as
+    :obj:`dask.array.Array` takes them, if given, otherwise blocks of at most
+    Dask's ``array.chunk-size``, splitting the largest axes first.
+    """
+    dtype = np.dtype(dtype)
+    if chunks is not None:
+        return normalize_chunks(chunks, shape, dtype=dtype)
+
+    limit = parse_bytes(dask.config.get("array.chunk-size"))
+    limit = max(limit // max(dtype.itemsize, 1), 1)
+    block = list(shape)
+    size = functools.reduce(operator.mul, block, 1)
+    while size > limit:
+        axis = block.index(max(block))
+        rest = size // block[axis]
+        half = -(-block[axis] // 2)
+        if rest * half <= limit:
+            block[axis] = limit // rest
+            break
+
+        block[axis] = half
+        size = rest * half
+
+    return tuple(_split(n, b) for n, b in zip(shape, block))
+
+
+def _lazy_blocks(name, create, chunks, block_args, meta):
+    """
+    An array whose blocks are created by ``create(*block_args(shape, start))``
+    with the backends set now, when they are computed. Blocks with the same
+    arguments are the same task, which the key of each block aliases.
+    """
+    with skip_backend(sys.modules[__name__]):
+        create = wrap_current_state(create)
+
+    starts = [tuple(itertools.accumulate((0,) + c[:-1])) for c in chunks]
+
+    dsk = {}
+    tasks = {}
+    for chunk_id in itertools.product(*(range(len(c)) for c in chunks)):
+        shape = tuple(chunks[i][j] for i, j in enumerate(chunk_id))
+        start = tuple(starts[i][j] for i, j in enumerate(chunk_id))
+        args = block_args(shape, start)
+        key = tasks.get(args)
+        if key is None:
+            key = tasks[args] = (name + "-block", len(tasks))
+            dsk[key] = (create,) + args
+
+        dsk[(name,) + chunk_id] = key
+
+    return da.Array(dsk, name, chunks, dtype=meta.dtype, meta=meta)
+
+
+def _token(*args):
+    # Blocks also depend on the backends that compute them, the ones set now.
+    with skip_backend(sys.modules[__name__]):
+        backends = active_backends()
+
+    if backends is not None:
+        backends = tuple((id(backend), coerce) for backend, coerce in backends)
+
+    return tokenize(backends, *args)
+
+
+def _name(func, meta, chunks, *args):
+    """
+    The name of an array created by ``func(*args)`` with ``chunks``, the same
+    for equal calls, so that they merge in graphs and Dask's caches.
+    """
+    token = _token(func.__name__, type(meta), meta.dtype, chunks, *args)
+    return func.__name__ + "-" + token
+
+
+def wrap_uniform_create(func):
     @functools.wraps(func)
-    def wrapped(*args, **kwargs):
+    def wrapped(shape, *args, chunks=None, **kwargs):
+        shape = _normalize_shape(shape)
+
+        def create(block_shape):
+            return func(block_shape, *args, **kwargs)
+
         with skip_backend(sys.modules[__name__]):
-            return da.map_blocks(wrap_current_state(func), *args, **kwargs)
+            meta = create(tuple(0 for _ in shape))
+
+        chunks = _chunks(shape, meta.dtype, chunks)
+        name = _name(func, meta, chunks, args, kwargs)
+        return _lazy_blocks(name, create, chunks, lambda s, _: (s,), meta)
 
     return wrapped
 
 
-def wrap_uniform_create(func):
-    @functools.wraps(func)
-    def wrapped(shape, *args, **kwargs):
-        if isinstance(shape, collections.abc.Iterable):
-            shape = tuple(int(s) for s in shape)
+def _eye(N, M=None, k=0, dtype=float, order="C", chunks=None):
+    shape = _normalize_shape((N, N if M is None else M))
+
+    def create(rows, cols, diagonal):
+        return unumpy.eye(rows, cols, diagonal, dtype=dtype, order=order)
+
+    def block_args(block_shape, start):
+        rows, cols = block_shape
+        diagonal = k + start[0] - start[1]
+        if not -rows < diagonal < cols:
+            # No ones, the same zeros as every other block of this shape.
+            diagonal = cols
+
+        return rows, cols, diagonal
+
+    with skip_backend(sys.modules[__name__]):
+        meta = create(0, 0, 0)
+
+    chunks = _chunks(shape, meta.dtype, chunks)
+    name = _name(unumpy.eye, meta, chunks, k, order)
+    return _lazy_blocks(name, create, chunks, block_args, meta)
+
+
+def _scalar(value):
+    if isinstance(value, da.Array) and value.ndim == 0:
+        # Coerced by ``__ua_convert__``.
+        value = value.compute()
+
+    return value[()] if isinstance(value, np.ndarray) and not value.ndim else value
+
+
+def _arange(start, stop=None, step=None, dtype=None, chunks=None):
+    start, stop, step = (_scalar(v) for v in (start, stop, step))
+    if stop is None:
+        start, stop = 0, start
+
+    if step is None:
+        step = 1
+
+    if dtype is None:
+        dtype = np.result_type(*(np.asarray(v) for v in (start, stop, step)))
+
+    length = max(int(np.ceil((stop - start) / step)), 0)
+
+    def create(lo, hi, size):
+        # ``hi`` may round up to one element too many.
+        return unumpy.arange(lo, hi, step, dtype=dtype)[:size]
+
+    def block_args(block_shape, offset):
+        (size,), (first,) = block_shape, offset
+        return start + first * step, start + (first + size) * step, size
+
+    with skip_backend(sys.modules[__name__]):
+        meta = unumpy.arange(0, dtype=dtype)
+
+    chunks = _chunks((length,), meta.dtype, chunks)
+    name = _name(unumpy.arange, meta, chunks, start, step)
+    return _lazy_blocks(name, create, chunks, block_args, meta)
+
+
+def _linspace(
+    start,
+    stop,
+    num=50,
+    endpoint=True,
+    retstep=False,
+    dtype=None,
+    axis=0,
+    chunks=None,
+):
+    start, stop = _scalar(start), _scalar(stop)
+    div = num - 1 if endpoint else num
+    meta = None
+    if not (retstep or axis != 0 or np.ndim(start) or np.ndim(stop) or div < 1):
+        try:
+            with skip_backend(sys.modules[__name__]):
+                meta = unumpy.linspace(start, stop, 0, dtype=dtype)
+        except BackendNotImplementedError:
+            # No other backend takes scalars.
+            pass
+
+    if meta is None:
+        return da.linspace(
+            start,
+            stop,
+            num,
+            endpoint=endpoint,
+            retstep=retstep,
+            dtype=dtype,
+            chunks="auto" if chunks is None else chunks,
+        )
+
+    step = (stop - start) / div
+
+    def create(lo, hi, size, last):
+        return unumpy.linspace(lo, hi, size, endpoint=last, dtype=dtype)
+
+    def block_args(block_shape, offset):
+        (size,), (first,) = block_shape, offset
+        if endpoint and first + size == num:
+            # The last element is exactly ``stop``.
+            return start + first * step, stop, size, True
+
+        return start + first * step, start + (first + size) * step, size, False
+
+    chunks = _chunks((int(num),), meta.dtype, chunks)
+    name = _name(unumpy.linspace, meta, chunks, start, stop, endpoint)
+    return _lazy_blocks(name, create, chunks, block_args, meta)
+
+
+def _as_operand(value):
+    if isinstance(value, da.Array) or not getattr(value, "ndim", 0):
+        return value
+
+    return da.asarray(value)
+
+
+def _ufunc_call(self, *inputs, out=None, dtype=None, **kwargs):
+    """
+    ``ufunc.__call__`` as a ``blockwise`` layer per output, broadcasting the
+    inputs, with the dtypes NumPy's type resolution gives, so that Dask
+    fuses chains of ufuncs without computing anything to infer them.
+    """
+    np_ufunc = getattr(np, self.name, None)
+    inputs = tuple(_as_operand(x) for x in inputs)
+    arrays = [x for x in inputs if isinstance(x, da.Array)]
+    outs = out if isinstance(out, tuple) else (out,) + (None,) * (self.nout - 1)
+    if not isinstance(np_ufunc, np.ufunc) or not arrays:
+        return NotImplemented
+
+    if any(o is not None and not isinstance(o, da.Array) for o in outs):
+        return NotImplemented
+
+    if dtype is not None:
+        kwargs["dtype"] = dtype
+
+    # Empty arrays, so that only the scalars' values take part, as in NumPy.
+    empty = tuple(
+        np.empty((0,) * max(x.ndim, 1), x.dtype) if isinstance(x, da.Array) else x
+        for x in inputs
+    )
+    results = np_ufunc(*empty, dtype=dtype)
+    dtypes = [r.dtype for r in results] if self.nout > 1 else [results.dtype]
+
+    ndim = max(x.ndim for x in arrays)
+    index = tuple(range(ndim))[::-1]
+    operands = []
+    for x in inputs:
+        if isinstance(x, da.Array):
+            operands += [x, tuple(range(x.ndim))[::-1]]
         else:
-            shape = (int(shape),)
+            operands += [x, None]
 
-        # Estimate 100 Mi elements per block
-        blocksize = int((100 * (2 ** 20)) ** (1 / len(shape)))
+    with skip_backend(sys.modules[__name__]):
+        func = wrap_current_state(functools.partial(self, **kwargs))
 
-        chunks = []
-        for l in shape:
-            chunks.append([])
-            while l > 0:
-                s = max(min(blocksize, l), 0)
-                chunks[-1].append(s)
-                l -= s
+    metas = [meta_from_array(arrays[0]._meta, ndim, dtype=dt) for dt in dtypes]
+    name = self.name + "-" + _token(self.name, type(metas[0]), dtypes, kwargs, *inputs)
+    if self.nout == 1:
+        results = [blockwise(func, index, *operands, name=name, meta=metas[0])]
+    else:
+        tuples = blockwise(
+            func, index, *operands, name=name, meta=np.empty((0,) * ndim, object)
+        )
+        results = [
+            blockwise(
+                operator.getitem,
+                index,
+                tuples,
+                index,
+                i,
+                None,
+                name="{}-{}".format(name, i),
+                meta=meta,
+            )
+            for i, meta in enumerate(metas)
+        ]
 
-        name = func.__name__ + "-" + hex(random.randrange(2 ** 64))
-        dsk = {}
-        with skip_backend(sys.modules[__name__]):
-            for chunk_id in itertools.product(*map(lambda x: range(len(x)), chunks)):
-                shape = tuple(chunks[i][j] for i, j in enumerate(chunk_id))
-                dsk[(name,) + chunk_id] = func(shape, *args, **kwargs)
+    for i, (o, result) in enumerate(zip(outs, results)):
+        if o is not None:
+            # Cast to ``out`` as NumPy would, then take its place.
+            result = result.astype(o.dtype, casting="same_kind")
+            results[i] = handle_out(o, result)
 
-            meta = func(tuple(0 for _ in shape), *args, **kwargs)
-            dtype = str(meta.dtype)
+    return tuple(results) if self.nout > 1 else results[0]
 
-        return da.Array(dsk, name, chunks, dtype=dtype, meta=meta)
 
-    return wrapped
+def _binary_ufunc(self, a, out):
+    # The NumPy ufunc whose reductions ``self`` can compute on ``a``, if any.
+    np_ufunc = getattr(np, self.name, None)
+    if not isinstance(np_ufunc, np.ufunc) or (self.nin, self.nout) != (2, 1):
+        return None
+
+    if not isinstance(a, da.Array) or not a.ndim:
+        return None
+
+    if out is not None and not isinstance(out, da.Array):
+        return None
+
+    return np_ufunc
+
+
+def _ufunc_reduce(self, a, axis=0, dtype=None, out=None, keepdims=False):
+    """
+    ``ufunc.reduce`` as a tree reduction: each block is reduced, then groups
+    of as many results as Dask's ``split_every`` setting, until one is left.
+    Ufuncs that aren't associative reduce the whole axis in one block.
+    """
+    a = _as_operand(a)
+    np_ufunc = _binary_ufunc(self, a, out)
+    if np_ufunc is None:
+        return NotImplemented
+
+    # Also raises any error for a bad ``axis`` or ``dtype`` right away.
+    result_dtype = np_ufunc.reduce(
+        np.zeros((1,) * a.ndim, a.dtype), axis=axis, dtype=dtype
+    ).dtype
+    axis = tuple(range(a.ndim)) if axis is None else axis
+    axis = validate_axis(axis if isinstance(axis, tuple) else (axis,), a.ndim)
+    if self.name not in ASSOCIATIVE_UFUNCS:
+        a = a.rechunk({ax: -1 for ax in axis})
+
+    def reduce(block, axis, keepdims, dtype=dtype):
+        return self.reduce(block, axis=axis, dtype=dtype, keepdims=keepdims)
+
+    with skip_backend(sys.modules[__name__]):
+        chunk = wrap_current_state(reduce)
+        combine = wrap_current_state(functools.partial(reduce, dtype=result_dtype))
+
+    ndim = a.ndim if keepdims else a.ndim - len(axis)
+    return da.reduction(
+        a,
+        chunk,
+        combine,
+        axis=axis,
+        keepdims=keepdims,
+        dtype=result_dtype,
+        combine=combine,
+        name=self.name + "-reduce",
+        out=out,
+        meta=meta_from_array(a._meta, ndim, dtype=result_dtype),
+    )
+
+
+def _ufunc_accumulate(self, a, axis=0, dtype=None, out=None):
+    """
+    ``ufunc.accumulate`` as a prefix scan: each block is accumulated, then
+    combined with the last element of the result before it. Ufuncs that
+    aren't associative accumulate the whole axis in one block.
+    """
+    a = _as_operand(a)
+    np_ufunc = _binary_ufunc(self, a, out)
+    if np_ufunc is None:
+        return NotImplemented
+
+    axis = validate_axis(axis, a.ndim)
+    if self.name not in ASSOCIATIVE_UFUNCS:
+        a = a.rechunk({axis: -1})
+
+    result_dtype = np_ufunc.accumulate(np.zeros(1, a.dtype), dtype=dtype).dtype
+
+    def accumulate(block):
+        return self.accumulate(block, axis=axis, dtype=dtype)
+
+    with skip_backend(sys.modules[__name__]):
+        accumulate = wrap_current_state(accumulate)
+
+    blocks = a.map_blocks(
+        accumulate,
+        dtype=result_dtype,
+        meta=meta_from_array(a._meta, a.ndim, dtype=result_dtype),
+        name=self.name + "-accumulate-" + _token(self.name, axis, dtype, a),
+    )
+
+    index = [slice(None)] * a.ndim
+    last = [slice(None)] * a.ndim
+    last[axis] = slice(-1, None)
+    scanned = []
+    for i in range(blocks.numblocks[axis]):
+        index[axis] = slice(i, i + 1)
+        block = blocks.blocks[tuple(index)]
+        if scanned:
+            # Broadcast along ``axis``, through the Dask implementation even
+            # if other backends are set.
+            carry = scanned[-1][tuple(last)]
+            block = _ufunc_call(self, carry, block, dtype=result_dtype)
+
+        scanned.append(block)
+
+    return handle_out(out, da.concatenate(scanned, axis=axis))
 
 
 _implementations: Dict = {
-    unumpy.ufunc.__call__: wrap_map_blocks(unumpy.ufunc.__call__),
+    unumpy.ufunc.__call__: _ufunc_call,
+    unumpy.ufunc.reduce: _ufunc_reduce,
+    unumpy.ufunc.accumulate: _ufunc_accumulate,
     unumpy.ones: wrap_uniform_create(unumpy.ones),
     unumpy.zeros: wrap_uniform_create(unumpy.zeros),
     unumpy.full: wrap_uniform_create(unumpy.full),
+    unumpy.empty: wrap_uniform_create(unumpy.empty),
+    unumpy.eye: _eye,
+    unumpy.arange: _arange,
+    unumpy.linspace: _linspace,
 }
 
 
-def __ua_function__(method, args, kwargs):
-    if method in _implementations:
-        return _implementations[method](*args, **kwargs)
+_dispatch_table = build_dispatch_table(da, _implementations)
+
 
-    if not hasattr(da, method.__name__):
+def __ua_function__(method, args, kwargs):
+    impl = _dispatch_table[method]
+    if impl is NotImplemented:
         return NotImplemented
 
-    return getattr(da, method.__name__)(*args, **kwargs)
+    return impl(*args, **kwargs)
 
 
 @wrap_single_convertor
@@ -98,7 +474,15 @@ def __ua_convert__(value, dispatch_type, coerce):
     if dispatch_type is ndarray:
         if not coerce:
             return value
-        return da.asarray(value) if value is not None else None
+
+        if value is None or isinstance(value, da.Array):
+            return value
+
+        cache = get_conversion_cache()
+        if cache is not None:
+            return cache.convert(value, __name__, da.asarray)
+
+        return da.asarray(value)
 
     return value
 
@@ -0,0 +1,461 @@
+"""
+A backend that records :obj:`ufunc` calls and reductions into an expression
+graph instead of running them, and evaluates the graph on demand.
+
+Chains of elementwise ufuncs are fused: the graph is evaluated a block at a
+time, sized so that the intermediates of a block fit in the L2 cache, and a
+reduction of such a chain is reduced block by block, so no full-size
+intermediate is ever allocated.
+
+>>> import numpy
+>>> import uarray as ua
+>>> import unumpy as np
+>>> import unumpy.lazy_backend as lazy_backend
+>>> x = numpy.linspace(0, 1, 5)
+>>> with ua.set_backend(lazy_backend):
+...     y = np.exp(np.sin(x) * x + 1)
+...     total = np.sum(y)
+>>> y
+<LazyArray exp, shape=(5,), dtype=float64>
+>>> numpy.allclose(total.compute(), numpy.exp(numpy.sin(x) * x + 1).sum())
+True
+
+Everything else, including ufunc calls with ``out=``, is run eagerly by the
+NumPy backend, after evaluating the arguments.
+"""
+import glob
+
+import numpy as np
+from uarray import wrap_single_convertor
+import unumpy
+from unumpy import ufunc, ndarray, dtype
+import unumpy.numpy_backend as numpy_backend
+from unumpy._chunking import ASSOCIATIVE_UFUNCS, cancellation_check, reduction
+
+from typing import Dict
+
+__ua_domain__ = "numpy"
+
+
+def _l2_cache_size(default=2 ** 18):
+    # Only known on Linux, elsewhere assume a small L2.
+    for index in glob.glob("/sys/devices/system/cpu/cpu0/cache/index*"):
+        try:
+            with open(index + "/level") as f:
+                level = f.read().strip()
+            with open(index + "/type") as f:
+                kind = f.read().strip()
+            with open(index + "/size") as f:
+                size = f.read().strip()
+        except OSError:
+            continue
+
+        if level == "2" and kind != "Instruction":
+            units = {"K": 2 ** 10, "M": 2 ** 20}
+            try:
+                return int(size.rstrip("KM")) * units.get(size[-1], 1)
+            except ValueError:
+                break
+
+    return default
+
+
+# The total size in bytes of the intermediates of one block. Defaults to half
+# the L2 cache, leaving room for the inputs and the output.
+block_bytes = _l2_cache_size() // 2
+
+
+class LazyArray(ndarray):
+    """
+    An array that is computed the first time its value is needed, by
+    :obj:`LazyArray.compute` or :obj:`numpy.asarray`.
+    """
+
+    def __init__(self, shape, dtype, op=None, inputs=(), kwargs=None):
+        self.shape = shape
+        self.dtype = dtype
+        # A NumPy ufunc, or a ``_Reduction``. ``None`` once computed.
+        self.op = op
+        self.inputs = inputs
+        self.kwargs = kwargs or {}
+        self._value = None
+
+    @property
+    def ndim(self):
+        return len(self.shape)
+
+    @property
+    def size(self):
+        return int(np.prod(self.shape))
+
+    def compute(self):
+        """
+        Evaluate the expression and return the resulting NumPy array.
+        """
+        if self.op is not None:
+            self._value = _evaluate(self)
+            # Let go of the graph, it is no longer needed.
+            self.op, self.inputs, self.kwargs = None, (), {}
+
+        return self._value
+
+    def __array__(self, dtype=None):
+        return np.asarray(self.compute(), dtype=dtype)
+
+    def __repr__(self):
+        op = self.op
+        name = "computed" if op is None else getattr(op, "__name__", None)
+        return "<LazyArray {}, shape={}, dtype={}>".format(name, self.shape, self.dtype)
+
+
+def compute(*arrays):
+    """
+    Evaluate each :obj:`LazyArray` in ``arrays``, passing anything else
+    through unchanged.
+    """
+    results = tuple(a.compute() if isinstance(a, LazyArray) else a for a in arrays)
+    return results[0] if len(results) == 1 else results
+
+
+def _materialize(value):
+    if isinstance(value, LazyArray):
+        return value.compute()
+
+    if type(value) in (list, tuple):
+        return type(value)(_materialize(v) for v in value)
+
+    if type(value) is dict:
+        return {k: _materialize(v) for k, v in value.items()}
+
+    return value
+
+
+def _eager(method, args, kwargs):
+    return numpy_backend.__ua_function__(
+        method, _materialize(args), _materialize(kwargs)
+    )
+
+
+def _example(value):
+    # Something with the dtype of ``value`` to find result dtypes with. 0-d
+    # arrays and scalars are kept, NumPy's result type may depend on them.
+    if isinstance(value, (LazyArray, np.ndarray)) and value.ndim:
+        return np.zeros(1, dtype=value.dtype)
+
+    return value
+
+
+def _ufunc_call(np_ufunc, *args, out=None, **kwargs):
+    if (
+        out is not None
+        or np_ufunc.nout != 1
+        or len(args) != np_ufunc.nin
+        or not set(kwargs) <= {"dtype"}
+    ):
+        if out is not None:
+            kwargs["out"] = out
+
+        return _eager(unumpy.ufunc.__call__, (np_ufunc,) + args, kwargs)
+
+    # Results of reductions are small, and NumPy needs the value of 0-d
+    # arrays to determine result types.
+    args = tuple(
+        a.compute() if isinstance(a, LazyArray) and not a.ndim else a for a in args
+    )
+    if not any(isinstance(a, LazyArray) for a in args) and all(
+        np.ndim(a) == 0 for a in args
+    ):
+        return np_ufunc(*args, **kwargs)
+
+    shape = np.broadcast_shapes(*(np.shape(a) for a in args))
+    result_dtype = np_ufunc(*(_example(a) for a in args), **kwargs).dtype
+    return LazyArray(shape, result_dtype, np_ufunc, args, kwargs)
+
+
+class _Reduction:
+    __slots__ = ("func", "axis", "blockwise", "__name__")
+
+    def __init__(self, func, axis, blockwise, name):
+        self.func = func
+        self.axis = axis
+        # Whether ``func`` of the results for each block is the result.
+        self.blockwise = blockwise
+        self.__name__ = name
+
+
+def _reduced_shape(shape, axis, keepdims):
+    if axis is None:
+        axes = set(range(len(shape)))
+    else:
+        axes = {a % len(shape) for a in (axis if isinstance(axis, tuple) else (axis,))}
+
+    if keepdims:
+        return tuple(1 if i in axes else s for i, s in enumerate(shape))
+
+    return tuple(s for i, s in enumerate(shape) if i not in axes)
+
+
+def _reduce(method, args, func, blockwise, name, a, axis, out, kwargs):
+    # ``args`` are the arguments of ``method`` before ``a``.
+    if (
+        not isinstance(a, LazyArray)
+        or out is not None
+        or not set(kwargs) <= {"dtype", "keepdims"}
+    ):
+        return _eager(method, args + (a,), dict(kwargs, axis=axis, out=out))
+
+    # Also raises any error for a bad ``axis`` or ``dtype`` right away.
+    result_dtype = np.asarray(
+        func(np.zeros((1,) * a.ndim, dtype=a.dtype), axis=axis, **kwargs)
+    ).dtype
+    shape = _reduced_shape(a.shape, axis, kwargs.get("keepdims", False))
+    reduction = _Reduction(func, axis, blockwise, name)
+    return LazyArray(shape, result_dtype, reduction, (a,), kwargs)
+
+
+def _reduction(method, func):
+    def reduce(a, axis, out, keepdims, **kwargs):
+        if keepdims:
+            kwargs["keepdims"] = keepdims
+
+        return _reduce(method, (), func, True, method.__name__, a, axis, out, kwargs)
+
+    return reduction(func, reduce)
+
+
+def _ufunc_reduce(np_ufunc, a, axis=0, dtype=None, out=None, keepdims=False):
+    kwargs = {}
+    if dtype is not None:
+        kwargs["dtype"] = dtype
+
+    if keepdims:
+        kwargs["keepdims"] = keepdims
+
+    return _reduce(
+        unumpy.ufunc.reduce,
+        (np_ufunc,),
+        np_ufunc.reduce,
+        np_ufunc.__name__ in ASSOCIATIVE_UFUNCS,
+        np_ufunc.__name__ + ".reduce",
+        a,
+        axis,
+        out,
+        kwargs,
+    )
+
+
+def _evaluate(node):
+    if isinstance(node.op, _Reduction):
+        return _evaluate_reduction(node)
+
+    return _evaluate_elementwise(node)
+
+
+def _evaluate_reduction(node):
+    reduction, (a,) = node.op, node.inputs
+    kwargs = dict(node.kwargs, axis=None)
+    keepdims = kwargs.pop("keepdims", False)
+
+    if (
+        reduction.axis is not None
+        or not reduction.blockwise
+        or a.op is None
+        or isinstance(a.op, _Reduction)
+        or not a.size
+    ):
+        return reduction.func(a.compute(), axis=reduction.axis, **node.kwargs)
+
+    # Reduce each block of the input as it is computed, then the results.
+    partials = []
+    _evaluate_elementwise(
+        a, consume=lambda block: partials.append(reduction.func(block, **kwargs))
+    )
+    result = reduction.func(np.asarray(partials), **kwargs)
+    if keepdims:
+        result = np.asarray(result).reshape(node.shape)
+
+    return result
+
+
+def _fused(root):
+    """
+    The nodes of the graph of ``root`` that can be computed a block at a
+    time along with it, in the order they need to be computed in.
+    """
+    order = []
+    seen = set()
+
+    def visit(node):
+        seen.add(id(node))
+        for i in node.inputs:
+            if id(i) not in seen and _fusable(i, root):
+                visit(i)
+        order.append(node)
+
+    visit(root)
+    return order
+
+
+def _fusable(node, root):
+    # Nodes are computed in blocks along their first axis, so they must
+    # agree with the root on it.
+    return (
+        isinstance(node, LazyArray)
+        and node.op is not None
+        and not isinstance(node.op, _Reduction)
+        and node.ndim == root.ndim
+        and node.shape[0] == root.shape[0]
+    )
+
+
+def _evaluate_elementwise(root, consume=None):
+    """
+    Compute ``root`` a block at a time. With ``consume``, each block of the
+    result is passed to it instead, and nothing is returned.
+    """
+    if not root.ndim or not root.size:
+        args = [a.compute() if isinstance(a, LazyArray) else a for a in root.inputs]
+        result = root.op(*args, **root.kwargs)
+        return result if consume is None else consume(result)
+
+    order = _fused(root)
+    fused = {id(node) for node in order}
+
+    leaves = {}
+    for node in order:
+        for i in node.inputs:
+            if id(i) not in fused:
+                leaves[id(i)] = i.compute() if isinstance(i, LazyArray) else i
+
+    # Blocks of contiguous elements, rather than of rows, when every array
+    # can be flattened: blocks can then be any size, however long the rows.
+    flat = all(node.shape == root.shape for node in order) and all(
+        np.ndim(v) == 0
+        or (np.shape(v) == root.shape and v.flags.c_contiguous)
+        or np.size(v) == 1
+        for v in leaves.values()
+    )
+
+    def row_shape(node):
+        return () if flat else node.shape[1:]
+
+    sliced = set()
+    for key, value in leaves.items():
+        if flat:
+            if np.ndim(value) and np.size(value) > 1:
+                leaves[key] = value.reshape(-1)
+                sliced.add(key)
+            elif np.ndim(value):
+                leaves[key] = value.reshape(())
+        elif np.ndim(value) == root.ndim and np.shape(value)[0] == root.shape[0] > 1:
+            sliced.add(key)
+
+    length = root.size if flat else root.shape[0]
+    row_bytes = sum(
+        node.dtype.itemsize * int(np.prod(row_shape(node))) for node in order
+    )
+    rows = max(1, min(length, block_bytes // max(row_bytes, 1)))
+
+    buffers = {
+        id(node): np.empty((rows,) + row_shape(node), dtype=node.dtype)
+        for node in order
+        if node is not root or consume is not None
+    }
+    if consume is None:
+        result = np.empty(root.shape, dtype=root.dtype)
+        buffers[id(root)] = result.reshape(-1) if flat else result
+
+    check = cancellation_check()
+    for start in range(0, length, rows):
+        check()
+        stop = min(start + rows, length)
+        values = {}
+        for node in order:
+            args = []
+            for i in node.inputs:
+                key = id(i)
+                if key in values:
+                    args.append(values[key])
+                elif key in sliced:
+                    args.append(leaves[key][start:stop])
+                else:
+                    args.append(leaves[key])
+
+            if node is root and consume is None:
+                out = buffers[id(node)][start:stop]
+            else:
+                out = buffers[id(node)][: stop - start]
+
+            values[id(node)] = node.op(*args, out=out, **node.kwargs)
+
+        if consume is not None:
+            consume(values[id(root)])
+
+    if consume is None:
+        return result
+
+
+def _shape_of(name):
+    func = getattr(np, name)
+
+    def implementation(a, *args, **kwargs):
+        if isinstance(a, LazyArray):
+            return getattr(a, name)
+
+        return func(a, *args, **kwargs)
+
+    return implementation
+
+
+_implementations: Dict = {
+    unumpy.ufunc.__call__: _ufunc_call,
+    unumpy.ufunc.reduce: _ufunc_reduce,
+    unumpy.shape: _shape_of("shape"),
+    unumpy.ndim: _shape_of("ndim"),
+    unumpy.size: _shape_of("size"),
+}
+
+for _method, _func in [
+    (unumpy.sum, np.sum),
+    (unumpy.prod, np.prod),
+    (unumpy.min, np.min),
+    (unumpy.max, np.max),
+    (unumpy.any, np.any),
+    (unumpy.all, np.all),
+]:
+    _implementations[_method] = _reduction(_method, _func)
+
+
+def __ua_function__(method, args, kwargs):
+    impl = _implementations.get(method)
+    if impl is None:
+        return _eager(method, args, kwargs)
+
+    return impl(*args, **kwargs)
+
+
+@wrap_single_convertor
+def __ua_convert__(value, dispatch_type, coerce):
+    if dispatch_type is ndarray:
+        if value is None or isinstance(value, (LazyArray, np.ndarray, np.generic)):
+            return value
+
+        # Scalars are kept as they are, NumPy's result types depend on them.
+        if isinstance(value, (int, float, complex)):
+            return value
+
+        if not coerce:
+            return NotImplemented
+
+        return np.asarray(value)
+
+    if dispatch_type is ufunc:
+        return getattr(np, value.name)
+
+    if dispatch_type is dtype:
+        try:
+            return np.dtype(str(value))
+        except TypeError:
+            return np.dtype(value)
+
+    return value
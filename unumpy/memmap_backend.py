@@ -0,0 +1,380 @@
+"""
+A backend for arrays larger than memory. Large arrays it creates, and the
+results of :obj:`ufunc` calls and reductions too large to hold in memory, are
+:obj:`numpy.memmap` arrays backed by files in ``spill_dir``, computed a block
+of ``block_bytes`` at a time so that only a few blocks are resident at once.
+
+>>> import numpy
+>>> import uarray as ua
+>>> import unumpy as np
+>>> import unumpy.memmap_backend as memmap_backend
+>>> with ua.set_backend(memmap_backend, coerce=True):
+...     x = np.full((2 ** 13, 2 ** 10), 0.5)
+...     y = np.sum(np.multiply(x, 2), axis=1)
+>>> isinstance(x, numpy.memmap), bool((y == 2 ** 10).all())
+(True, True)
+
+:obj:`unumpy.asarray` of the path of a ``.npy`` file, or of a raw binary file
+with ``dtype``, maps the file with ``open_mode``, read-only by default, rather
+than reading it. Spilled files are unlinked as soon as they are mapped, so the
+space they take is freed when the last array viewing them is collected.
+
+Arrays of less than ``block_bytes`` are created and computed in memory, and
+everything else is computed by the NumPy backend. ``spill_dir`` should be on a
+disk, not on a ``tmpfs`` kept in memory such as ``/tmp`` on some systems.
+"""
+import functools
+import mmap
+import os
+import tempfile
+import weakref
+
+import numpy as np
+from uarray import wrap_single_convertor
+import unumpy
+from unumpy import dtype, ndarray
+import unumpy.numpy_backend as numpy_backend
+from unumpy._chunking import (
+    ASSOCIATIVE_UFUNCS,
+    cancellation_check,
+    chunk_rows,
+    reduction,
+)
+from unumpy._dispatch import ignore_chunks
+
+from typing import Dict
+
+__ua_domain__ = "numpy"
+
+# The directory results are spilled to.
+spill_dir = os.environ.get("UNUMPY_SPILL_DIR") or tempfile.gettempdir()
+# The number of bytes of each array computed at a time.
+block_bytes = 2 ** 26
+# The mode files opened by ``asarray`` are mapped with.
+open_mode = "r"
+
+
+def _remove(path):
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+def _spill(shape, dtype, order="C"):
+    os.makedirs(spill_dir, exist_ok=True)
+    fd, path = tempfile.mkstemp(prefix="unumpy-", suffix=".dat", dir=spill_dir)
+    try:
+        with os.fdopen(fd, "w+b") as f:
+            array = np.memmap(f, dtype=dtype, mode="w+", shape=shape, order=order)
+    except BaseException:
+        _remove(path)
+        raise
+
+    try:
+        # The mapping keeps the file alive until it is closed.
+        os.unlink(path)
+    except OSError:
+        # Windows can't remove files that are mapped.
+        weakref.finalize(array, _remove, path)
+
+    return array
+
+
+def _empty(shape, dtype, order="C"):
+    # Arrays of at least a block are spilled to disk, smaller ones are not.
+    dtype = np.dtype(dtype)
+    size = int(np.prod(shape, dtype=np.int64))
+    if dtype.hasobject or not size or size * dtype.itemsize < block_bytes:
+        return np.empty(shape, dtype=dtype, order=order)
+
+    return _spill(shape, dtype, order)
+
+
+def _bounds(shape, itemsize):
+    """
+    The ``(start, stop)`` ranges of rows of blocks of at most ``block_bytes``
+    to compute an array of ``shape`` in, or ``None`` if it's a single block.
+    """
+    if not shape:
+        return None
+
+    row_bytes = int(np.prod(shape[1:], dtype=np.int64)) * itemsize
+    rows = max(1, block_bytes // max(row_bytes, 1))
+    if rows >= shape[0]:
+        return None
+
+    return [(start, min(start + rows, shape[0])) for start in range(0, shape[0], rows)]
+
+
+def _blocks(bounds):
+    check = cancellation_check()
+    for bound in bounds:
+        check()
+        yield bound
+
+
+def _drop(array, start, stop):
+    """
+    Let the OS reclaim the pages of the rows ``start:stop`` of ``array`` once
+    they've been computed with, if it's a view of a file. Dirty pages stay in
+    the page cache until written back, except in copy-on-write mappings.
+    """
+    mm = getattr(array, "_mmap", None)
+    if mm is None or array.mode == "c" or not hasattr(mmap, "MADV_DONTNEED"):
+        return
+
+    root = array
+    while isinstance(root.base, np.ndarray):
+        root = root.base
+
+    # ``numpy.memmap`` maps from the allocation granularity before ``offset``.
+    start_address = root.__array_interface__["data"][0]
+    base = start_address - root.offset % mmap.ALLOCATIONGRANULARITY
+    lo, hi = np.byte_bounds(array[start:stop])
+    lo = (lo - base) // mmap.PAGESIZE * mmap.PAGESIZE
+    hi = min(hi - base, len(mm))
+    if 0 <= lo < hi:
+        try:
+            mm.madvise(mmap.MADV_DONTNEED, lo, hi - lo)
+        except (OSError, ValueError):
+            pass
+
+
+def _itemsize(*arrays):
+    return max([np.dtype(getattr(a, "dtype", np.uint8)).itemsize for a in arrays])
+
+
+def _example(value):
+    # Something with the dtype of ``value`` to find result dtypes with. 0-d
+    # arrays and scalars are kept, NumPy's result type may depend on them.
+    if np.ndim(value):
+        return np.zeros(1, dtype=np.asarray(value).dtype)
+
+    return value
+
+
+def _overlaps(args, outs):
+    # Computing in place is fine, other overlaps need NumPy's buffering.
+    return any(
+        o is not None and a is not o and np.may_share_memory(a, o)
+        for a in args
+        if isinstance(a, np.ndarray)
+        for o in outs
+    )
+
+
+def _ufunc_call(np_ufunc, *args, out=None, **kwargs):
+    if out is None:
+        outs = (None,) * np_ufunc.nout
+    else:
+        outs = out if isinstance(out, tuple) else (out,)
+
+    bounds = None
+    if len(args) == np_ufunc.nin and set(kwargs) <= {"dtype", "casting"}:
+        shape = np.broadcast_shapes(
+            *(np.shape(a) for a in args), *(o.shape for o in outs if o is not None)
+        )
+        bounds = _bounds(shape, _itemsize(*args, *outs))
+
+    if bounds is None or _overlaps(args, outs):
+        if out is not None:
+            kwargs["out"] = out
+
+        return np_ufunc(*args, **kwargs)
+
+    if any(o is None for o in outs):
+        examples = np_ufunc(*(_example(a) for a in args), **kwargs)
+        if np_ufunc.nout == 1:
+            examples = (examples,)
+
+        outs = tuple(
+            _empty(shape, e.dtype) if o is None else o for o, e in zip(outs, examples)
+        )
+
+    for start, stop in _blocks(bounds):
+        rows = [chunk_rows(a, shape, start, stop) for a in args]
+        np_ufunc(*rows, out=tuple(o[start:stop] for o in outs), **kwargs)
+        for a in [a for a, r in zip(args, rows) if r is not a] + list(outs):
+            _drop(a, start, stop)
+
+    return outs[0] if np_ufunc.nout == 1 else outs
+
+
+def _normalize_axes(axis, ndim):
+    if axis is None:
+        return set(range(ndim))
+
+    return {a % ndim for a in (axis if isinstance(axis, tuple) else (axis,))}
+
+
+def _reduce(func, associative, a, axis, out=None, keepdims=False, **kwargs):
+    bounds = None
+    if isinstance(a, np.ndarray) and set(kwargs) <= {"dtype"}:
+        bounds = _bounds(a.shape, a.itemsize)
+
+    if bounds is None:
+        return func(a, axis=axis, out=out, keepdims=keepdims, **kwargs)
+
+    if 0 in _normalize_axes(axis, a.ndim):
+        if not associative:
+            return func(a, axis=axis, out=out, keepdims=keepdims, **kwargs)
+
+        # Reduce each block, combining the result with those before it.
+        total = None
+        for start, stop in _blocks(bounds):
+            part = func(a[start:stop], axis=axis, keepdims=True, **kwargs)
+            if total is not None:
+                part = func(
+                    np.concatenate([total, part]), axis=axis, keepdims=True, **kwargs
+                )
+            total = part
+            _drop(a, start, stop)
+
+        return func(total, axis=axis, out=out, keepdims=keepdims, **kwargs)
+
+    # The first axis is kept, each block is the same rows of the result.
+    if out is None:
+        first = func(a[:1], axis=axis, keepdims=keepdims, **kwargs)
+        out = _empty(a.shape[:1] + first.shape[1:], first.dtype)
+
+    for start, stop in _blocks(bounds):
+        func(a[start:stop], axis=axis, out=out[start:stop], keepdims=keepdims, **kwargs)
+        _drop(a, start, stop)
+        _drop(out, start, stop)
+
+    return out
+
+
+def _fold(np_ufunc, a, bounds, out, keepdims, kwargs):
+    # Reduce the blocks in order, each along with the result for the ones
+    # before it, for ufuncs that aren't associative.
+    total = None
+    for start, stop in _blocks(bounds):
+        block = a[start:stop]
+        if total is not None:
+            block = np.concatenate([total[np.newaxis], block])
+        total = np_ufunc.reduce(block, axis=0, **kwargs)
+        _drop(a, start, stop)
+
+    if keepdims:
+        total = total[np.newaxis]
+
+    if out is None:
+        return total
+
+    out[...] = total
+    return out
+
+
+def _ufunc_reduce(np_ufunc, a, axis=0, dtype=None, out=None, keepdims=False):
+    associative = np_ufunc.__name__ in ASSOCIATIVE_UFUNCS
+    kwargs = {} if dtype is None else {"dtype": dtype}
+    if not associative and isinstance(a, np.ndarray):
+        bounds = _bounds(a.shape, a.itemsize)
+        if bounds is not None and _normalize_axes(axis, a.ndim) == {0}:
+            return _fold(np_ufunc, a, bounds, out, keepdims, kwargs)
+
+    return _reduce(np_ufunc.reduce, associative, a, axis, out, keepdims, **kwargs)
+
+
+def _reduction(func):
+    return reduction(func, functools.partial(_reduce, func, True))
+
+
+def _full(shape, fill_value, dtype=None, order="C"):
+    if dtype is None:
+        dtype = np.asarray(0.0 if fill_value is None else fill_value).dtype
+
+    out = _empty(shape, dtype, order)
+    if isinstance(out, np.memmap):
+        # New files are zero-filled already, ``zeros`` passes ``None``.
+        if fill_value is not None:
+            bounds = _bounds(out.shape, out.itemsize) or [(0, len(out))]
+            for start, stop in _blocks(bounds):
+                out[start:stop] = fill_value
+                _drop(out, start, stop)
+    else:
+        out[...] = 0 if fill_value is None else fill_value
+
+    return out
+
+
+def _copy(a, dtype):
+    out = _empty(a.shape, dtype)
+    for start, stop in _blocks(_bounds(a.shape, _itemsize(a, out)) or [(0, len(a))]):
+        out[start:stop] = a[start:stop]
+        _drop(a, start, stop)
+        _drop(out, start, stop)
+
+    return out
+
+
+def _asarray(a, dtype=None, order=None):
+    if isinstance(a, (str, os.PathLike)):
+        if os.fspath(a).endswith(".npy"):
+            a = np.load(a, mmap_mode=open_mode)
+        else:
+            dtype = np.uint8 if dtype is None else dtype
+            return np.memmap(a, dtype=dtype, mode=open_mode)
+
+    if isinstance(a, np.memmap) and a.ndim:
+        if dtype is None or np.dtype(dtype) == a.dtype:
+            return a
+
+        return _copy(a, dtype)
+
+    return np.asarray(a, dtype=dtype, order=order)
+
+
+_implementations: Dict = {
+    unumpy.ufunc.__call__: _ufunc_call,
+    unumpy.ufunc.reduce: _ufunc_reduce,
+    unumpy.sum: _reduction(np.sum),
+    unumpy.prod: _reduction(np.prod),
+    unumpy.min: _reduction(np.min),
+    unumpy.max: _reduction(np.max),
+    unumpy.any: _reduction(np.any),
+    unumpy.all: _reduction(np.all),
+    unumpy.full: ignore_chunks(_full),
+    unumpy.zeros: ignore_chunks(
+        lambda shape, dtype=float, order="C": _full(shape, None, dtype, order)
+    ),
+    unumpy.ones: ignore_chunks(
+        lambda shape, dtype=float, order="C": _full(shape, 1, dtype, order)
+    ),
+    unumpy.empty: ignore_chunks(
+        lambda shape, dtype=float, order="C": _empty(shape, dtype, order)
+    ),
+    unumpy.asarray: _asarray,
+}
+
+
+def __ua_function__(method, args, kwargs):
+    impl = _implementations.get(method)
+    if impl is None:
+        return numpy_backend.__ua_function__(method, args, kwargs)
+
+    return impl(*args, **kwargs)
+
+
+@wrap_single_convertor
+def __ua_convert__(value, dispatch_type, coerce):
+    # ``numpy.asarray`` would drop the ``numpy.memmap`` subclass.
+    if dispatch_type is ndarray and isinstance(value, np.memmap):
+        return value
+
+    # Left for the implementations to resolve, ``asarray`` of a raw file maps
+    # bytes without one.
+    if dispatch_type is dtype and value is None:
+        return None
+
+    return numpy_backend.__ua_convert__.__wrapped__(value, dispatch_type, coerce)
+
+
+def __unumpy_fast_ufunc__(ufunc, args, coerce):
+    for arg in args:
+        if getattr(arg, "nbytes", 0) >= block_bytes:
+            return NotImplemented
+
+    return numpy_backend.__unumpy_fast_ufunc__(ufunc, args, coerce)
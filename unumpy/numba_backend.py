@@ -0,0 +1,356 @@
+"""
+A backend that computes :obj:`ufunc` calls and the ``sum``, ``prod``,
+``ptp``, ``var`` and ``std`` reductions of NumPy arrays with kernels compiled
+by Numba, looping over all cores when ``parallel`` is set.
+
+>>> import numpy
+>>> import uarray as ua
+>>> import unumpy as np
+>>> import unumpy.numba_backend as numba_backend
+>>> x = numpy.random.random_sample((200, 100))
+>>> with ua.set_backend(numba_backend):
+...     y = np.var(np.sqrt(x))
+>>> numpy.allclose(y, numpy.sqrt(x).var())
+True
+
+Kernels are specialized for each ufunc or reduction and number of dimensions,
+and compiled for each combination of dtypes they are called with. The source
+of each kernel is written to ``cache_dir``, and Numba caches the compiled
+kernels next to it, so they are compiled once rather than in every process.
+
+Arrays of fewer than ``min_size`` elements, calls with arguments that aren't
+supported, and every other function are computed by the NumPy backend.
+"""
+import importlib.machinery
+import os
+import sys
+import threading
+import types
+
+import numba
+import numpy as np
+import unumpy
+import unumpy.numpy_backend as numpy_backend
+
+from typing import Dict
+
+__ua_domain__ = "numpy"
+__ua_convert__ = numpy_backend.__ua_convert__
+
+# Whether kernels loop over the first axis in parallel.
+parallel = True
+# Arrays smaller than this are left to NumPy, which has less call overhead.
+min_size = 2 ** 12
+# Where the source of the kernels, and so the compiled kernels, are kept.
+cache_dir = os.environ.get("UNUMPY_NUMBA_CACHE_DIR") or os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+    "unumpy",
+    "numba",
+)
+
+# Bumped whenever the generated source changes.
+_KERNEL_VERSION = 1
+
+# The dtype kinds kernels are compiled for: bool, integers, floats, complex.
+_KINDS = "biufc"
+
+# Kernels by ``(name, ndim, parallel)``, and the dtypes they failed to
+# compile for, by ``(name, ndim, parallel, dtypes)``.
+_kernels = {}  # type: Dict
+_unsupported = set()  # type: set
+_lock = threading.Lock()
+
+
+def _loops(ndim, parallel, body):
+    # Nested loops over every element of the first argument, ``a0``.
+    index = ", ".join("i{}".format(d) for d in range(ndim))
+    lines = []
+    for d in range(ndim):
+        loop = "numba.prange" if d == 0 and parallel else "range"
+        lines.append(
+            "    " * (d + 1) + "for i{0} in {1}(a0.shape[{0}]):".format(d, loop)
+        )
+
+    for line in body:
+        lines.append("    " * (ndim + 1) + line.format(index=index))
+
+    return lines
+
+
+def _ufunc_source(name, nin, ndim, parallel):
+    args = ", ".join("a{}".format(i) for i in range(nin))
+    call = ", ".join("a{}[{{index}}]".format(i) for i in range(nin))
+    return ["def kernel({}, out):".format(args)] + _loops(
+        ndim, parallel, ["out[{{index}}] = np.{}({})".format(name, call)]
+    )
+
+
+# The body of the loop of each reduction, which is passed ``a0`` and the
+# initial values of the variables it reduces into, and returns them.
+_REDUCTIONS = {
+    "sum": (["acc"], ["acc += a0[{index}]"]),
+    "prod": (["acc"], ["acc *= a0[{index}]"]),
+    "ptp": (
+        ["lo", "hi", "nans"],
+        [
+            "x = a0[{index}]",
+            "lo = min(lo, x)",
+            "hi = max(hi, x)",
+            "nans += x != x",
+        ],
+    ),
+    "squared_deviations": (["acc", "mean"], ["d = a0[{index}] - mean", "acc += d * d"]),
+}
+
+
+def _reduction_source(name, ndim, parallel):
+    variables, body = _REDUCTIONS[name]
+    returned = [v for v in variables if v != "mean"]
+    return (
+        ["def kernel(a0, {}):".format(", ".join(variables))]
+        + _loops(ndim, parallel, body)
+        + ["    return {}".format(", ".join(returned))]
+    )
+
+
+def _load(key, lines):
+    # Write the kernel to a module of its own in ``cache_dir``, only if it
+    # isn't there already so that Numba's cache of it stays valid, and import.
+    name, ndim, parallel = key
+    module_name = "kernel_{}_{}d{}".format(name, ndim, "_parallel" if parallel else "")
+    directory = os.path.join(cache_dir, "v{}".format(_KERNEL_VERSION))
+    path = os.path.join(directory, module_name + ".py")
+    source = "\n".join(
+        [
+            "import numba",
+            "import numpy as np",
+            "",
+            "",
+            "@numba.njit(parallel={}, cache=True)".format(parallel),
+        ]
+        + lines
+        + [""]
+    )
+
+    try:
+        with open(path) as f:
+            current = f.read()
+    except OSError:
+        current = None
+
+    if current != source:
+        os.makedirs(directory, exist_ok=True)
+        tmp = "{}.{}.tmp".format(path, os.getpid())
+        with open(tmp, "w") as f:
+            f.write(source)
+        os.replace(tmp, path)
+
+    full_name = "unumpy.numba_backend." + module_name
+    module = types.ModuleType(full_name)
+    module.__file__ = path
+    # Numba looks the module up by name when loading cached kernels.
+    sys.modules[full_name] = module
+    importlib.machinery.SourceFileLoader(full_name, path).exec_module(module)
+    return module.kernel
+
+
+def _kernel(key, make_source):
+    kernel = _kernels.get(key)
+    if kernel is None:
+        with _lock:
+            kernel = _kernels.get(key)
+            if kernel is None:
+                kernel = _kernels[key] = _load(key, make_source())
+
+    return kernel
+
+
+def _run(key, make_source, args):
+    """
+    Run the kernel for ``key`` on ``args``, returning :obj:`NotImplemented`
+    if it can't be compiled for their dtypes.
+    """
+    dtypes = tuple(getattr(a, "dtype", type(a)) for a in args)
+    if key + dtypes in _unsupported:
+        return NotImplemented
+
+    try:
+        kernel = _kernel(key, make_source)
+    except OSError:
+        # ``cache_dir`` isn't writable.
+        return NotImplemented
+
+    try:
+        return kernel(*args)
+    except numba.core.errors.TypingError:
+        # E.g. a ufunc Numba doesn't support, or not for these dtypes.
+        _unsupported.add(key + dtypes)
+        return NotImplemented
+
+
+def _supported(*arrays):
+    # Numba has no half precision floats.
+    return all(
+        a.dtype.kind in _KINDS and a.dtype.isnative and a.dtype != np.float16
+        for a in arrays
+    ) and (max(a.size for a in arrays) >= min_size)
+
+
+def _ufunc_call(np_ufunc, *args, out=None, **kwargs):
+    if kwargs or np_ufunc.nout != 1 or len(args) != np_ufunc.nin:
+        return NotImplemented
+
+    arrays = [np.asarray(a) for a in args]
+    if out is not None:
+        out = out[0] if isinstance(out, tuple) and len(out) == 1 else out
+        if not isinstance(out, np.ndarray) or any(
+            a is not out and np.may_share_memory(a, out) for a in arrays
+        ):
+            return NotImplemented
+
+    if not _supported(*arrays) or not all(a.size for a in arrays):
+        return NotImplemented
+
+    shape = np.broadcast_shapes(*(a.shape for a in arrays))
+    if out is None:
+        # 0-d arrays are kept, NumPy's result type may depend on their value.
+        examples = (np.zeros(1, dtype=a.dtype) if a.ndim else a for a in arrays)
+        out = np.empty(shape, dtype=np_ufunc(*examples).dtype)
+    elif out.shape != shape:
+        return NotImplemented
+
+    # Compute with 0-d arrays in the precision of the result, as NumPy does,
+    # rather than in their own.
+    arrays = [
+        a.astype(out.dtype) if not a.ndim and a.dtype.kind == out.dtype.kind else a
+        for a in arrays
+    ]
+
+    if not shape or not _supported(out):
+        return NotImplemented
+
+    arrays = [np.broadcast_to(a, shape) for a in arrays]
+    key = (np_ufunc.__name__, len(shape), parallel)
+
+    def make_source():
+        return _ufunc_source(np_ufunc.__name__, np_ufunc.nin, *key[1:])
+
+    if _run(key, make_source, arrays + [out]) is NotImplemented:
+        return NotImplemented
+
+    return out
+
+
+def _reduce(name, a, initial, axis, kwargs):
+    # Whole-array reductions only, other calls are left to NumPy.
+    if (
+        not isinstance(a, np.ndarray)
+        or kwargs
+        or not a.ndim
+        or not _supported(a)
+        or (axis is not None and _normalize_axes(axis, a.ndim) != set(range(a.ndim)))
+    ):
+        return NotImplemented
+
+    key = (name, a.ndim, parallel)
+    return _run(key, lambda: _reduction_source(name, *key[1:]), (a,) + initial)
+
+
+def _normalize_axes(axis, ndim):
+    return {a % ndim for a in (axis if isinstance(axis, tuple) else (axis,))}
+
+
+def _keep(value, ndim, keepdims):
+    return np.reshape(value, (1,) * ndim) if keepdims else value
+
+
+def _sum_like(name, func):
+    def implementation(a, axis=None, dtype=None, out=None, keepdims=False, **kwargs):
+        if out is not None or not isinstance(a, np.ndarray):
+            return NotImplemented
+
+        result_dtype = func(np.zeros(1, dtype=a.dtype), dtype=dtype).dtype
+        # The kernels accumulate into a variable of the type of ``initial``,
+        # in double precision at least for floats: a float32 sum stops
+        # growing once it reaches 2 ** 24.
+        acc_dtype = result_dtype
+        if result_dtype.kind in "fc":
+            acc_dtype = np.result_type(result_dtype, np.float64)
+        initial = acc_dtype.type(func(np.zeros(0, dtype=result_dtype)))
+        result = _reduce(name, a, (initial,), axis, kwargs)
+        if result is NotImplemented:
+            return result
+
+        return _keep(result_dtype.type(result), a.ndim, keepdims)
+
+    return implementation
+
+
+def _ptp(a, axis=None, out=None, keepdims=False):
+    if out is not None or not isinstance(a, np.ndarray) or not a.size:
+        return NotImplemented
+
+    if a.dtype.kind in "bc":
+        # NumPy can't subtract booleans, and orders complex numbers
+        # lexicographically.
+        return NotImplemented
+
+    first = a[(0,) * a.ndim]
+    result = _reduce("ptp", a, (first, first, 0), axis, {})
+    if result is NotImplemented:
+        return result
+
+    lo, hi, nans = result
+    return _keep(a.dtype.type(np.nan if nans else hi - lo), a.ndim, keepdims)
+
+
+def _var(a, axis=None, dtype=None, out=None, ddof=0, keepdims=False, **kwargs):
+    if (
+        out is not None
+        or dtype is not None
+        or not isinstance(a, np.ndarray)
+        or a.dtype.kind not in "biuf"
+        or a.size - ddof <= 0
+    ):
+        return NotImplemented
+
+    # Accumulated in double precision, whatever the dtype of ``a``.
+    total = _reduce("sum", a, (np.float64(0.0),), axis, kwargs)
+    if total is NotImplemented:
+        return total
+
+    mean = total / a.size
+    deviations = _reduce(
+        "squared_deviations", a, (np.float64(0.0), np.float64(mean)), axis, kwargs
+    )
+    if deviations is NotImplemented:
+        return deviations
+
+    result_dtype = np.var(np.zeros(2, dtype=a.dtype)).dtype
+    value = result_dtype.type(deviations / (a.size - ddof))
+    return _keep(value, a.ndim, keepdims)
+
+
+def _std(a, *args, **kwargs):
+    var = _var(a, *args, **kwargs)
+    return var if var is NotImplemented else np.sqrt(var)
+
+
+_implementations: Dict = {
+    unumpy.ufunc.__call__: _ufunc_call,
+    unumpy.sum: _sum_like("sum", np.sum),
+    unumpy.prod: _sum_like("prod", np.prod),
+    unumpy.ptp: _ptp,
+    unumpy.var: _var,
+    unumpy.std: _std,
+}
+
+
+def __ua_function__(method, args, kwargs):
+    impl = _implementations.get(method)
+    if impl is not None:
+        result = impl(*args, **kwargs)
+        if result is not NotImplemented:
+            return result
+
+    return numpy_backend.__ua_function__(method, args, kwargs)
@@ -2,7 +2,11 @@ import numpy as np
 from uarray import Dispatchable, wrap_single_convertor
 from unumpy import ufunc, ufunc_list, ndarray, dtype
 import unumpy
+from unumpy._dispatch import build_dispatch_table
+from unumpy._conversion_cache import get_conversion_cache
+from unumpy._buffer_pool import get_buffer_pool
 import functools
+import operator
 
 from typing import Dict
 
@@ -11,23 +15,134 @@ _ufunc_mapping: Dict[ufunc, np.ufunc] = {}
 __ua_domain__ = "numpy"
 
 
+def _ufunc_call(self, *args, **kwargs):
+    pool = get_buffer_pool()
+    if pool is None or kwargs or len(args) != self.nin:
+        return self(*args, **kwargs)
+
+    return _pooled_call(pool, self, args)
+
+
 _implementations: Dict = {
-    unumpy.ufunc.__call__: np.ufunc.__call__,
+    unumpy.ufunc.__call__: _ufunc_call,
     unumpy.ufunc.reduce: np.ufunc.reduce,
+    unumpy.ufunc.accumulate: np.ufunc.accumulate,
+    unumpy.ufunc.types.fget: operator.attrgetter("types"),
+    unumpy.ufunc.identity.fget: operator.attrgetter("identity"),
     unumpy.count_nonzero: lambda a, axis=None: np.asarray(np.count_nonzero(a, axis))[
         ()
     ],
 }
 
 
+_dispatch_table = build_dispatch_table(np, _implementations)
+
+
 def __ua_function__(method, args, kwargs):
-    if method in _implementations:
-        return _implementations[method](*args, **kwargs)
+    impl = _dispatch_table[method]
+    if impl is NotImplemented:
+        return NotImplemented
+
+    return impl(*args, **kwargs)
+
 
-    if not hasattr(np, method.__name__):
+_ufunc_table: Dict[ufunc, np.ufunc] = {
+    u: getattr(np, u.name)
+    for u in (getattr(unumpy, name) for name in ufunc_list)
+    if isinstance(getattr(np, u.name, None), np.ufunc)
+}
+
+_exact_types = frozenset({np.ndarray})
+_coercible_types = (
+    _exact_types
+    | {int, float, complex, bool}
+    | {t for t in np.sctypeDict.values() if issubclass(t, np.generic)}
+)
+
+
+def __unumpy_fast_ufunc__(ufunc, args, coerce):
+    np_ufunc = _ufunc_table.get(ufunc)
+    if np_ufunc is None or len(args) != ufunc.nin:
         return NotImplemented
 
-    return getattr(np, method.__name__)(*args, **kwargs)
+    # Exact types only: subclasses and other array-likes may override ufuncs,
+    # but the regular path converts them with ``np.asarray`` first.
+    allowed = _coercible_types if coerce else _exact_types
+    for arg in args:
+        if type(arg) not in allowed:
+            return NotImplemented
+
+    pool = get_buffer_pool()
+    if pool is not None:
+        return _pooled_call(pool, np_ufunc, args)
+
+    return np_ufunc(*args)
+
+
+# The output dtypes of each ufunc for each signature of its inputs, learnt from
+# a call without a pool.
+_output_dtypes: Dict = {}
+
+
+def _allocate(nbytes):
+    return np.empty(nbytes, np.uint8)
+
+
+def _pooled_call(pool, np_ufunc, args):
+    # Only for C-contiguous arrays and scalars, whose outputs are C-contiguous
+    # arrays of the same type with or without ``out=``.
+    signature = [np_ufunc]
+    shapes = []
+    for arg in args:
+        if type(arg) is np.ndarray and arg.ndim:
+            if not arg.flags.c_contiguous:
+                return np_ufunc(*args)
+
+            signature.append(arg.dtype)
+            shapes.append(arg.shape)
+        elif type(arg) in _coercible_types:
+            # With value-based casting, the output dtypes depend on the value.
+            dt = np.asarray(arg).dtype
+            signature.append((type(arg), dt, np.min_scalar_type(arg)))
+        else:
+            return np_ufunc(*args)
+
+    key = tuple(signature)
+    dtypes = _output_dtypes.get(key)
+    if dtypes is None or not shapes:
+        result = np_ufunc(*args)
+        outputs = result if isinstance(result, tuple) else (result,)
+        if all(type(out) is np.ndarray for out in outputs):
+            _output_dtypes[key] = tuple(out.dtype for out in outputs)
+
+        return result
+
+    try:
+        shape = np.broadcast_shapes(*shapes)
+    except ValueError:
+        return np_ufunc(*args)
+
+    size = 1
+    for n in shape:
+        size *= n
+
+    if any(dt.hasobject or size * dt.itemsize < pool.min_bytes for dt in dtypes):
+        return np_ufunc(*args)
+
+    out = tuple(
+        pool.take(__name__, size * dt.itemsize, _allocate).view(dt).reshape(shape)
+        for dt in dtypes
+    )
+    return np_ufunc(*args, out=out)
+
+
+def _readonly_asarray(value):
+    # Cached arrays are shared between calls, so they mustn't be written to.
+    # ``np.asarray`` may return an array of the caller's, which must be left
+    # writeable, so the flag is set on a view.
+    arr = np.asarray(value).view()
+    arr.flags.writeable = False
+    return arr
 
 
 @wrap_single_convertor
@@ -36,7 +151,14 @@ def __ua_convert__(value, dispatch_type, coerce):
         if not coerce and not isinstance(value, np.ndarray) and value is not None:
             return NotImplemented
 
-        return np.asarray(value) if value is not None else None
+        if value is None or type(value) is np.ndarray:
+            return value
+
+        cache = get_conversion_cache()
+        if cache is not None:
+            return cache.convert(value, __name__, _readonly_asarray)
+
+        return np.asarray(value)
 
     if dispatch_type is ufunc:
         return getattr(np, value.name)
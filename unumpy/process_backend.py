@@ -0,0 +1,562 @@
+"""
+A backend for CPU-bound work that holds the GIL, such as ufuncs over object
+arrays, sorting and ``unique``, which doesn't get faster with threads. It
+splits large arrays into chunks along their first axis and computes the
+chunks in a persistent pool of processes.
+
+Arrays are passed to the processes in :obj:`multiprocessing.shared_memory`
+segments. The arrays it returns are views of such segments, as are those
+created by :obj:`to_shared` and the large ones created by its ``zeros``,
+``ones`` and ``full``, so passing them back in copies nothing. Other large
+arrays are copied into a segment for the duration of the call. Small arrays
+and object arrays are pickled instead.
+
+>>> import numpy
+>>> import uarray as ua
+>>> import unumpy as np
+>>> import unumpy.process_backend as process_backend
+>>> x = process_backend.to_shared(numpy.random.random_sample(10 ** 6))
+>>> with ua.set_backend(process_backend):
+...     y = np.sort(x)
+>>> process_backend.is_shared(x), bool((y == numpy.sort(x)).all())
+(True, True)
+
+A segment is unlinked and unmapped as soon as the last array viewing it is
+collected, or at exit. Arrays of fewer than two chunks of ``min_chunk_size``
+elements, and everything else, are computed by the NumPy backend.
+
+The processes are started with ``start_method``, a fork server where there is
+one, so as with :obj:`multiprocessing`, scripts using this backend need an
+``if __name__ == "__main__":`` guard.
+"""
+import atexit
+import functools
+import multiprocessing
+import os
+import threading
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import unumpy
+import unumpy.numpy_backend as numpy_backend
+from unumpy._chunking import (
+    ASSOCIATIVE_UFUNCS,
+    cancellation_check,
+    chunk_bounds,
+    chunk_count,
+    chunk_rows,
+    reduction,
+)
+from unumpy._dispatch import ignore_chunks
+
+from typing import Any, Dict, Optional
+
+__ua_domain__ = "numpy"
+__ua_convert__ = numpy_backend.__ua_convert__
+
+# The number of processes to split work across.
+workers = os.cpu_count() or 1
+# The smallest number of elements worth sending to a process of its own.
+min_chunk_size = 2 ** 18
+# The start method of the processes. Forking a process that runs threads,
+# e.g. those of the threaded and Numba backends, can deadlock the children.
+start_method = (
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else None
+)  # type: Optional[str]
+
+# Arrays up to this size are pickled rather than copied into a segment.
+_INLINE_BYTES = 2 ** 16
+
+_pool = None  # type: Optional[ProcessPoolExecutor]
+_pool_key = None  # type: Any
+_pool_lock = threading.Lock()
+
+# The segments of the arrays created here, by the ``id`` of the array whose
+# buffer is the segment, with a weak reference to that array.
+_segments = {}  # type: Dict[int, Any]
+
+
+def _executor():
+    global _pool, _pool_key
+
+    with _pool_lock:
+        if _pool is None or _pool_key != (workers, start_method):
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+
+            context = multiprocessing.get_context(start_method)
+            _pool = ProcessPoolExecutor(workers, mp_context=context)
+            _pool_key = (workers, start_method)
+
+        return _pool
+
+
+def shutdown() -> None:
+    """
+    Stop the processes, if they are running. They are started again the next
+    time they are needed.
+    """
+    global _pool
+
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+            _pool = None
+
+
+atexit.register(shutdown)
+
+
+def _release(key, shm):
+    _segments.pop(key, None)
+    shm.close()
+    shm.unlink()
+
+
+def _new(shape, dtype):
+    # A new array viewing a segment of its own.
+    dtype = np.dtype(dtype)
+    nbytes = int(np.prod(shape)) * dtype.itemsize
+    shm = shared_memory.SharedMemory(create=True, size=max(nbytes, 1))
+    array = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+    # The mapping holds a file descriptor of its own, this one would only
+    # count towards the limit of open files.
+    fd = getattr(shm, "_fd", -1)
+    if fd >= 0:
+        os.close(fd)
+        shm._fd = -1
+    _segments[id(array)] = (weakref.ref(array), shm)
+    # By then no array uses ``shm.buf`` anymore, so it can be closed.
+    weakref.finalize(array, _release, id(array), shm)
+    return array
+
+
+def _segment_of(array):
+    # The segment ``array`` views and the array created with it, if any.
+    root = array
+    while isinstance(root.base, np.ndarray):
+        root = root.base
+
+    entry = _segments.get(id(root))
+    if entry is None or entry[0]() is not root:
+        return None, None
+
+    return entry[1], root
+
+
+def is_shared(array: Any) -> bool:
+    """
+    Whether ``array`` is a view of a segment created by this backend, and so
+    can be passed to its processes without copying.
+    """
+    return isinstance(array, np.ndarray) and _segment_of(array)[0] is not None
+
+
+def to_shared(array: Any) -> np.ndarray:
+    """
+    Copy ``array`` into a new segment, unless it already is in one.
+    """
+    array = np.asarray(array)
+    if is_shared(array) or array.dtype.hasobject:
+        return array
+
+    shared = _new(array.shape, array.dtype)
+    shared[...] = array
+    return shared
+
+
+def _describe(value, keep, rows=False):
+    # How to pass ``value`` to the processes. Arrays copied into segments
+    # are added to ``keep``, which must be kept alive until they are done.
+    # Arrays sent pickled that are split into chunks by their ``rows`` are
+    # sent a chunk at a time.
+    kind = "rows" if rows and np.ndim(value) else "value"
+    if not isinstance(value, np.ndarray) or value.dtype.hasobject:
+        return (kind, value)
+
+    shm, root = _segment_of(value)
+    if shm is None:
+        if value.nbytes <= _INLINE_BYTES:
+            return (kind, value)
+
+        value = to_shared(value)
+        keep.append(value)
+        shm, root = _segment_of(value)
+
+    offset = value.__array_interface__["data"][0] - root.__array_interface__["data"][0]
+    return ("shared", shm.name, offset, value.shape, value.strides, value.dtype)
+
+
+def _attach(name):
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Before Python 3.13, attaching registers the segment with the
+        # resource tracker again. The processes share the tracker of this
+        # one, which keeps one registration per segment, so that's harmless.
+        return shared_memory.SharedMemory(name=name)
+
+
+class _Rows:
+    """
+    The rows ``start:stop`` of an array of ``shape``, indexed as the array.
+    """
+
+    def __init__(self, rows, start, shape):
+        self.rows, self.start, self.shape = rows, start, shape
+
+    def __getitem__(self, index):
+        return self.rows[index.start - self.start : index.stop - self.start]
+
+
+def _chunk_description(description, start, stop):
+    if description[0] != "rows":
+        return description
+
+    value = description[1]
+    return ("rows", value[start:stop], start, value.shape)
+
+
+def _view(description, attached):
+    if description[0] == "value":
+        return description[1]
+
+    if description[0] == "rows":
+        return _Rows(*description[1:])
+
+    _, name, offset, shape, strides, dtype = description
+    shm = _attach(name)
+    attached.append(shm)
+    return np.ndarray(shape, dtype, buffer=shm.buf, offset=offset, strides=strides)
+
+
+def _task(func, descriptions, start, stop, *args):
+    # Runs in the processes. The views are only referenced by ``func``'s
+    # arguments, so they are gone by the time the segments are closed.
+    attached = []
+    try:
+        return func([_view(d, attached) for d in descriptions], start, stop, *args)
+    finally:
+        for shm in attached:
+            shm.close()
+
+
+def _run(func, descriptions, bounds, *args):
+    # ``func(arrays, start, stop, *args)`` for the ``(start, stop)`` of each
+    # chunk in ``bounds``.
+    pool = _executor()
+    futures = [
+        pool.submit(
+            _task,
+            func,
+            [_chunk_description(d, start, stop) for d in descriptions],
+            start,
+            stop,
+            *args,
+        )
+        for start, stop in bounds
+    ]
+    check = cancellation_check()
+    results = []
+    try:
+        for f in futures:
+            check()
+            results.append(f.result())
+    finally:
+        # Don't release segments while any process may still use them.
+        for f in futures:
+            f.cancel()
+        for f in futures:
+            if not f.cancelled():
+                f.exception()
+
+    return results
+
+
+def _bounds(shape):
+    if not shape:
+        return None
+
+    row_size = int(np.prod(shape[1:]))
+    chunks = chunk_count(shape[0], row_size, workers, min_chunk_size)
+    return chunk_bounds(shape[0], chunks) if chunks > 1 else None
+
+
+def _example(value):
+    if np.ndim(value):
+        return np.zeros(1, dtype=np.asarray(value).dtype)
+
+    return value
+
+
+def _ufunc_chunk(arrays, start, stop, np_ufunc, shape, kwargs):
+    inputs, outs = arrays[: np_ufunc.nin], arrays[np_ufunc.nin :]
+    inputs = [chunk_rows(a, shape, start, stop) for a in inputs]
+    if not outs:
+        return np_ufunc(*inputs, **kwargs)
+
+    np_ufunc(*inputs, out=tuple(o[start:stop] for o in outs), **kwargs)
+
+
+def _ufunc_call(np_ufunc, *args, out=None, **kwargs):
+    if out is None:
+        outs = (None,) * np_ufunc.nout
+    else:
+        outs = out if isinstance(out, tuple) else (out,)
+
+    bounds = None
+    if len(args) == np_ufunc.nin and set(kwargs) <= {"dtype", "casting"}:
+        shape = np.broadcast_shapes(
+            *(np.shape(a) for a in args), *(o.shape for o in outs if o is not None)
+        )
+        bounds = _bounds(shape)
+
+    if bounds is None or not all(o is None or is_shared(o) for o in outs):
+        return NotImplemented
+
+    results = np_ufunc(*(_example(a) for a in args), **kwargs)
+    if np_ufunc.nout == 1:
+        results = (results,)
+
+    keep = []  # type: list
+    descriptions = [
+        _describe(a, keep, np.ndim(a) == len(shape) and np.shape(a)[0] != 1)
+        for a in args
+    ]
+    if any(r.dtype.hasobject for r in results):
+        # Object arrays are sent back pickled, and copied into the result.
+        chunks = _run(_ufunc_chunk, descriptions, bounds, np_ufunc, shape, kwargs)
+        if np_ufunc.nout == 1:
+            chunks = [(c,) for c in chunks]
+
+        outs = tuple(
+            np.concatenate(parts) if o is None else _assign(o, parts)
+            for o, parts in zip(outs, zip(*chunks))
+        )
+    else:
+        outs = tuple(
+            _new(shape, r.dtype) if o is None else o for o, r in zip(outs, results)
+        )
+        _run(
+            _ufunc_chunk,
+            descriptions + [_describe(o, keep) for o in outs],
+            bounds,
+            np_ufunc,
+            shape,
+            kwargs,
+        )
+
+    return outs[0] if np_ufunc.nout == 1 else outs
+
+
+def _assign(out, parts):
+    out[...] = np.concatenate(parts)
+    return out
+
+
+def _normalize_axes(axis, ndim):
+    if axis is None:
+        return set(range(ndim))
+
+    return {a % ndim for a in (axis if isinstance(axis, tuple) else (axis,))}
+
+
+def _reduce_chunk(arrays, start, stop, func, axis, keepdims, kwargs):
+    a, out = arrays[0], arrays[1:]
+    if not out:
+        return func(a[start:stop], axis=axis, keepdims=keepdims, **kwargs)
+
+    func(a[start:stop], axis=axis, out=out[0][start:stop], keepdims=keepdims, **kwargs)
+
+
+def _reduce(func, associative, a, axis, out=None, keepdims=False, **kwargs):
+    if (
+        not isinstance(a, np.ndarray)
+        or set(kwargs) - {"dtype"}
+        or (out is not None and not is_shared(out))
+    ):
+        return NotImplemented
+
+    bounds = _bounds(a.shape)
+    if bounds is None:
+        return NotImplemented
+
+    keep = []  # type: list
+    if 0 in _normalize_axes(axis, a.ndim):
+        if not associative:
+            return NotImplemented
+
+        # Reduce each chunk, then the results.
+        partials = _run(
+            _reduce_chunk,
+            [_describe(a, keep, rows=True)],
+            bounds,
+            func,
+            axis,
+            True,
+            kwargs,
+        )
+        return func(
+            np.concatenate(partials), axis=axis, out=out, keepdims=keepdims, **kwargs
+        )
+
+    # The first axis is kept, each chunk is the same rows of the result.
+    first = func(a[:1], axis=axis, keepdims=keepdims, **kwargs)
+    if first.dtype.hasobject:
+        # Object arrays are sent back pickled, and copied into the result.
+        parts = _run(
+            _reduce_chunk,
+            [_describe(a, keep, rows=True)],
+            bounds,
+            func,
+            axis,
+            keepdims,
+            kwargs,
+        )
+        return np.concatenate(parts) if out is None else _assign(out, parts)
+
+    if out is None:
+        out = _new(a.shape[:1] + first.shape[1:], first.dtype)
+
+    _run(
+        _reduce_chunk,
+        [_describe(a, keep, rows=True), _describe(out, keep)],
+        bounds,
+        func,
+        axis,
+        keepdims,
+        kwargs,
+    )
+    return out
+
+
+def _reduction(func):
+    return reduction(func, functools.partial(_reduce, func, True))
+
+
+def _ufunc_reduce(np_ufunc, a, axis=0, dtype=None, out=None, keepdims=False):
+    associative = np_ufunc.__name__ in ASSOCIATIVE_UFUNCS
+    kwargs = {} if dtype is None else {"dtype": dtype}
+    return _reduce(np_ufunc.reduce, associative, a, axis, out, keepdims, **kwargs)
+
+
+def _sort_chunk(arrays, start, stop, axis, kind):
+    a, out = arrays
+    out[start:stop] = a[start:stop]
+    out[start:stop].sort(axis=axis, kind=kind)
+
+
+def _sort(a, axis=-1, kind=None, order=None):
+    if not isinstance(a, np.ndarray) or order is not None or a.dtype.hasobject:
+        return NotImplemented
+
+    if axis is None:
+        a, axis = a.reshape(-1), 0
+
+    axis %= max(a.ndim, 1)
+    bounds = _bounds(a.shape)
+    if bounds is None or (axis == 0 and a.ndim > 1):
+        return NotImplemented
+
+    keep = []  # type: list
+    out = _new(a.shape, a.dtype)
+    _run(_sort_chunk, [_describe(a, keep), _describe(out, keep)], bounds, axis, kind)
+    if axis == 0:
+        # Merge the sorted chunks, which the stable sort does by merging runs.
+        out.sort(kind="stable")
+
+    return out
+
+
+def _unique_chunk(arrays, start, stop):
+    return np.unique(arrays[0][start:stop])
+
+
+def _unique(
+    a, return_index=False, return_inverse=False, return_counts=False, axis=None
+):
+    if (
+        not isinstance(a, np.ndarray)
+        or return_index
+        or return_inverse
+        or return_counts
+        or axis is not None
+        or a.dtype.hasobject
+    ):
+        return NotImplemented
+
+    a = a.reshape(-1)
+    bounds = _bounds(a.shape)
+    if bounds is None:
+        return NotImplemented
+
+    keep = []  # type: list
+    parts = _run(_unique_chunk, [_describe(a, keep)], bounds)
+    return np.unique(np.concatenate(parts))
+
+
+def _full(shape, fill_value, dtype=None, order="C"):
+    if order != "C":
+        return NotImplemented
+
+    if dtype is None:
+        dtype = np.array(0.0 if fill_value is None else fill_value).dtype
+
+    shape = tuple(shape) if np.ndim(shape) else (int(shape),)
+    if np.dtype(dtype).hasobject:
+        return NotImplemented
+
+    if int(np.prod(shape)) * np.dtype(dtype).itemsize <= _INLINE_BYTES:
+        # They would be pickled anyway.
+        if fill_value is None:
+            return np.zeros(shape, dtype)
+
+        return np.full(shape, fill_value, dtype)
+
+    array = _new(shape, dtype)
+    # New segments are zero-filled already, ``zeros`` passes ``None``.
+    if fill_value is not None:
+        array.fill(fill_value)
+
+    return array
+
+
+_implementations: Dict = {
+    unumpy.ufunc.__call__: _ufunc_call,
+    unumpy.ufunc.reduce: _ufunc_reduce,
+    unumpy.sum: _reduction(np.sum),
+    unumpy.prod: _reduction(np.prod),
+    unumpy.min: _reduction(np.min),
+    unumpy.max: _reduction(np.max),
+    unumpy.any: _reduction(np.any),
+    unumpy.all: _reduction(np.all),
+    unumpy.sort: _sort,
+    unumpy.unique: _unique,
+    unumpy.full: ignore_chunks(_full),
+    unumpy.zeros: ignore_chunks(
+        lambda shape, dtype=float, order="C": _full(shape, None, dtype, order)
+    ),
+    unumpy.ones: ignore_chunks(
+        lambda shape, dtype=float, order="C": _full(shape, 1, dtype, order)
+    ),
+}
+
+
+def __ua_function__(method, args, kwargs):
+    impl = _implementations.get(method)
+    if impl is not None:
+        result = impl(*args, **kwargs)
+        if result is not NotImplemented:
+            return result
+
+    return numpy_backend.__ua_function__(method, args, kwargs)
+
+
+def __unumpy_fast_ufunc__(ufunc, args, coerce):
+    for arg in args:
+        if getattr(arg, "size", 0) >= 2 * min_chunk_size:
+            return NotImplemented
+
+    return numpy_backend.__unumpy_fast_ufunc__(ufunc, args, coerce)
@@ -0,0 +1,255 @@
+"""
+A backend that routes each call on NumPy arrays to the engine predicted to
+compute it fastest: the NumPy backend for small arrays, the threaded backend
+or Dask, when it is installed, for larger ones. Results are NumPy arrays
+whichever engine computes them.
+
+>>> import numpy
+>>> import uarray as ua
+>>> import unumpy as np
+>>> import unumpy.router_backend as router_backend
+>>> x = numpy.arange(4.0)
+>>> router_backend.choose(np.add, x.nbytes)
+'numpy'
+>>> with ua.set_backend(router_backend):
+...     np.sum(np.multiply(x, x))
+14.0
+
+Each engine's time for a call is modelled as a fixed overhead plus a time
+per byte of its array arguments, in ``costs``, separately for elementwise
+calls and reductions. The defaults assume every core speeds the parallel
+engines up, :obj:`calibrate` measures them on this machine instead. Calls
+on fewer than ``small_bytes`` run on NumPy without consulting the model, and
+the multimethods the parallel engines don't speed up always do.
+"""
+import functools
+import os
+import time
+
+import numpy as np
+import uarray as ua
+import unumpy
+import unumpy.numpy_backend as numpy_backend
+import unumpy.threaded_backend as threaded_backend
+
+from typing import Dict, Iterable, Optional, Tuple
+
+__ua_domain__ = "numpy"
+__ua_convert__ = numpy_backend.__ua_convert__
+
+_workers = os.cpu_count() or 1
+
+# (overhead in seconds, seconds per byte) of each kind of call on each engine.
+costs = {
+    "numpy": {"elementwise": (1e-6, 1e-10), "reduction": (2e-6, 5e-11)},
+    "threaded": {
+        "elementwise": (5e-5, 1e-10 / _workers),
+        "reduction": (5e-5, 5e-11 / _workers),
+    },
+    "dask": {
+        "elementwise": (2e-3, 1.5e-10 / _workers),
+        "reduction": (2e-3, 7.5e-11 / _workers),
+    },
+}  # type: Dict[str, Dict[str, Tuple[float, float]]]
+# Calls on fewer bytes than this always run on NumPy.
+small_bytes = 2 ** 16
+
+_KINDS = {
+    unumpy.ufunc.__call__: "elementwise",
+    unumpy.ufunc.accumulate: "elementwise",
+    unumpy.ufunc.reduce: "reduction",
+    unumpy.sum: "reduction",
+    unumpy.prod: "reduction",
+    unumpy.min: "reduction",
+    unumpy.max: "reduction",
+    unumpy.any: "reduction",
+    unumpy.all: "reduction",
+}
+
+# The multimethods each parallel engine speeds up.
+_SUPPORTED = {
+    "threaded": frozenset(_KINDS),
+    "dask": frozenset(_KINDS),
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _dask():
+    try:
+        import dask.array as da
+        import unumpy.dask_backend as dask_backend
+    except ImportError:
+        return None
+
+    return da, dask_backend
+
+
+def _engines():
+    engines = ["numpy", "threaded"]
+    if _dask() is not None:
+        engines.append("dask")
+
+    return engines
+
+
+def choose(method, nbytes: int) -> str:
+    """
+    The engine predicted to compute a call to ``method``, or to a
+    :obj:`ufunc`, on ``nbytes`` of arrays fastest.
+    """
+    if isinstance(method, unumpy.ufunc):
+        method = unumpy.ufunc.__call__
+
+    kind = _KINDS.get(method)
+    if kind is None or nbytes < small_bytes:
+        return "numpy"
+
+    best, best_cost = "numpy", None
+    for engine in _engines():
+        if engine != "numpy" and method not in _SUPPORTED[engine]:
+            continue
+
+        overhead, per_byte = costs[engine][kind]
+        cost = overhead + per_byte * nbytes
+        if best_cost is None or cost < best_cost:
+            best, best_cost = engine, cost
+
+    return best
+
+
+def _nbytes(values):
+    total = 0
+    for value in values:
+        if isinstance(value, np.ndarray):
+            total += value.nbytes
+        elif isinstance(value, (list, tuple)):
+            total += _nbytes(value)
+
+    return total
+
+
+def _to_dask(da, value):
+    if isinstance(value, np.ndarray) and value.ndim:
+        return da.from_array(value, chunks="auto")
+
+    if isinstance(value, np.ufunc):
+        # The Dask backend computes blocks with the multimethods.
+        return getattr(unumpy, value.__name__)
+
+    return value
+
+
+def _on_dask(method, args, kwargs):
+    da, dask_backend = _dask()
+    args = tuple(_to_dask(da, a) for a in args)
+    kwargs = {k: _to_dask(da, v) for k, v in kwargs.items()}
+    # The blocks are computed by NumPy, not routed again.
+    with ua.set_backend(numpy_backend, coerce=True, only=True):
+        result = dask_backend.__ua_function__(method, args, kwargs)
+        if result is NotImplemented:
+            return result
+
+        if isinstance(result, tuple):
+            return da.compute(*result)
+
+        return result.compute() if isinstance(result, da.Array) else result
+
+
+def _run(engine, method, args, kwargs):
+    if engine == "dask" and kwargs.get("out") is None:
+        result = _on_dask(method, args, kwargs)
+        if result is not NotImplemented:
+            return result
+
+    if engine != "numpy":
+        return threaded_backend.__ua_function__(method, args, kwargs)
+
+    return numpy_backend.__ua_function__(method, args, kwargs)
+
+
+def __ua_function__(method, args, kwargs):
+    if method not in _KINDS:
+        return numpy_backend.__ua_function__(method, args, kwargs)
+
+    engine = choose(method, _nbytes(args) + _nbytes(kwargs.values()))
+    return _run(engine, method, args, kwargs)
+
+
+def __unumpy_fast_ufunc__(ufunc, args, coerce):
+    if _nbytes(args) >= small_bytes:
+        return NotImplemented
+
+    return numpy_backend.__unumpy_fast_ufunc__(ufunc, args, coerce)
+
+
+def _time(func, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    return best
+
+
+def calibrate(
+    sizes: Iterable[int] = (2 ** 12, 2 ** 16, 2 ** 19, 2 ** 22),
+    repeat: int = 3,
+    engines: Optional[Iterable[str]] = None,
+) -> Dict[str, Dict[str, Tuple[float, float]]]:
+    """
+    Time an elementwise call and a reduction on each engine for arrays of
+    each of ``sizes`` elements, the best of ``repeat`` runs, and fit
+    ``costs`` to them. Also sets ``small_bytes`` to the fewest bytes on
+    which another engine beats NumPy.
+
+    Returns the new ``costs``, which can be saved and assigned back to
+    ``costs`` instead of calibrating again.
+    """
+    global small_bytes
+
+    engines = _engines() if engines is None else list(engines)
+    rng = np.random.RandomState(0)
+    workloads = {
+        "elementwise": (unumpy.ufunc.__call__, lambda x: (np.add, x, x)),
+        "reduction": (unumpy.sum, lambda x: (x,)),
+    }
+    fitted = {engine: dict(costs[engine]) for engine in costs}
+    for engine in engines:
+        for kind, (method, make_args) in workloads.items():
+            points = []
+            for size in sizes:
+                x = rng.random_sample(size)
+                args = make_args(x)
+                seconds = _time(lambda: _run(engine, method, args, {}), repeat)
+                points.append((_nbytes(args), seconds))
+
+            # Fit the relative errors, or the overhead is lost in the noise
+            # of the largest sizes.
+            nbytes, seconds = np.array(points).T
+            per_byte, overhead = np.polyfit(nbytes, seconds, 1, w=1 / seconds)
+            fitted[engine][kind] = (
+                float(max(overhead, 0.0)),
+                float(max(per_byte, 1e-15)),
+            )
+
+    costs.update(fitted)
+    small_bytes = _crossover()
+    return costs
+
+
+def _crossover():
+    # The fewest bytes on which an engine's modelled cost beats NumPy's.
+    crossover = None
+    for engine in _engines():
+        if engine == "numpy":
+            continue
+
+        for kind, (overhead, per_byte) in costs[engine].items():
+            np_overhead, np_per_byte = costs["numpy"][kind]
+            if per_byte < np_per_byte:
+                nbytes = int((overhead - np_overhead) / (np_per_byte - per_byte))
+                crossover = nbytes if crossover is None else min(crossover, nbytes)
+
+    return max(crossover, 0) if crossover is not None else 2 ** 62
@@ -3,7 +3,10 @@ import sparse
 from uarray import Dispatchable, wrap_single_convertor
 from unumpy import ufunc, ufunc_list, ndarray
 import unumpy
+from unumpy._dispatch import build_dispatch_table
+from unumpy._conversion_cache import get_conversion_cache
 import functools
+import operator
 
 from typing import Dict
 
@@ -15,17 +18,24 @@ __ua_domain__ = "numpy"
 _implementations: Dict = {
     unumpy.ufunc.__call__: np.ufunc.__call__,
     unumpy.ufunc.reduce: np.ufunc.reduce,
+    unumpy.ufunc.types.fget: operator.attrgetter("types"),
+    unumpy.ufunc.identity.fget: operator.attrgetter("identity"),
 }
 
 
-def __ua_function__(method, args, kwargs):
-    if method in _implementations:
-        return _implementations[method](*args, **kwargs)
+_dispatch_table = build_dispatch_table(sparse, _implementations)
+
 
-    if not hasattr(sparse, method.__name__):
+def __ua_function__(method, args, kwargs):
+    impl = _dispatch_table[method]
+    if impl is NotImplemented:
         return NotImplemented
 
-    return getattr(sparse, method.__name__)(*args, **kwargs)
+    return impl(*args, **kwargs)
+
+
+def _as_coo(value):
+    return sparse.as_coo(np.asarray(value))
 
 
 @wrap_single_convertor
@@ -40,7 +50,11 @@ def __ua_convert__(value, dispatch_type, coerce):
         if isinstance(value, sparse.SparseArray):
             return value
 
-        return sparse.as_coo(np.asarray(value))
+        cache = get_conversion_cache()
+        if cache is not None:
+            return cache.convert(value, __name__, _as_coo)
+
+        return _as_coo(value)
 
     if dispatch_type is ufunc:
         return getattr(np, value.name)
@@ -0,0 +1,359 @@
+"""
+Computations over arrays that arrive as a stream of chunks, stacked along
+their first axis, such as blocks read from a file or a socket.
+
+A :obj:`Stream` wraps an iterable of chunks. Each :obj:`ufunc` is mirrored by
+a function of the same name here that applies it to each chunk of the streams
+among its arguments, lazily, returning another stream. The reductions here
+consume a stream a chunk at a time, in constant memory, over all of its
+elements or along the first axis:
+
+>>> import numpy
+>>> import uarray as ua
+>>> import unumpy.stream as stream
+>>> import unumpy.numpy_backend as numpy_backend
+>>> chunks = stream.Stream([numpy.array([1.0, 2.0]), numpy.array([3.0, 4.0, 5.0])])
+>>> with ua.set_backend(numpy_backend, coerce=True):
+...     stream.max(stream.multiply(chunks, 2)), stream.var(chunks)
+(10.0, 2.0)
+
+Chunks are computed with the :obj:`unumpy` multimethods, so by the backends
+set where the stream is consumed, and the results are of the same kind as the
+chunks. Empty chunks are skipped.
+"""
+import itertools
+import math
+
+import unumpy
+from unumpy import ufunc
+
+from typing import Any, Callable, Iterable, Iterator
+
+__all__ = [
+    "Stream",
+    "sum",
+    "prod",
+    "min",
+    "max",
+    "ptp",
+    "any",
+    "all",
+    "count_nonzero",
+    "var",
+    "std",
+    "argmin",
+    "argmax",
+]
+
+_MISSING = object()
+
+
+class Stream:
+    """
+    A stream of chunks, iterated over as many times as ``chunks`` can be.
+    """
+
+    def __init__(self, chunks: Iterable):
+        self._chunks = chunks
+
+    def __iter__(self) -> Iterator:
+        return iter(self._chunks)
+
+    def map(self, func: Callable, *args, **kwargs) -> "Stream":
+        """
+        The stream of ``func(chunk, *args, **kwargs)`` for each chunk.
+        """
+        return _apply(func, (self,) + args, kwargs)
+
+    def __repr__(self):
+        return "<Stream of {!r}>".format(self._chunks)
+
+
+class _Applied:
+    # ``func`` applied to the chunks of the streams among ``args``, zipped.
+    def __init__(self, func, args, kwargs):
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+
+    def __iter__(self):
+        positions = [i for i, a in enumerate(self.args) if isinstance(a, Stream)]
+        args = list(self.args)
+        iterators = [iter(self.args[i]) for i in positions]
+        for chunks in itertools.zip_longest(*iterators, fillvalue=_MISSING):
+            for i, chunk in zip(positions, chunks):
+                if chunk is _MISSING:
+                    raise ValueError("The streams have different numbers of chunks.")
+
+                args[i] = chunk
+
+            yield self.func(*args, **self.kwargs)
+
+    def __repr__(self):
+        return "{}(...)".format(getattr(self.func, "name", self.func))
+
+
+def _apply(func, args, kwargs):
+    return Stream(_Applied(func, args, kwargs))
+
+
+def _mirror(u):
+    def mirrored(*args, **kwargs):
+        return _apply(u, args, kwargs)
+
+    mirrored.__name__ = mirrored.__qualname__ = u.name
+    mirrored.__doc__ = "Apply :obj:`unumpy.{}` to each chunk.".format(u.name)
+    return mirrored
+
+
+def __getattr__(name):
+    value = getattr(unumpy, name, None)
+    if not isinstance(value, ufunc):
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+    mirrored = globals()[name] = _mirror(value)
+    return mirrored
+
+
+def __dir__():
+    names = (k for k in dir(unumpy) if isinstance(getattr(unumpy, k, None), ufunc))
+    return sorted(set(__all__) | set(names))
+
+
+def _chunks(s):
+    for chunk in s:
+        if unumpy.size(chunk):
+            yield chunk
+
+
+def _check_axis(axis):
+    if axis not in (None, 0):
+        raise ValueError("Streams are only reduced along all axes or the first one.")
+
+
+def _count(chunk, axis):
+    return unumpy.size(chunk) if axis is None else unumpy.shape(chunk)[0]
+
+
+def _squeeze(total, axis):
+    # Reductions are kept with ``keepdims`` while combining, the way arrays of
+    # every backend can be combined with each other.
+    return total[(0,) * unumpy.ndim(total)] if axis is None else total[0]
+
+
+def _fold(s, axis, reduce, combine, empty, finish=None):
+    _check_axis(axis)
+    total = None
+    for chunk in _chunks(s):
+        part = reduce(chunk)
+        total = part if total is None else combine(total, part)
+
+    if total is None:
+        return empty()
+
+    return _squeeze(total if finish is None else finish(total), axis)
+
+
+def _empty_error(name):
+    def empty():
+        raise ValueError("{}() of an empty stream.".format(name))
+
+    return empty
+
+
+def sum(s: Iterable, axis=None, dtype=None) -> Any:
+    """
+    The sum of the elements of ``s``, or along its first axis.
+    """
+    return _fold(
+        s,
+        axis,
+        lambda c: unumpy.sum(c, axis=axis, dtype=dtype, keepdims=True),
+        lambda a, b: a + b,
+        lambda: 0,
+    )
+
+
+def prod(s: Iterable, axis=None, dtype=None) -> Any:
+    """
+    The product of the elements of ``s``, or along its first axis.
+    """
+    return _fold(
+        s,
+        axis,
+        lambda c: unumpy.prod(c, axis=axis, dtype=dtype, keepdims=True),
+        lambda a, b: a * b,
+        lambda: 1,
+    )
+
+
+def min(s: Iterable, axis=None) -> Any:
+    """
+    The minimum of ``s``, or along its first axis, propagating NaNs.
+    """
+    return _fold(
+        s,
+        axis,
+        lambda c: unumpy.min(c, axis=axis, keepdims=True),
+        unumpy.minimum,
+        _empty_error("min"),
+    )
+
+
+def max(s: Iterable, axis=None) -> Any:
+    """
+    The maximum of ``s``, or along its first axis, propagating NaNs.
+    """
+    return _fold(
+        s,
+        axis,
+        lambda c: unumpy.max(c, axis=axis, keepdims=True),
+        unumpy.maximum,
+        _empty_error("max"),
+    )
+
+
+def ptp(s: Iterable, axis=None) -> Any:
+    """
+    The range of ``s``, or along its first axis, in a single pass.
+    """
+    return _fold(
+        s,
+        axis,
+        lambda c: (
+            unumpy.min(c, axis=axis, keepdims=True),
+            unumpy.max(c, axis=axis, keepdims=True),
+        ),
+        lambda a, b: (unumpy.minimum(a[0], b[0]), unumpy.maximum(a[1], b[1])),
+        _empty_error("ptp"),
+        lambda t: t[1] - t[0],
+    )
+
+
+def any(s: Iterable, axis=None) -> Any:
+    """
+    Whether any element of ``s``, or along its first axis, is true.
+    """
+    return _fold(
+        s,
+        axis,
+        lambda c: unumpy.any(c, axis=axis, keepdims=True),
+        unumpy.logical_or,
+        lambda: False,
+    )
+
+
+def all(s: Iterable, axis=None) -> Any:
+    """
+    Whether every element of ``s``, or along its first axis, is true.
+    """
+    return _fold(
+        s,
+        axis,
+        lambda c: unumpy.all(c, axis=axis, keepdims=True),
+        unumpy.logical_and,
+        lambda: True,
+    )
+
+
+def count_nonzero(s: Iterable, axis=None) -> Any:
+    """
+    The number of non-zero elements of ``s``, or along its first axis.
+    """
+    _check_axis(axis)
+    total = 0
+    for chunk in _chunks(s):
+        total = total + unumpy.count_nonzero(chunk, axis=axis)
+
+    return total
+
+
+def _moments(s, axis):
+    # The count, mean and sum of squared deviations from the mean, of each
+    # chunk, merged with those of the chunks before it (Chan et al.).
+    _check_axis(axis)
+    n = 0
+    mean = m2 = None
+    for chunk in _chunks(s):
+        n_b = _count(chunk, axis)
+        mean_b = unumpy.sum(chunk, axis=axis, keepdims=True) / n_b
+        deviations = unumpy.absolute(unumpy.subtract(chunk, mean_b))
+        m2_b = unumpy.sum(unumpy.square(deviations), axis=axis, keepdims=True)
+        if mean is None:
+            n, mean, m2 = n_b, mean_b, m2_b
+            continue
+
+        delta = mean_b - mean
+        n, n_a = n + n_b, n
+        mean = mean + delta * (n_b / n)
+        m2 = m2 + m2_b + unumpy.square(unumpy.absolute(delta)) * (n_a * n_b / n)
+
+    return n, mean, m2
+
+
+def var(s: Iterable, axis=None, ddof=0) -> Any:
+    """
+    The variance of ``s``, or along its first axis, in a single pass.
+    """
+    n, _, m2 = _moments(s, axis)
+    if not n - ddof > 0:
+        return math.nan
+
+    return _squeeze(m2 / (n - ddof), axis)
+
+
+def std(s: Iterable, axis=None, ddof=0) -> Any:
+    """
+    The standard deviation of ``s``, or along its first axis.
+    """
+    n, _, m2 = _moments(s, axis)
+    if not n - ddof > 0:
+        return math.nan
+
+    return _squeeze(unumpy.sqrt(m2 / (n - ddof)), axis)
+
+
+def _arg(s, axis, reduce, arg, better, name):
+    _check_axis(axis)
+    offset = 0
+    best = index = None
+    for chunk in _chunks(s):
+        value = reduce(chunk, axis=axis, keepdims=True)
+        i = arg(chunk, axis=axis) + offset
+        offset += _count(chunk, axis)
+        if best is None:
+            best, index = value, i
+            continue
+
+        # The first of equal values, and the first NaN, as NumPy does.
+        nan = unumpy.logical_and(
+            unumpy.not_equal(value, value), unumpy.equal(best, best)
+        )
+        take = unumpy.logical_or(better(value, best), nan)
+        if axis is None:
+            if take[(0,) * unumpy.ndim(take)]:
+                best, index = value, i
+        else:
+            best = unumpy.where(take, value, best)
+            index = unumpy.where(take[0], i, index)
+
+    if best is None:
+        raise ValueError("{}() of an empty stream.".format(name))
+
+    return index
+
+
+def argmin(s: Iterable, axis=None) -> Any:
+    """
+    The index of the minimum of ``s`` when flattened, or along its first
+    axis.
+    """
+    return _arg(s, axis, unumpy.min, unumpy.argmin, unumpy.less, "argmin")
+
+
+def argmax(s: Iterable, axis=None) -> Any:
+    """
+    The index of the maximum of ``s`` when flattened, or along its first
+    axis.
+    """
+    return _arg(s, axis, unumpy.max, unumpy.argmax, unumpy.greater, "argmax")
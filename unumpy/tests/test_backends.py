@@ -0,0 +1,427 @@
+import pytest
+import uarray as ua
+import unumpy as np
+import numpy as onp
+import unumpy.lazy_backend as lazy_backend
+import unumpy.numpy_backend as NumpyBackend
+
+
+@pytest.mark.parametrize(
+    "func",
+    [
+        lambda x, y: np.exp(np.sin(x) * y + 1),
+        lambda x, y: np.add(onp.asfortranarray(x), y[0]) * 2,
+        lambda x, y: np.multiply(x[:, :1], y[0]) - x,
+        lambda x, y: np.sum(np.sqrt(x) * y),
+        lambda x, y: np.max(np.subtract(x, y), axis=1, keepdims=True),
+        lambda x, y: np.add(np.sum(np.multiply(x, y), keepdims=True), x),
+        lambda x, y: np.subtract.reduce(np.multiply(x[0], 3), axis=None),
+        lambda x, y: np.sort(np.add(x, y), axis=0),
+        lambda x, y: np.sin(x[:0]),
+        lambda x, y: np.add(x[:, :0], 1),
+        lambda x, y: np.sum(np.multiply(x[:0], y[:0])),
+        lambda x, y: np.sum(x[:0], axis=0),
+        lambda x, y: np.max(np.add(x[:, :0], 1), axis=0),
+    ],
+)
+def test_lazy_matches_eager(monkeypatch, func):
+    # Many blocks, even for small arrays.
+    monkeypatch.setattr(lazy_backend, "block_bytes", 256)
+    rng = onp.random.RandomState(0)
+    x, y = rng.random_sample((2, 40, 30))
+
+    with ua.set_backend(lazy_backend):
+        result = onp.asarray(func(x, y))
+
+    with ua.set_backend(NumpyBackend, coerce=True):
+        expected = func(x, y)
+
+    assert result.dtype == expected.dtype
+    onp.testing.assert_allclose(result, expected)
+
+
+@pytest.mark.parametrize("name", ["lazy", "threaded", "process", "memmap"])
+def test_reductions_take_positional_parameters(name):
+    import importlib
+
+    backend = importlib.import_module("unumpy.{}_backend".format(name))
+    x = onp.arange(12.0).reshape(3, 4)
+    calls = [
+        (np.sum, (x, 0, onp.float32), onp.sum(x, 0, onp.float32)),
+        (np.sum, (x, 0, None, None, True), onp.sum(x, 0, keepdims=True)),
+        (np.max, (x, 1, None, True), onp.max(x, 1, keepdims=True)),
+        (np.ufunc.reduce, (onp.add, x, 0, "f4"), onp.add.reduce(x, 0, "f4")),
+    ]
+
+    with ua.set_backend(NumpyBackend, coerce=True), ua.set_backend(backend):
+        for method, args, expected in calls:
+            result = onp.asarray(backend.__ua_function__(method, args, {}))
+            assert result.dtype == expected.dtype
+            onp.testing.assert_allclose(result, expected)
+
+
+def test_lazy_records_graph():
+    x = onp.arange(100, dtype=onp.int8)
+
+    with ua.set_backend(lazy_backend):
+        y = np.add(x, 1)
+        total = np.sum(y)
+        assert isinstance(y, lazy_backend.LazyArray)
+        assert isinstance(total, lazy_backend.LazyArray)
+        assert np.shape(y) == (100,)
+
+    assert y.dtype == (x + 1).dtype
+    assert total.compute() == onp.sum(x + 1)
+    onp.testing.assert_array_equal(onp.asarray(y), x + 1)
+
+
+@pytest.mark.parametrize(
+    "func",
+    [
+        lambda x: np.add(x, x[0]),
+        lambda x: np.divmod(x, 0.3),
+        lambda x: np.sum(x),
+        lambda x: np.sum(x, axis=1, keepdims=True),
+        lambda x: np.min(x, axis=(0, 1)),
+        lambda x: np.subtract.reduce(x),
+        lambda x: np.any(np.greater(x, 0.5), axis=0),
+        lambda x: np.add.accumulate(x),
+        lambda x: np.multiply.accumulate(x, axis=1),
+    ],
+)
+def test_threaded_matches_numpy(monkeypatch, func):
+    import unumpy.threaded_backend as threaded_backend
+
+    x = onp.random.RandomState(0).random_sample((103, 7))
+    monkeypatch.setattr(threaded_backend, "min_chunk_size", 16)
+
+    results = []
+    for workers in [1, 4]:
+        monkeypatch.setattr(threaded_backend, "workers", workers)
+        with ua.set_backend(threaded_backend, coerce=True):
+            result = func(x)
+        results.append(result if isinstance(result, tuple) else (result,))
+
+    for result, expected in zip(*results):
+        assert onp.asarray(result).dtype == onp.asarray(expected).dtype
+        onp.testing.assert_allclose(result, expected)
+
+
+def test_numba_kernels_are_cached(monkeypatch, tmp_path):
+    numba_backend = pytest.importorskip("unumpy.numba_backend")
+
+    monkeypatch.setattr(numba_backend, "cache_dir", str(tmp_path))
+    monkeypatch.setattr(numba_backend, "parallel", False)
+    monkeypatch.setattr(numba_backend, "min_size", 1)
+    monkeypatch.setattr(numba_backend, "_kernels", {})
+    x = onp.random.RandomState(0).random_sample((20, 10))
+
+    with ua.set_backend(numba_backend, coerce=True):
+        onp.testing.assert_allclose(np.multiply(x, 2.0), x * 2.0)
+        onp.testing.assert_allclose(np.var(x), onp.var(x))
+        # Not supported by the kernels, computed by NumPy.
+        onp.testing.assert_allclose(np.sum(x, axis=0), onp.sum(x, axis=0))
+        onp.testing.assert_allclose(np.divmod(x, 0.3), onp.divmod(x, 0.3))
+
+    assert set(numba_backend._kernels) == {
+        ("multiply", 2, False),
+        ("sum", 2, False),
+        ("squared_deviations", 2, False),
+    }
+    assert (tmp_path / "v1" / "kernel_multiply_2d.py").exists()
+
+
+def test_numba_reductions_of_float32_keep_precision(monkeypatch, tmp_path):
+    numba_backend = pytest.importorskip("unumpy.numba_backend")
+
+    monkeypatch.setattr(numba_backend, "cache_dir", str(tmp_path))
+    monkeypatch.setattr(numba_backend, "parallel", False)
+    x = onp.random.RandomState(0).random_sample(10 ** 6).astype(onp.float32) + 1000
+
+    with ua.set_backend(numba_backend, coerce=True):
+        total, var = np.sum(x), np.var(x)
+        half = np.sum(x[:5000].astype(onp.float16))
+
+    # Adding each element to a float32 total would be off by about 1%.
+    assert total.dtype == onp.float32 and var.dtype == onp.float32
+    assert total == pytest.approx(x.astype(float).sum(), rel=1e-6)
+    assert var == pytest.approx(x.astype(float).var(), rel=1e-5)
+    assert half == onp.sum(x[:5000].astype(onp.float16))
+
+
+def test_process_backend_shares_memory(monkeypatch):
+    import gc
+    import unumpy.process_backend as process_backend
+
+    monkeypatch.setattr(process_backend, "workers", 2)
+    monkeypatch.setattr(process_backend, "min_chunk_size", 16)
+    x = onp.random.RandomState(0).randint(0, 50, (101, 3))
+
+    with ua.set_backend(process_backend, coerce=True):
+        results = [
+            np.add(x, 1),
+            np.sort(x[:, 0]),
+            np.unique(x),
+            np.sum(x, axis=0),
+        ]
+
+    expected = [x + 1, onp.sort(x[:, 0]), onp.unique(x), x.sum(axis=0)]
+    for result, e in zip(results, expected):
+        onp.testing.assert_array_equal(result, e)
+
+    assert process_backend.is_shared(results[0])
+    del results, result
+    gc.collect()
+    assert not process_backend._segments
+
+
+def test_process_backend_creates_small_arrays_unshared():
+    import os
+    import unumpy.process_backend as process_backend
+
+    segments = len(process_backend._segments)
+    with ua.set_backend(process_backend):
+        small = [np.zeros(3) for _ in range(2000)] + [np.full(3, 2)]
+        if os.path.isdir("/proc/self/fd"):
+            fds = len(os.listdir("/proc/self/fd"))
+            large = [np.ones(10 ** 5) for _ in range(10)]
+            # One descriptor per segment, held by its mapping.
+            assert len(os.listdir("/proc/self/fd")) - fds <= len(large)
+            assert process_backend.is_shared(large[0])
+
+    assert len(process_backend._segments) - segments <= 10
+    assert not any(process_backend.is_shared(a) for a in small)
+    onp.testing.assert_array_equal(small[-1], onp.full(3, 2))
+
+
+def test_process_backend_sends_object_arrays_by_chunk(monkeypatch):
+    import unumpy.process_backend as process_backend
+
+    monkeypatch.setattr(process_backend, "workers", 2)
+    monkeypatch.setattr(process_backend, "min_chunk_size", 16)
+    sent = []
+
+    def chunk_description(description, start, stop):
+        description = describe(description, start, stop)
+        if isinstance(description[1], onp.ndarray):
+            sent.append(len(description[1]))
+        return description
+
+    describe = process_backend._chunk_description
+    monkeypatch.setattr(process_backend, "_chunk_description", chunk_description)
+    x = onp.arange(100).astype(object).reshape(50, 2)
+
+    with ua.set_backend(process_backend, coerce=True):
+        results = [np.add(x, x[0]), np.sum(x, axis=0), np.sum(x, axis=1)]
+
+    expected = [x + x[0], x.sum(axis=0), x.sum(axis=1)]
+    for result, e in zip(results, expected):
+        onp.testing.assert_array_equal(result, e)
+
+    # Each chunk is sent its rows of ``x`` only, and all of ``x[0]``.
+    assert sorted(sent) == [2] * 2 + [25] * 6
+
+
+def test_memmap_backend_spills_to_disk(monkeypatch, tmp_path):
+    import unumpy.memmap_backend as memmap_backend
+
+    monkeypatch.setattr(memmap_backend, "spill_dir", str(tmp_path))
+    monkeypatch.setattr(memmap_backend, "block_bytes", 1024)
+    x = onp.random.RandomState(0).random_sample((100, 3))
+    onp.save(tmp_path / "x.npy", x)
+
+    with ua.set_backend(memmap_backend, coerce=True):
+        a = np.asarray(str(tmp_path / "x.npy"))
+        y = np.add(np.ones((100, 3)), a)
+        results = [y, np.sum(y, axis=0), np.max(y, axis=1), np.subtract.reduce(a)]
+
+    expected = [x + 1, (x + 1).sum(axis=0), (x + 1).max(axis=1)]
+    expected.append(onp.subtract.reduce(x))
+    for result, e in zip(results, expected):
+        onp.testing.assert_allclose(result, e)
+
+    assert isinstance(a, onp.memmap) and isinstance(y, onp.memmap)
+    # Spilled files are unlinked once mapped.
+    assert [p.name for p in tmp_path.iterdir()] == ["x.npy"]
+
+
+def test_memmap_backend_maps_raw_files(tmp_path):
+    import unumpy.memmap_backend as memmap_backend
+
+    path = tmp_path / "x.bin"
+    path.write_bytes(onp.arange(4, dtype=onp.int32).tobytes())
+
+    with ua.set_backend(memmap_backend, coerce=True):
+        raw = np.asarray(path)
+        typed = np.asarray(path, dtype=onp.int32)
+        listed = np.asarray([1, 2])
+        zeros = np.zeros(3, dtype=None)
+
+    assert isinstance(raw, onp.memmap) and raw.dtype == onp.uint8
+    assert raw.shape == (16,)
+    onp.testing.assert_array_equal(typed, onp.arange(4))
+    assert listed.dtype == onp.asarray([1, 2]).dtype
+    assert zeros.dtype == onp.float64
+
+
+def test_dask_creation_is_lazy():
+    da = pytest.importorskip("dask.array")
+    import unumpy.dask_backend as dask_backend
+
+    with ua.set_backend(NumpyBackend, coerce=True), ua.set_backend(dask_backend):
+        x = np.zeros((200000, 200000))
+        results = [
+            np.full((7, 5), 2.5, chunks=3),
+            np.eye(7, 5, 2, chunks=3),
+            np.arange(0.5, 3.3, 0.1, chunks=3),
+            np.linspace(0, 1, 11, chunks=3),
+        ]
+
+    # One task for each shape of block, which the others alias.
+    shapes = len(set(x.chunks[0])) * len(set(x.chunks[1]))
+    assert len(x.dask) == x.npartitions + shapes
+    expected = [
+        onp.full((7, 5), 2.5),
+        onp.eye(7, 5, 2),
+        onp.arange(0.5, 3.3, 0.1),
+        onp.linspace(0, 1, 11),
+    ]
+    for result, e in zip(results, expected):
+        assert isinstance(result, da.Array) and result.chunks[0][0] == 3
+        onp.testing.assert_allclose(result.compute(), e)
+
+
+def test_dask_creation_is_deterministic():
+    pytest.importorskip("dask.array")
+    import unumpy.dask_backend as dask_backend
+
+    def create():
+        return [
+            np.full((7, 5), 2.5),
+            np.full((7, 5), 1.5),
+            np.full((7, 5), 2.5, chunks=3),
+            np.eye(7, 5, 2),
+            np.arange(0.5, 3.3, 0.1),
+        ]
+
+    with ua.set_backend(NumpyBackend, coerce=True), ua.set_backend(dask_backend):
+        first, second = create(), create()
+
+    with ua.set_backend(NumpyBackend, coerce=True, only=True):
+        with ua.set_backend(dask_backend):
+            other = create()
+
+    names = [x.name for x in first]
+    assert names == [x.name for x in second]
+    assert len(set(names)) == len(names)
+    # The blocks depend on the backends that create them.
+    assert not set(names) & {x.name for x in other}
+
+
+def test_dask_ufuncs_are_blockwise():
+    da = pytest.importorskip("dask.array")
+    from dask.blockwise import Blockwise
+    import unumpy.dask_backend as dask_backend
+
+    x = onp.arange(12.0).reshape(4, 3)
+    i = onp.arange(4, dtype=onp.int8).reshape(4, 1)
+    with ua.set_backend(NumpyBackend, coerce=True), ua.set_backend(dask_backend):
+        dx, di = da.from_array(x, chunks=(2, 3)), da.from_array(i, chunks=1)
+        y = np.add(np.multiply(dx, di), 1)
+        small = np.add(di, 1)
+        single = np.add(di, 1, dtype=onp.float32)
+        q, r = np.divmod(dx, 5)
+        out = da.zeros((4, 3), chunks=2)
+        result = np.sqrt(dx, out=out)
+
+    assert isinstance(y.dask.layers[y.name], Blockwise)
+    assert y.dtype == onp.float64 and small.dtype == onp.int8
+    assert single.dtype == onp.float32
+    assert result is out
+    onp.testing.assert_allclose(y.compute(), x * i + 1)
+    assert small.compute().dtype == onp.int8
+    onp.testing.assert_allclose(q.compute(), x // 5)
+    onp.testing.assert_allclose(r.compute(), x % 5)
+    onp.testing.assert_allclose(out.compute(), onp.sqrt(x))
+
+
+@pytest.mark.parametrize("name", ["add", "maximum", "logaddexp", "subtract"])
+def test_dask_ufunc_reductions_match_numpy(name):
+    dask = pytest.importorskip("dask")
+    import dask.array as da
+    import unumpy.dask_backend as dask_backend
+
+    x = onp.random.RandomState(0).random_sample((10, 7))
+    u, nu = getattr(np, name), getattr(onp, name)
+    with ua.set_backend(NumpyBackend, coerce=True), ua.set_backend(dask_backend):
+        dx = da.from_array(x, chunks=(3, 2))
+        with dask.config.set(split_every=2):
+            results = [u.reduce(dx, axis=0)]
+
+        results += [
+            u.reduce(dx),
+            u.reduce(dx, axis=1, keepdims=True),
+            u.accumulate(dx),
+            u.accumulate(dx, axis=1),
+        ]
+        expected = [
+            nu.reduce(x, axis=0),
+            nu.reduce(x),
+            nu.reduce(x, axis=1, keepdims=True),
+            nu.accumulate(x),
+            nu.accumulate(x, axis=1),
+        ]
+        if name != "subtract":
+            results.append(u.reduce(dx, axis=None))
+            expected.append(nu.reduce(x, axis=None))
+
+    for result, e in zip(results, expected):
+        assert isinstance(result, da.Array) and result.dtype == e.dtype
+        onp.testing.assert_allclose(result.compute(), e)
+
+
+def test_dask_chunks_fit_the_configured_size():
+    dask = pytest.importorskip("dask")
+    import unumpy.dask_backend as dask_backend
+
+    with dask.config.set({"array.chunk-size": "1MiB"}):
+        with ua.set_backend(NumpyBackend), ua.set_backend(dask_backend):
+            tall = np.zeros((10 ** 6, 3), dtype="float32")
+            square = np.ones((4096, 4096), dtype="int8")
+
+    # The short axis isn't split, the blocks are as even as they can be.
+    assert tall.chunks[1] == (3,) and set(tall.chunks[0]) == {83333, 83334}
+    assert square.chunksize == (1024, 1024)
+    for x in [tall, square]:
+        assert onp.prod(x.chunksize) * x.dtype.itemsize <= 2 ** 20
+
+
+@pytest.mark.parametrize("engine", ["numpy", "threaded", "dask"])
+def test_router_backend_routes_by_cost(monkeypatch, engine):
+    import unumpy.router_backend as router_backend
+
+    if engine == "dask":
+        pytest.importorskip("dask.array")
+
+    # Make ``engine`` the cheapest for arrays of 1 KiB and more.
+    costs = {
+        e: {"elementwise": (1, 0), "reduction": (1, 0)} for e in ["threaded", "dask"]
+    }
+    costs["numpy"] = {"elementwise": (0, 1), "reduction": (0, 1)}
+    costs[engine] = {"elementwise": (0, 0), "reduction": (0, 0)}
+    monkeypatch.setattr(router_backend, "costs", costs)
+    monkeypatch.setattr(router_backend, "small_bytes", 1024)
+
+    x = onp.arange(1000.0)
+    assert router_backend.choose(np.add, 8) == "numpy"
+    assert router_backend.choose(np.add, x.nbytes) == engine
+    with ua.set_backend(router_backend):
+        results = [np.multiply(x, x), np.sum(x), np.max(x[:10]), np.add.reduce(x)]
+
+    expected = [x * x, x.sum(), x[:10].max(), x.sum()]
+    for result, e in zip(results, expected):
+        assert type(result) is type(e)
+        onp.testing.assert_allclose(result, e)
+
+    costs = router_backend.calibrate(sizes=(2 ** 8, 2 ** 12), repeat=1)
+    assert set(costs["numpy"]) == {"elementwise", "reduction"}
@@ -0,0 +1,508 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+import uarray as ua
+import unumpy as np
+import numpy as onp
+import unumpy.numpy_backend as NumpyBackend
+
+
+def test_profile_records_phases_and_backend():
+    with ua.set_backend(NumpyBackend, coerce=True), np.profile() as p:
+        np.add([1.0], 2.0)
+        np.ptp(onp.arange(4))
+
+    stats = p.as_dict()
+    assert stats["add.__call__"]["calls"] == 1
+    assert stats["add.__call__"]["backends"] == {"unumpy.numpy_backend": 1}
+    assert stats["add.__call__"]["coercions"] == 2
+    assert stats["add.__call__"]["copies"] == 2
+    assert stats["ptp"]["calls"] == 1
+
+    phases = stats["add.__call__"]["phases"]
+    assert phases["convert"] > 0 and phases["execute"] > 0
+    assert sum(phases.values()) == pytest.approx(stats["add.__call__"]["time"])
+
+    trace = json.loads(json.dumps(p.chrome_trace()))
+    names = {e["name"] for e in trace["traceEvents"]}
+    assert {"add.__call__", "ptp", "execute (unumpy.numpy_backend)"} <= names
+
+
+def test_profile_records_default():
+    class Backend:
+        __ua_domain__ = "numpy"
+
+        @staticmethod
+        def __ua_function__(method, args, kwargs):
+            if method is np.sum:
+                raise ValueError("sum")
+
+            if method is np.ptp:
+                return NotImplemented
+
+            return getattr(onp, method.__name__)(*args, **kwargs)
+
+        @staticmethod
+        def __ua_convert__(dispatchables, coerce):
+            return [d.value for d in dispatchables]
+
+    with ua.set_backend(Backend, only=True):
+        with np.profile() as p:
+            with pytest.raises(ValueError):
+                np.sum(onp.arange(3))
+            np.ptp(onp.arange(3))
+
+    stats = p.as_dict()
+    assert stats["sum"]["backends"] == {None: 1}
+    assert stats["ptp"]["backends"] == {"default": 1}
+    assert stats["ptp"]["phases"]["default"] > 0
+
+
+def test_profiling_toggle_restores_backends():
+    hooks = NumpyBackend.__ua_function__, NumpyBackend.__ua_convert__
+
+    with ua.set_backend(NumpyBackend):
+        p = np.enable_profiling()
+        assert np.enable_profiling() is p
+        np.sum(onp.arange(3))
+        # Backends aren't modified, other threads' calls go through them.
+        assert NumpyBackend.__ua_function__ is hooks[0]
+        assert np.disable_profiling() is p
+
+    assert (NumpyBackend.__ua_function__, NumpyBackend.__ua_convert__) == hooks
+    assert np.disable_profiling() is None
+    assert p.as_dict()["sum"]["calls"] == 1
+
+
+def test_conversion_cache_reuses_coercions():
+    table = [2, 3, 5, 7]
+    with ua.set_backend(NumpyBackend, coerce=True):
+        with np.conversion_cache() as cache:
+            first = np.isin(onp.arange(8), table)
+            onp.testing.assert_array_equal(np.isin(onp.arange(8), table), first)
+            assert (cache.hits, cache.misses, len(cache)) == (1, 1, 1)
+
+            table.append(4)
+            cache.invalidate(table)
+            assert np.isin(4, table)
+
+        # Nothing is cached outside the context.
+        np.isin(4, table)
+        assert cache.misses == 2
+
+
+def test_conversion_cache_leaves_converted_arrays_writeable():
+    class Wrapper:
+        def __init__(self, data):
+            self.data = data
+
+        def __array__(self, dtype=None, copy=None):
+            return self.data
+
+    wrapper = Wrapper(onp.arange(4.0))
+    with ua.set_backend(NumpyBackend, coerce=True), np.conversion_cache():
+        assert np.sum(wrapper) == 6
+        assert np.sum(wrapper) == 6
+
+    wrapper.data += 1
+    onp.testing.assert_array_equal(wrapper.data, onp.arange(1.0, 5.0))
+
+
+def test_conversion_cache_eviction():
+    cache = np.ConversionCache(max_bytes=32)
+    a, b = onp.arange(3.0), onp.arange(2.0)
+
+    class Wrapper:
+        def __init__(self, arr):
+            self.arr = arr
+
+    wa, wb = Wrapper(a), Wrapper(b)
+    convert = lambda w: w.arr.copy()
+    cache.convert(wa, "copy", convert)
+    cache.convert(wb, "copy", convert)
+    assert len(cache) == 1 and cache.nbytes == 16
+
+    del wb
+    assert len(cache) == 0 and cache.nbytes == 0
+
+    # Values that can't be referenced weakly, other than lists and tuples,
+    # are never cached.
+    cache.convert(1.0, "array", onp.asarray)
+    assert len(cache) == 0
+
+
+def test_memoizing_backend():
+    methods = [np.unique, np.sort, np.sum]
+    memo = np.MemoizingBackend(NumpyBackend, methods=methods, max_bytes=64)
+    x = onp.array([3, 1, 3, 2])
+
+    with ua.set_backend(memo, coerce=True):
+        first = np.unique(x)
+        assert np.unique(x) is first and not first.flags.writeable
+        assert (memo.hits, memo.misses, memo.nbytes) == (1, 1, 24)
+
+        # A modified input is a different input.
+        x[0] = 4
+        onp.testing.assert_array_equal(np.unique(x), [1, 2, 3, 4])
+        assert memo.misses == 2 and len(memo) == 2
+
+        # Not cached: other methods, ``out=``, and results over the budget.
+        np.max(x)
+        np.sum(x, out=onp.empty((), dtype=x.dtype))
+        np.sort(onp.arange(10))
+        assert (memo.hits, memo.misses, len(memo)) == (1, 3, 2)
+
+
+def test_buffer_pool_reuses_released_outputs():
+    x = onp.linspace(0, 1, 2 ** 15)
+    with ua.set_backend(NumpyBackend, coerce=True), np.buffer_pool() as pool:
+        # The first call of each signature learns its output dtypes.
+        kept = [np.multiply(x, 2.0) for _ in range(3)]
+        assert (pool.allocations, pool.reuses) == (2, 0)
+        for _ in range(3):
+            y = np.add(np.multiply(x, 2.0), 1)
+
+        assert (pool.allocations, pool.reuses) == (5, 2)
+        for _ in range(2):
+            q, r = np.divmod(x, 0.25)
+
+        assert (pool.allocations, pool.reuses) == (5, 4)
+
+    for k in kept:
+        onp.testing.assert_equal(k, x * 2)
+
+    onp.testing.assert_equal(y, x * 2 + 1)
+    onp.testing.assert_equal(q, x // 0.25)
+    onp.testing.assert_equal(r, x % 0.25)
+
+
+def test_aio_preserves_backends_and_cancels_between_chunks():
+    import asyncio
+    import threading
+    import time
+    import unumpy.aio as aio
+    from unumpy._chunking import cancellation_check
+
+    started = threading.Event()
+    chunks = []
+
+    def chunked():
+        check = cancellation_check()
+        started.set()
+        for i in range(1000):
+            check()
+            chunks.append(i)
+            time.sleep(0.001)
+
+    async def main():
+        with ua.set_backend(NumpyBackend, coerce=True):
+            assert await aio.add.reduce([1, 2, 3]) == 6
+
+        task = asyncio.ensure_future(aio.call(chunked))
+        while not started.is_set():
+            await asyncio.sleep(0.001)
+
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(main())
+    # The call kept its turn until it stopped.
+    assert 0 < len(chunks) < 1000 and len(chunks) == len(set(chunks))
+    n = len(chunks)
+    time.sleep(0.01)
+    assert len(chunks) == n
+
+
+def test_stream_reductions_match_numpy():
+    import unumpy.stream as stream
+
+    x = onp.random.RandomState(0).standard_normal((50, 3))
+    x[17, 1] = onp.nan
+    chunks = stream.Stream([x[:7], x[7:7], x[7:30], x[30:]])
+    with ua.set_backend(NumpyBackend, coerce=True):
+        for name in ["sum", "ptp", "any", "var", "std", "argmin", "argmax"]:
+            for axis in (None, 0):
+                expected = getattr(onp, name)(x, axis=axis)
+                result = getattr(stream, name)(chunks, axis=axis)
+                onp.testing.assert_allclose(result, expected)
+
+        result = stream.max(stream.subtract(chunks, chunks), axis=0)
+        onp.testing.assert_equal(result, onp.max(x - x, axis=0))
+        assert stream.sum([]) == 0
+        with pytest.raises(ValueError):
+            stream.sum(stream.add(chunks, stream.Stream([x])))
+
+
+def test_importing_unumpy_defers_backend_libraries():
+    code = "import sys, unumpy; print(sorted({'torch', 'dask', 'sparse'} & set(sys.modules)))"
+    out = subprocess.run(
+        [sys.executable, "-c", code], check=True, stdout=subprocess.PIPE
+    ).stdout
+    assert out.strip() == b"[]"
+
+
+def test_lazy_backend_loads_on_first_call():
+    loads = []
+
+    def load():
+        loads.append(None)
+        return NumpyBackend
+
+    backend = np.backends.register("test-lazy", load)
+    assert np.backends.get("test-lazy") is backend
+    assert "test-lazy" in np.backends.available()
+
+    with ua.set_backend(backend, coerce=True):
+        assert not loads
+        assert np.sum([1, 2]) == 3
+        assert np.sum([1, 2]) == 3
+
+    assert len(loads) == 1 and backend.loaded
+    assert (
+        backend == NumpyBackend
+        and backend.__ua_function__ is NumpyBackend.__ua_function__
+    )
+
+    with pytest.raises(KeyError):
+        np.backends.get("test-missing")
+
+
+def test_lazy_import_mode():
+    code = (
+        "import sys, unumpy\n"
+        "print('unumpy._multimethods' in sys.modules)\n"
+        "print(len(unumpy.ufunc_list), len(dir(unumpy)))\n"
+    )
+    env = dict(os.environ)
+    outputs = []
+    for lazy in ("0", "1"):
+        env["UNUMPY_LAZY_IMPORT"] = lazy
+        outputs.append(
+            subprocess.run(
+                [sys.executable, "-c", code],
+                env=env,
+                check=True,
+                stdout=subprocess.PIPE,
+            ).stdout.split()
+        )
+
+    eager, lazy = outputs
+    assert eager[0] == b"True" and lazy[0] == b"False"
+    assert eager[1:] == lazy[1:]
+
+
+def test_ufunc_metadata_is_cached_per_backend():
+    calls = []
+
+    class Backend:
+        __ua_domain__ = "numpy"
+
+        @staticmethod
+        def __ua_function__(method, args, kwargs):
+            calls.append(method)
+            return "types" if method is np.ufunc.types.fget else 0
+
+        @staticmethod
+        def __ua_convert__(dispatchables, coerce):
+            return [d.value for d in dispatchables]
+
+    with ua.set_backend(Backend):
+        assert np.add.identity == 0 and np.add.identity == 0
+        assert np.add.types == "types" and np.add.ntypes == len("types")
+    assert len(calls) == 2
+
+    with ua.set_backend(NumpyBackend):
+        assert np.add.identity == onp.add.identity
+        with ua.set_backend(Backend):
+            assert np.add.identity == 0
+    assert len(calls) == 3
+
+    with ua.set_backend(NumpyBackend):
+        info = np.ufunc_info()
+    assert set(info) == set(np.ufunc_list)
+    assert info["multiply"]["identity"] == 1
+    assert info["multiply"]["types"] == onp.multiply.types
+
+
+def test_reductions_pass_parameters_as_keywords():
+    calls = []
+
+    class Backend:
+        __ua_domain__ = "numpy"
+
+        @staticmethod
+        def __ua_function__(method, args, kwargs):
+            calls.append((len(args), kwargs))
+            if method is np.ufunc.reduce:
+                return getattr(onp, args[0].name).reduce(*args[1:], **kwargs)
+
+            return getattr(onp, method.__name__)(*args, **kwargs)
+
+        @staticmethod
+        def __ua_convert__(dispatchables, coerce):
+            # Resolving dtypes as the NumPy backend does, ``None`` included.
+            return [
+                onp.dtype(d.value) if d.type is np.dtype else d.value
+                for d in dispatchables
+            ]
+
+    x = onp.arange(12.0).reshape(3, 4)
+    small = x.astype(onp.int8)
+    with ua.set_backend(Backend, only=True):
+        results = [
+            np.sum(x, 0, onp.float32),
+            np.sum(x, 0, None, None, True),
+            np.var(x, None, None, None, 1),
+            np.add.reduce(x, 1, onp.float32),
+            np.add.reduce(small, 1, None, None, True),
+        ]
+
+    assert calls == [
+        (1, {"axis": 0, "dtype": onp.float32}),
+        (1, {"axis": 0, "keepdims": True}),
+        (1, {"ddof": 1}),
+        (2, {"axis": 1, "dtype": onp.float32}),
+        (2, {"axis": 1, "keepdims": True}),
+    ]
+    expected = [
+        onp.sum(x, 0, onp.float32),
+        onp.sum(x, 0, keepdims=True),
+        onp.var(x, ddof=1),
+        onp.add.reduce(x, 1, onp.float32),
+        onp.add.reduce(small, 1, None, None, True),
+    ]
+    for result, e in zip(results, expected):
+        assert result.dtype == e.dtype
+        onp.testing.assert_allclose(result, e)
+
+
+@pytest.mark.parametrize("name", ["sparse", "dask", "torch"])
+def test_positional_reductions(name):
+    backend = pytest.importorskip("unumpy.{}_backend".format(name))
+    x = onp.arange(12.0).reshape(3, 4)
+
+    with ua.set_backend(backend, coerce=True):
+        results = [np.sum(x, 0), np.any(x, 0), np.sum(x, 0, None, None, True)]
+        if name != "torch":
+            # ``torch.max`` with a dimension also returns the indices.
+            results.append(np.max(x, 1))
+
+    expected = [x.sum(0), x.any(0), x.sum(0, keepdims=True), x.max(1)]
+    for result, e in zip(results, expected):
+        if hasattr(result, "todense"):
+            result = result.todense()
+        elif hasattr(result, "compute"):
+            result = result.compute()
+        onp.testing.assert_array_equal(onp.asarray(result), e)
+
+
+def test_helper_modules_are_not_exported():
+    assert not {"inspect", "types"} & set(dir(np))
+
+
+def _recording_backend(calls, name, fast=True):
+    # Forwards to the NumPy backend, recording which path each call took.
+    class Backend:
+        __ua_domain__ = "numpy"
+        __ua_convert__ = staticmethod(NumpyBackend.__ua_convert__)
+
+        @staticmethod
+        def __ua_function__(method, args, kwargs):
+            calls.append((name, "dispatch"))
+            return NumpyBackend.__ua_function__(method, args, kwargs)
+
+    def __unumpy_fast_ufunc__(ufunc, args, coerce):
+        result = NumpyBackend.__unumpy_fast_ufunc__(ufunc, args, coerce)
+        calls.append((name, "fallback" if result is NotImplemented else "fast"))
+        return result
+
+    if fast:
+        Backend.__unumpy_fast_ufunc__ = staticmethod(__unumpy_fast_ufunc__)
+
+    return Backend
+
+
+def test_ufunc_fast_path():
+    class Sub(onp.ndarray):
+        pass
+
+    calls = []
+    backend = _recording_backend(calls, "fast")
+    x, y = onp.arange(6.0), onp.ones(6)
+    out = onp.empty(6)
+    cases = [
+        (lambda: np.add(x, y), [("fast", "fast")], x + y),
+        (lambda: np.add(x, 1), [("fast", "fast")], x + 1),
+        (lambda: np.add(x, y, out=out), [("fast", "dispatch")], x + y),
+        (
+            lambda: np.add(x, y, dtype=onp.float32),
+            [("fast", "dispatch")],
+            onp.add(x, y, dtype=onp.float32),
+        ),
+        (
+            lambda: np.add(x.view(Sub), y),
+            [("fast", "fallback"), ("fast", "dispatch")],
+            x + y,
+        ),
+    ]
+
+    with ua.set_backend(backend, coerce=True):
+        for call, path, expected in cases:
+            calls.clear()
+            result = call()
+            assert calls == path
+            assert result.dtype == expected.dtype
+            onp.testing.assert_array_equal(result, expected)
+    onp.testing.assert_array_equal(out, x + y)
+
+    calls.clear()
+    with ua.set_backend(backend):
+        onp.testing.assert_array_equal(np.add(x, y), x + y)
+        assert calls == [("fast", "fast")]
+
+        # Without coercion, the fast path must not accept what the full
+        # dispatch rejects.
+        calls.clear()
+        with pytest.raises(ua.BackendNotImplementedError):
+            np.add(x, 1.0)
+        assert calls == [("fast", "fallback")]
+
+
+def test_ufunc_fast_path_follows_backend_order():
+    calls = []
+    fast = _recording_backend(calls, "fast")
+    plain = _recording_backend(calls, "plain", fast=False)
+    x, y = onp.arange(6.0), onp.ones(6)
+
+    with ua.set_backend(fast), ua.set_backend(plain):
+        onp.testing.assert_array_equal(np.add(x, y), x + y)
+        assert calls == [("plain", "dispatch")]
+
+        calls.clear()
+        with ua.skip_backend(plain):
+            onp.testing.assert_array_equal(np.add(x, y), x + y)
+        assert calls == [("fast", "fast")]
+
+    calls.clear()
+    with ua.set_backend(plain), ua.set_backend(fast), ua.skip_backend(fast):
+        onp.testing.assert_array_equal(np.add(x, y), x + y)
+    assert calls == [("plain", "dispatch")]
+
+
+@pytest.mark.parametrize("pickle_state", [None, lambda state: ()])
+def test_ufunc_fast_path_needs_backend_state(monkeypatch, pickle_state):
+    from unumpy import _dispatch
+
+    # Without a way to inspect the state, or when it has changed shape, the
+    # full dispatch is used.
+    monkeypatch.setattr(_dispatch, "_pickle_state", pickle_state)
+    calls = []
+    x, y = onp.arange(6.0), onp.ones(6)
+
+    with ua.set_backend(_recording_backend(calls, "fast")):
+        onp.testing.assert_array_equal(np.add(x, y), x + y)
+    assert calls == [("fast", "dispatch")]
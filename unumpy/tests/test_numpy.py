@@ -259,6 +259,7 @@ def test_multiple_output(backend, method, args, kwargs):
         (np.full, ((1, 2, 3), 1.3), {}),
         (np.ones, ((1, 2, 3),), {}),
         (np.zeros, ((1, 2, 3),), {}),
+        (np.empty, ((1, 2, 3),), {}),
     ],
 )
 def test_array_creation(backend, method, args, kwargs):
@@ -281,3 +282,23 @@ def test_array_creation(backend, method, args, kwargs):
         assert ret.dtype == ndt(dtype)
     else:
         assert ret.dtype == dtype
+
+
+class _OperatorArray(np.ndarray):
+    def __init__(self, data):
+        self.data = onp.asarray(data)
+
+    def __array__(self, dtype=None):
+        return self.data
+
+
+def test_ndarray_operators():
+    a = _OperatorArray([1, 2, 3])
+    with ua.set_backend(NumpyBackend, coerce=True):
+        onp.testing.assert_allclose(a + 1, [2, 3, 4])
+        onp.testing.assert_allclose(1 - a, [0, -1, -2])
+        onp.testing.assert_allclose(2 ** a, [2, 4, 8])
+        onp.testing.assert_allclose(-a, [-1, -2, -3])
+        onp.testing.assert_allclose(a < 2, [True, False, False])
+        onp.testing.assert_allclose(divmod(a, 2), ([0, 1, 1], [1, 0, 1]))
+        onp.testing.assert_allclose(divmod(7, a), ([7, 3, 2], [0, 1, 1]))
@@ -0,0 +1,259 @@
+"""
+A backend that splits :obj:`ufunc` calls, reductions and accumulations of
+large NumPy arrays into chunks along their first axis, and computes the
+chunks on a pool of threads. NumPy releases the GIL in its loops, so the
+chunks are computed in parallel.
+
+>>> import numpy
+>>> import uarray as ua
+>>> import unumpy as np
+>>> import unumpy.threaded_backend as threaded_backend
+>>> x = numpy.random.random_sample((1000, 1000))
+>>> with ua.set_backend(threaded_backend):
+...     y = np.sum(np.sqrt(x), axis=0)
+>>> numpy.allclose(y, numpy.sqrt(x).sum(axis=0))
+True
+
+Arrays of fewer than two chunks of ``min_chunk_size`` elements, and
+everything else, are computed by the NumPy backend in the calling thread.
+Reductions along the first axis and accumulations along it are only split
+for the ufuncs in :obj:`unumpy._chunking.ASSOCIATIVE_UFUNCS`.
+"""
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import unumpy
+import unumpy.numpy_backend as numpy_backend
+from unumpy._chunking import (
+    ASSOCIATIVE_UFUNCS,
+    cancellation_check,
+    chunk_bounds,
+    chunk_count,
+    chunk_rows,
+    reduction,
+)
+
+from typing import Dict, Optional
+
+__ua_domain__ = "numpy"
+__ua_convert__ = numpy_backend.__ua_convert__
+
+# The number of threads to split work across.
+workers = os.cpu_count() or 1
+# The smallest number of elements worth computing in a thread of its own.
+min_chunk_size = 2 ** 16
+
+_pool = None  # type: Optional[ThreadPoolExecutor]
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def _executor():
+    global _pool, _pool_workers
+
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+
+            _pool = ThreadPoolExecutor(workers, thread_name_prefix="unumpy-threaded")
+            _pool_workers = workers
+
+        return _pool
+
+
+def _bounds(shape):
+    # The chunks to split an array of ``shape`` into, or ``None`` if it
+    # shouldn't be split.
+    if not shape:
+        return None
+
+    row_size = int(np.prod(shape[1:]))
+    chunks = chunk_count(shape[0], row_size, workers, min_chunk_size)
+    return chunk_bounds(shape[0], chunks) if chunks > 1 else None
+
+
+def _run(func, bounds):
+    check = cancellation_check()
+
+    def run(args):
+        check()
+        return func(*args)
+
+    return list(_executor().map(run, bounds))
+
+
+def _example(value):
+    # Something with the dtype of ``value`` to find result dtypes with. 0-d
+    # arrays and scalars are kept, NumPy's result type may depend on them.
+    if np.ndim(value):
+        return np.zeros(1, dtype=np.asarray(value).dtype)
+
+    return value
+
+
+def _overlaps(args, outs):
+    # Computing in place is fine, other overlaps need NumPy's buffering.
+    return any(
+        o is not None and a is not o and np.may_share_memory(a, o)
+        for a in args
+        if isinstance(a, np.ndarray)
+        for o in outs
+    )
+
+
+def _ufunc_call(np_ufunc, *args, out=None, **kwargs):
+    if out is None:
+        outs = (None,) * np_ufunc.nout
+    else:
+        outs = out if isinstance(out, tuple) else (out,)
+
+    bounds = None
+    if len(args) == np_ufunc.nin and set(kwargs) <= {"dtype", "casting"}:
+        shape = np.broadcast_shapes(
+            *(np.shape(a) for a in args), *(o.shape for o in outs if o is not None)
+        )
+        bounds = _bounds(shape)
+
+    if bounds is None or _overlaps(args, outs):
+        if out is not None:
+            kwargs["out"] = out
+
+        return np_ufunc(*args, **kwargs)
+
+    if any(o is None for o in outs):
+        examples = np_ufunc(*(_example(a) for a in args), **kwargs)
+        if np_ufunc.nout == 1:
+            examples = (examples,)
+
+        outs = tuple(
+            np.empty(shape, dtype=e.dtype) if o is None else o
+            for o, e in zip(outs, examples)
+        )
+
+    def compute(start, stop):
+        np_ufunc(
+            *(chunk_rows(a, shape, start, stop) for a in args),
+            out=tuple(o[start:stop] for o in outs),
+            **kwargs
+        )
+
+    _run(compute, bounds)
+    return outs[0] if np_ufunc.nout == 1 else outs
+
+
+def _normalize_axes(axis, ndim):
+    if axis is None:
+        return set(range(ndim))
+
+    return {a % ndim for a in (axis if isinstance(axis, tuple) else (axis,))}
+
+
+def _reduce(func, associative, a, axis, out=None, keepdims=False, **kwargs):
+    bounds = None
+    if isinstance(a, np.ndarray) and set(kwargs) <= {"dtype"}:
+        bounds = _bounds(a.shape)
+
+    if bounds is None:
+        return func(a, axis=axis, out=out, keepdims=keepdims, **kwargs)
+
+    if 0 in _normalize_axes(axis, a.ndim):
+        if not associative:
+            return func(a, axis=axis, out=out, keepdims=keepdims, **kwargs)
+
+        # Reduce each chunk, then the results.
+        partials = _run(
+            lambda start, stop: func(a[start:stop], axis=axis, keepdims=True, **kwargs),
+            bounds,
+        )
+        return func(
+            np.concatenate(partials), axis=axis, out=out, keepdims=keepdims, **kwargs
+        )
+
+    # The first axis is kept, each chunk is the same rows of the result.
+    if out is None:
+        first = func(a[:1], axis=axis, keepdims=keepdims, **kwargs)
+        out = np.empty(a.shape[:1] + first.shape[1:], dtype=first.dtype)
+
+    def compute(start, stop):
+        func(a[start:stop], axis=axis, out=out[start:stop], keepdims=keepdims, **kwargs)
+
+    _run(compute, bounds)
+    return out
+
+
+def _ufunc_reduce(np_ufunc, a, axis=0, dtype=None, out=None, keepdims=False):
+    associative = np_ufunc.__name__ in ASSOCIATIVE_UFUNCS
+    kwargs = {} if dtype is None else {"dtype": dtype}
+    return _reduce(np_ufunc.reduce, associative, a, axis, out, keepdims, **kwargs)
+
+
+def _ufunc_accumulate(np_ufunc, a, axis=0, dtype=None, out=None):
+    bounds = None
+    if isinstance(a, np.ndarray) and a.ndim:
+        axis %= a.ndim
+        if axis or np_ufunc.__name__ in ASSOCIATIVE_UFUNCS:
+            bounds = _bounds(a.shape)
+
+    if bounds is None:
+        return np_ufunc.accumulate(a, axis=axis, dtype=dtype, out=out)
+
+    if out is None:
+        result_dtype = np_ufunc.accumulate(a.reshape(-1)[:1], dtype=dtype).dtype
+        out = np.empty(a.shape, dtype=result_dtype)
+
+    def accumulate(start, stop):
+        np_ufunc.accumulate(a[start:stop], axis=axis, dtype=dtype, out=out[start:stop])
+
+    _run(accumulate, bounds)
+    if axis:
+        return out
+
+    # Along the first axis, each chunk then needs the accumulation of the
+    # chunks before it combined in, the last row of the previous chunk once
+    # that is done.
+    carries = [out[bounds[0][1] - 1].copy()]
+    for start, stop in bounds[1:-1]:
+        carries.append(np_ufunc(carries[-1], out[stop - 1], dtype=dtype))
+
+    def combine(carry, start, stop):
+        np_ufunc(carry, out[start:stop], out=out[start:stop], dtype=dtype)
+
+    _run(combine, [(c,) + b for c, b in zip(carries, bounds[1:])])
+    return out
+
+
+def _reduction(func, associative=True):
+    return reduction(func, functools.partial(_reduce, func, associative))
+
+
+_implementations: Dict = {
+    unumpy.ufunc.__call__: _ufunc_call,
+    unumpy.ufunc.reduce: _ufunc_reduce,
+    unumpy.ufunc.accumulate: _ufunc_accumulate,
+    unumpy.sum: _reduction(np.sum),
+    unumpy.prod: _reduction(np.prod),
+    unumpy.min: _reduction(np.min),
+    unumpy.max: _reduction(np.max),
+    unumpy.any: _reduction(np.any),
+    unumpy.all: _reduction(np.all),
+}
+
+
+def __ua_function__(method, args, kwargs):
+    impl = _implementations.get(method)
+    if impl is None:
+        return numpy_backend.__ua_function__(method, args, kwargs)
+
+    return impl(*args, **kwargs)
+
+
+def __unumpy_fast_ufunc__(ufunc, args, coerce):
+    for arg in args:
+        if getattr(arg, "size", 0) >= 2 * min_chunk_size:
+            return NotImplemented
+
+    return numpy_backend.__unumpy_fast_ufunc__(ufunc, args, coerce)
@@ -3,6 +3,7 @@ import torch
 from uarray import Dispatchable, wrap_single_convertor
 import unumpy
 from unumpy import ufunc, ufunc_list, ndarray
+from unumpy._dispatch import build_dispatch_table
 
 __ua_domain__ = "numpy"
 
@@ -37,14 +38,15 @@ _implementations = {
 }
 
 
-def __ua_function__(method, args, kwargs):
-    if method in _implementations:
-        return _implementations[method](*args, **kwargs)
+_dispatch_table = build_dispatch_table(torch, _implementations)
+
 
-    if not hasattr(torch, method.__name__):
+def __ua_function__(method, args, kwargs):
+    impl = _dispatch_table[method]
+    if impl is NotImplemented:
         return NotImplemented
 
-    return getattr(torch, method.__name__)(*args, **kwargs)
+    return impl(*args, **kwargs)
 
 
 @wrap_single_convertor